@@ -0,0 +1,118 @@
+# throughput of the forked AMOS builder on a u8 x s8 -> s32 gemm
+# for the llvm target, scaling the number of build processes
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import tvm
+from tvm import auto_tensorize as at
+from tvm.auto_tensorize.search.measure import (
+    BUILD_DIR_PREFIX,
+    pebble_local_builder_build,
+    remove_build_dir,
+)
+
+
+def gemm(M, N, K):
+    A = tvm.te.placeholder([M, K], dtype="uint8", name="A")
+    B = tvm.te.placeholder([N, K], dtype="int8", name="B")
+    k = tvm.te.reduce_axis([0, K], name="k")
+    C = tvm.te.compute(
+        [M, N],
+        lambda i, j: tvm.te.sum(A[i, k].astype("int32") * B[j, k].astype("int32"), axis=k),
+        name="C",
+    )
+    return [A, B, C]
+
+
+def prepare(shape, target, number):
+    target_dag = at.compute_dag_from_tensors([gemm(*shape)[-1]])
+    match_results = at.get_match_results(target_dag, target)
+    assert len(match_results) > 0, "no intrinsic of %s matches the gemm" % target
+    match_result = match_results[0]
+    gen = at.MappingGenerator(match_result)
+    record = gen.get(policy="random")
+    new_state = at.MappingApplier(match_result).apply(record)
+    schedule_gen = at.LLVMScheduleGenerator(match_result, new_state)
+    sc_info = schedule_gen.get_schedule_compute_info()
+    schedule_app = at.LLVMScheduleApplier(match_result, sc_info)
+    params_lst = [schedule_gen.get_next() for _ in range(number)]
+    return schedule_app, params_lst
+
+
+def leftover_dirs():
+    return len([x for x in os.listdir(tempfile.gettempdir()) if x.startswith(BUILD_DIR_PREFIX)])
+
+
+def bench(schedule_app, params_lst, measure_opt, n_parallel):
+    before = leftover_dirs()
+    beg = time.perf_counter()
+    results = pebble_local_builder_build(
+        schedule_app, params_lst, measure_opt, at.EmptyChecker(), n_parallel=n_parallel
+    )
+    cost = time.perf_counter() - beg
+    ok = [r for r in results if r.error_no == 0]
+    for r in ok:
+        remove_build_dir(r.filename)
+    return {
+        "n_parallel": n_parallel,
+        "candidates": len(params_lst),
+        "built": len(ok),
+        "build_s": cost,
+        "builds_per_s": len(params_lst) / cost,
+        # batch directories that survived the builder, should stay 0
+        "leaked_dirs": leftover_dirs() - before,
+    }
+
+
+def main(args):
+    schedule_app, params_lst = prepare(args.shape, args.target, args.number)
+    measure_opt = at.MeasureOptions(target=args.target, timeout=args.timeout, verbose=0)
+    results = []
+    for n_parallel in args.parallel:
+        if n_parallel > os.cpu_count():
+            continue
+        res = bench(schedule_app, params_lst, measure_opt, n_parallel)
+        print(
+            "%3d procs  %4d/%4d built  %8.3f s  %7.2f builds/s  leaked %d"
+            % (
+                res["n_parallel"],
+                res["built"],
+                res["candidates"],
+                res["build_s"],
+                res["builds_per_s"],
+                res["leaked_dirs"],
+            ),
+            flush=True,
+        )
+        results.append(res)
+    # a parallel batch must build what the serial one builds
+    assert all(r["built"] == results[0]["built"] for r in results)
+    return results
+
+
+example_text = """
+ example:
+    python build_scaling_llvm.py --number 256 --parallel 1 2 4 8 16 32 --output build_scaling.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="build throughput of the AMOS llvm builder",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--shape", type=int, nargs=3, default=[512, 512, 512], help="M N K")
+    parser.add_argument("--target", type=str, default="llvm -mcpu=skylake-avx512")
+    parser.add_argument("--number", type=int, default=128, help="candidates per batch")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--timeout", type=int, default=20)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
@@ -0,0 +1,211 @@
+# search overhead of AMOS on targets that need no gpu: the operators of
+# the mapping_*_tensorcore.py scripts against the simulated tenet
+# accelerators and the llvm cpu target, phase by phase
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+from tvm import auto_tensorize as at
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# name: (script, compute function, shape list, the function arguments of a shape)
+OPERATORS = OrderedDict(
+    gemm=("mapping_gemm_tensorcore", "gemm", "shapes", lambda s: tuple(s)),
+    conv1d=("mapping_conv1d_tensorcore", "conv1d", "shapes_b1", lambda s: (1,) + tuple(s)),
+    conv2d=(
+        "mapping_conv2d_tensorcore",
+        "conv2d",
+        "shapes_b1",
+        lambda s: (1, s[1], s[2], s[3], s[4], s[6], s[7], s[9], s[10], s[11], "nchw"),
+    ),
+    conv3d=("mapping_conv3d_tensorcore", "conv3d", "shapes_b1", lambda s: (1,) + tuple(s[1:])),
+    grouped_conv2d=(
+        "mapping_groupedconv2d_tensorcore",
+        "grouped_conv2d",
+        "shapes_b1",
+        lambda s: (1, s[1], s[2], s[3], s[4], s[5], s[6], s[8], s[9], s[11]),
+    ),
+    depthwise_conv2d=(
+        "mapping_depthwiseconv2d_tensorcore",
+        "depthwise_conv2d",
+        "shapes_b1",
+        lambda s: (1, s[1], s[2], s[3], s[4], s[6], s[7], s[9], s[10]),
+    ),
+    dilated_conv2d=(
+        "mapping_dilatedconv2d_tensorcore",
+        "conv2d",
+        "shapes_b1",
+        lambda s: (1, s[1], s[2], s[3], s[4], s[6], s[7], s[9], s[10], s[11]),
+    ),
+    capsule_conv2d=(
+        "mapping_capsuleconv2d_tensorcore",
+        "capsule_conv2d",
+        "shapes_b1",
+        lambda s: (1, s[1], s[2], s[3], s[4], s[6], s[7], s[8], s[9], s[10], s[11]),
+    ),
+    scan=("mapping_scan_tensorcore", "scan", "shapes", lambda s: tuple(s)),
+    mean=("mapping_mean_tensorcore", "mean", "shapes", lambda s: tuple(s[:4])),
+    variance=("mapping_variance_tensorcore", "variance", "shapes", lambda s: tuple(s[:4])),
+)
+
+# the tenet accelerators compute in fp16, the cpu kernels in fp32
+TARGET_DTYPES = {"tenet": ("float16", "float16"), "llvm": ("float32", "float32")}
+
+
+def generate_cases(ops, num_shapes):
+    """Yield (name, shape index, compute function, arguments) of the operators"""
+    for name in ops:
+        script, func_name, shapes_name, to_args = OPERATORS[name]
+        module = importlib.import_module(script)
+        func = getattr(module, func_name)
+        for i, shape in enumerate(getattr(module, shapes_name)[:num_shapes]):
+            yield name, i, func, to_args(shape)
+
+
+class Timed(object):
+    """Wrap a builder or runner, accumulating its time and candidates"""
+
+    def __init__(self, func):
+        self.func = func
+        self.seconds = 0.0
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        beg = time.perf_counter()
+        ret = self.func(*args, **kwargs)
+        self.seconds += time.perf_counter() - beg
+        self.count += len(ret)
+        return ret
+
+
+def bench(func, func_args, target, trials, seed, workdir):
+    in_dtype, out_dtype = TARGET_DTYPES[target.split()[0]]
+    tensors = func(*func_args, in_dtype, out_dtype)
+    target_dag = at.compute_dag_from_tensors([tensors[-1]])
+    ret = OrderedDict(target=target, dtype=in_dtype)
+
+    beg = time.perf_counter()
+    match_results = at.get_match_results(target_dag, target)
+    ret["match_s"] = time.perf_counter() - beg
+    ret["matchings"] = len(match_results)
+    if not match_results:
+        return ret
+
+    beg = time.perf_counter()
+    mappings = 0
+    for match_result in match_results:
+        app = at.MappingApplier(match_result)
+        for record in at.MappingGenerator(match_result).get_all():
+            try:
+                app.apply(record)
+                mappings += 1
+            except RuntimeError:
+                pass
+    ret["mapping_s"] = time.perf_counter() - beg
+    ret["mappings"] = mappings
+
+    builder = Timed(at.pebble_local_builder_build)
+    runner = Timed(at.pebble_local_runner_run)
+    measure_opt = at.MeasureOptions(target=target, timeout=20, number=10, min_repeat_ms=100)
+    beg = time.perf_counter()
+    result = at.auto_tensorize_v4(
+        target_dag,
+        target,
+        "suite.log",
+        measure_opt,
+        schedule_log_dir=os.path.join(workdir, "schedules"),
+        trials=trials,
+        search_group_size=5,
+        builder=builder,
+        runner=runner,
+        seed=seed,
+    )
+    ret["tune_s"] = time.perf_counter() - beg
+    ret["build_s"] = builder.seconds
+    ret["run_s"] = runner.seconds
+    # what is left is generating and applying candidates
+    ret["generate_s"] = max(
+        0.0, ret["tune_s"] - ret["match_s"] - ret["mapping_s"] - ret["build_s"] - ret["run_s"]
+    )
+    ret["candidates"] = builder.count
+    ret["candidates_per_s"] = builder.count / ret["tune_s"]
+    ret["best_ms"] = result.perf * 1e3 if result.defined() else None
+    return ret
+
+
+def main(args):
+    results = []
+    for name, index, func, func_args in generate_cases(args.ops, args.num_shapes):
+        for target in args.targets:
+            workdir = tempfile.mkdtemp(prefix="amos_suite_")
+            res = OrderedDict(op=name, shape_index=index, args=list(func_args))
+            try:
+                res.update(bench(func, func_args, target, args.trials, args.seed, workdir))
+            except Exception as e:
+                res.update(target=target, error=str(e))
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            if "error" in res:
+                print("%-16s %-14s failed: %s" % (name, target, res["error"]), flush=True)
+            elif "tune_s" not in res:
+                print("%-16s %-14s no matching intrinsic" % (name, target), flush=True)
+            else:
+                print(
+                    "%-16s %-14s match %6.2f s  mapping %6.2f s  tune %8.2f s"
+                    "  (build %8.2f s  run %8.2f s)  %6.2f cand/s  best %s ms"
+                    % (
+                        name,
+                        target,
+                        res["match_s"],
+                        res["mapping_s"],
+                        res["tune_s"],
+                        res["build_s"],
+                        res["run_s"],
+                        res["candidates_per_s"],
+                        res["best_ms"],
+                    ),
+                    flush=True,
+                )
+            results.append(res)
+    return results
+
+
+example_text = """
+ example:
+    python cpu_search_suite.py --trials 40 --output suite.json
+    python cpu_search_suite.py --ops gemm conv2d --targets "tenet gemm" "llvm -mcpu=cascadelake"
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="AMOS search overhead without a gpu",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--ops", type=str, nargs="+", choices=list(OPERATORS.keys()), default=list(OPERATORS.keys())
+    )
+    parser.add_argument(
+        "--targets",
+        type=str,
+        nargs="+",
+        default=["tenet gemm", "tenet axpy", "tenet conv", "llvm -mcpu=core-avx2"],
+    )
+    parser.add_argument("--num-shapes", type=int, default=1, help="shapes per operator")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
@@ -49,6 +49,8 @@ def main(batch, dtype, trials):
     rounds = 10
     # we can tune multiple rounds to obtain better performance
     # e.g. set rounds to 20
+    # keep built subgraphs across rounds, only changed schedules are rebuilt
+    evaluator = at.CachedGraphEvaluator(target, dev_id=0, number=100)
     for i in range(rounds):
         # begin autoschedule: mapping exploration + scheduling
         dispatch.auto_schedule(tid)
@@ -57,8 +59,11 @@ def main(batch, dtype, trials):
         if dispatch.ready(tid):
             # check if the whole net is runnable
             # if so, evaluate the end-to-end performance
-            cost = at.evaluate_graph(multi_graph, sch_tensors, target, 0, 100, True)
-            print("Whole graph cost is %f ms" % cost, flush=True)
+            result = evaluator.evaluate(multi_graph, sch_tensors)
+            print(
+                "Whole graph cost is %f ms (rebuilt %d subgraphs)" % (result.total, result.rebuilt),
+                flush=True,
+            )
         else:
             print("not ready yet")
 
@@ -0,0 +1,147 @@
+# AMOS tensorization of gemm with the x86 intrinsics against a plain
+# TVM schedule (tiled, parallel, vectorized) on the host cpu
+import argparse
+import json
+
+import numpy as np
+import tvm
+from tvm import auto_tensorize as at
+from tvm.auto_tensorize.target import parse_cpu_target
+
+
+def gemm(M, N, K, dtype):
+    if dtype == "int8":
+        # u8 x s8 -> s32, B is [N, K] like the vnni/avx2 kernels
+        A = tvm.te.placeholder([M, K], dtype="uint8", name="A")
+        B = tvm.te.placeholder([N, K], dtype="int8", name="B")
+        rk = tvm.te.reduce_axis([0, K], name="k")
+        C = tvm.te.compute(
+            [M, N],
+            lambda i, j: tvm.te.sum(A[i, rk].astype("int32") * B[j, rk].astype("int32"), axis=rk),
+            name="C",
+        )
+    else:
+        A = tvm.te.placeholder([M, K], dtype="float32", name="A")
+        B = tvm.te.placeholder([K, N], dtype="float32", name="B")
+        rk = tvm.te.reduce_axis([0, K], name="k")
+        C = tvm.te.compute(
+            [M, N], lambda i, j: tvm.te.sum(A[i, rk] * B[rk, j], axis=rk), name="C"
+        )
+    return [A, B, C]
+
+
+def baseline(M, N, K, dtype, target, number):
+    A, B, C = gemm(M, N, K, dtype)
+    sch = tvm.te.create_schedule(C.op)
+    CC = sch.cache_write(C, "global")
+    i, j = sch[C].op.axis
+    io, ii = sch[C].split(i, factor=8)
+    jo, ji = sch[C].split(j, factor=16)
+    sch[C].reorder(io, jo, ii, ji)
+    sch[C].parallel(sch[C].fuse(io, jo))
+    sch[C].vectorize(ji)
+    sch[CC].compute_at(sch[C], ii)
+    (k,) = sch[CC].op.reduce_axis
+    ko, ki = sch[CC].split(k, factor=4)
+    ci, cj = sch[CC].op.axis
+    sch[CC].reorder(ko, ki, ci, cj)
+    sch[CC].unroll(ki)
+    sch[CC].vectorize(cj)
+    func = tvm.build(sch, [A, B, C], target)
+    ctx = tvm.cpu()
+    arrays = [
+        tvm.nd.array(np.random.randint(0, 8, size=[int(x) for x in t.shape]).astype(t.dtype), ctx)
+        for t in [A, B, C]
+    ]
+    evaluator = func.time_evaluator(func.entry_name, ctx, number=number)
+    return evaluator(*arrays).mean * 1e3
+
+
+def tensorize(M, N, K, dtype, target, trials, number):
+    A, B, C = gemm(M, N, K, dtype)
+    target_dag = at.compute_dag_from_tensors([C])
+    layer = "gemm-%s-%d-%d-%d" % (dtype, M, N, K)
+    measure_opt = at.MeasureOptions(target=target, timeout=100, number=number, min_repeat_ms=500)
+    result = at.auto_tensorize_v4(
+        target_dag,
+        target,
+        layer + ".log",
+        measure_opt,
+        schedule_log_dir=layer,
+        trials=trials,
+        search_group_size=5,
+    )
+    if not result.defined():
+        return None, None
+    cost = at.evaluate_params(result.sch_app, result.params, measure_opt)
+    return cost, result.sch_app.hw_abs_dag.get_name()
+
+
+def main(args):
+    mcpu, features = parse_cpu_target(args.target)
+    print("cpu %s, features %s" % (mcpu, ",".join(sorted(features))))
+    results = []
+    for M, N, K in args.shapes:
+        for dtype in args.dtypes:
+            base = baseline(M, N, K, dtype, args.target, args.number)
+            amos, intrin = tensorize(M, N, K, dtype, args.target, args.trials, args.number)
+            res = {
+                "shape": [M, N, K],
+                "dtype": dtype,
+                "target": args.target,
+                "intrinsic": intrin,
+                "tvm_ms": base,
+                "amos_ms": amos,
+                "speedup": base / amos if amos else None,
+            }
+            print(
+                "%-7s %5d %5d %5d  tvm %9.4f ms  amos %s (%s)"
+                % (
+                    dtype,
+                    M,
+                    N,
+                    K,
+                    base,
+                    "%9.4f ms" % amos if amos else "n/a",
+                    intrin,
+                ),
+                flush=True,
+            )
+            results.append(res)
+    return results
+
+
+example_text = """
+ example:
+    python mapping_gemm_cpu.py --target "llvm -mcpu=cascadelake" --trials 200 --output gemm_cpu.json
+    python mapping_gemm_cpu.py --target "llvm -mcpu=haswell" --dtypes float32 --shapes 512 512 512
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="AMOS x86 intrinsics against plain TVM schedules",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--target", type=str, default="llvm -mcpu=cascadelake")
+    parser.add_argument(
+        "--shapes",
+        type=int,
+        nargs="+",
+        default=[256, 256, 256, 512, 512, 512, 1024, 1024, 1024],
+        help="M N K triples",
+    )
+    parser.add_argument(
+        "--dtypes", type=str, nargs="+", choices=["int8", "float32"], default=["int8", "float32"]
+    )
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+    assert len(args.shapes) % 3 == 0
+    args.shapes = [args.shapes[i : i + 3] for i in range(0, len(args.shapes), 3)]
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
@@ -0,0 +1,83 @@
+# compare the default subgraph partition with the cost-driven partition
+import argparse
+import json
+from tvm import tensor_graph, tg, auto_tensorize as at
+
+
+def tune_and_evaluate(name, multi_graph, target, trials, rounds):
+    dispatch = tensor_graph.core.AutoScheduleMultiGraphDispatch
+    measure_opt = at.MeasureOptions(target=target, timeout=100, number=200, min_repeat_ms=500)
+    tid = dispatch.add_graph_task(
+        name, multi_graph, measure_opt, scheduler_option="auto_tensorize", trials=trials
+    )
+    cost = at.MAX_FLOAT
+    evaluator = at.CachedGraphEvaluator(target, dev_id=0, number=100)
+    for i in range(rounds):
+        dispatch.auto_schedule(tid)
+        sch_tensors = dispatch.get_schedules(tid)
+        if dispatch.ready(tid):
+            cost = evaluator.evaluate(multi_graph, sch_tensors).total
+            print("[%s] Round %d whole graph cost is %f ms" % (name, i + 1, cost), flush=True)
+        else:
+            print("[%s] not ready yet" % name)
+    return cost
+
+
+def main(batch, dtype, trials, rounds, policies):
+    target = "cuda"
+    model = tensor_graph.testing.models.resnet18(num_classes=1000, dtype=dtype, out_dtype=dtype)
+    model.eval()
+    img_tensor = tensor_graph.core.GraphTensor([batch, 3, 224, 224], dtype, name="data")
+    fwd_graph = tensor_graph.core.make_fwd_graph(model, [img_tensor])
+
+    results = {}
+    for policy in policies:
+        with tensor_graph.core.partition_policy_scope(policy, target=target) as installed:
+            tir_graph = tensor_graph.core.make_tir_graph(fwd_graph, inference=True)
+            multi_graph = tg.make_tir_multi_graph(tir_graph)
+        num_subgraphs, num_tasks = tensor_graph.core.count_unique_subgraphs(multi_graph)
+        print(
+            "Partition %s: %d subgraphs, %d unique tuning tasks" % (policy, num_subgraphs, num_tasks),
+            flush=True,
+        )
+        if trials > 0:
+            cost = tune_and_evaluate(
+                "resnet18_partition_" + policy, multi_graph, target, trials, rounds)
+        else:
+            cost = None
+        results[policy] = {
+            "subgraphs": num_subgraphs,
+            "tuning_tasks": num_tasks,
+            "latency_ms": cost,
+        }
+        if hasattr(installed, "stats"):
+            results[policy]["fused"], results[policy]["separated"] = installed.stats
+    print(json.dumps(results, indent=2))
+
+
+example_text = """
+ example:
+    python partition_resnet18_tensorcore.py --dtype float16 --trials 20
+    python partition_resnet18_tensorcore.py --trials 0  # only count tuning tasks
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="subgraph counts and latency of resnet18 per partition policy",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        choices=["float16", "float32", "float64"],
+        default="float16",
+    )
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--policies", type=str, nargs="+", default=["default", "cost"])
+
+    args = parser.parse_args()
+    main(args.batch, args.dtype, args.trials, args.rounds, args.policies)
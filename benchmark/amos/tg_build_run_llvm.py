@@ -0,0 +1,100 @@
+# candidates per hour of the build/run pipeline that measures the tensor graph
+# (non-tensorizable) candidates, on a float32 gemm for the llvm target,
+# scaling the number of build processes
+import argparse
+import json
+import os
+import random
+import time
+
+import tvm
+from tvm import auto_tensorize as at
+
+
+def factors(n):
+    return [x for x in range(1, n + 1) if n % x == 0]
+
+
+def gemm_schedule(M, N, K, rng):
+    A = tvm.te.placeholder([M, K], dtype="float32", name="A")
+    B = tvm.te.placeholder([K, N], dtype="float32", name="B")
+    k = tvm.te.reduce_axis([0, K], name="k")
+    C = tvm.te.compute([M, N], lambda i, j: tvm.te.sum(A[i, k] * B[k, j], axis=k), name="C")
+    sch = tvm.te.create_schedule(C.op)
+    i, j = sch[C].op.axis
+    io, ii = sch[C].split(i, factor=rng.choice(factors(M)))
+    jo, ji = sch[C].split(j, factor=rng.choice(factors(N)))
+    ko, ki = sch[C].split(sch[C].op.reduce_axis[0], factor=rng.choice(factors(K)))
+    sch[C].reorder(io, jo, ko, ii, ki, ji)
+    if rng.random() < 0.5:
+        sch[C].vectorize(ji)
+    sch[C].parallel(io)
+    return sch, [A, B, C]
+
+
+def bench(shape, measure_opt, number, n_parallel, seed):
+    rng = random.Random(seed)
+    candidates = [gemm_schedule(*shape, rng) for _ in range(number)]
+    schs = [x[0] for x in candidates]
+    args_lst = [x[1] for x in candidates]
+    beg = time.perf_counter()
+    costs = at.build_and_run_schedules(schs, args_lst, measure_opt, n_parallel=n_parallel)
+    cost = time.perf_counter() - beg
+    return {
+        "n_parallel": n_parallel,
+        "candidates": number,
+        "measured": len([x for x in costs if x != at.MAX_FLOAT]),
+        "total_s": cost,
+        "candidates_per_hour": number / cost * 3600,
+    }
+
+
+def main(args):
+    measure_opt = at.MeasureOptions(
+        target=args.target, timeout=args.timeout, number=args.repeat_number, verbose=0
+    )
+    results = []
+    for n_parallel in args.parallel:
+        if n_parallel > os.cpu_count():
+            continue
+        res = bench(args.shape, measure_opt, args.number, n_parallel, args.seed)
+        print(
+            "%3d procs  %4d/%4d measured  %8.3f s  %10.1f candidates/h"
+            % (
+                res["n_parallel"],
+                res["measured"],
+                res["candidates"],
+                res["total_s"],
+                res["candidates_per_hour"],
+            ),
+            flush=True,
+        )
+        results.append(res)
+    return results
+
+
+example_text = """
+ example:
+    python tg_build_run_llvm.py --number 64 --parallel 1 2 4 8 16 --output tg_build_run.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="candidates per hour of the tensor graph build/run pipeline",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--shape", type=int, nargs=3, default=[256, 256, 256], help="M N K")
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--number", type=int, default=64, help="candidates per run")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--repeat_number", type=int, default=10, help="runs per measurement")
+    parser.add_argument("--timeout", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
@@ -0,0 +1,111 @@
+# time of resuming TG auto-schedule contexts from the shipped tuned_logs,
+# replaying every logged schedule against feeding the log in bulk
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+
+from tvm import tensor_graph, tg, auto_tensorize as at
+from tvm.tensor_graph.core.auto_schedule.auto_schedule import TGAutoScheduleContext
+
+
+def make_subgraphs(batch, dtype):
+    model = tensor_graph.testing.models.resnet18(num_classes=1000, dtype=dtype, out_dtype=dtype)
+    model.eval()
+    img_tensor = tensor_graph.core.GraphTensor([batch, 3, 224, 224], dtype, name="data")
+    fwd_graph = tensor_graph.core.make_fwd_graph(model, [img_tensor])
+    tir_graph = tensor_graph.core.make_tir_graph(fwd_graph, inference=True)
+    multi_graph = tg.make_tir_multi_graph(tir_graph)
+    graphs = tg.get_graphs_from_tir_multi_graph(multi_graph)
+    return OrderedDict(sorted([(x.value, y) for x, y in graphs.items()], key=lambda x: x[0]))
+
+
+def resume(log_dir, subgraphs, measure_opt, fast_resume, copies, tag):
+    workdir = tempfile.mkdtemp()
+    lines = 0
+    contexts = []
+    try:
+        # write the logs under fresh task names, the searchers are cached by name
+        for key, subgraph in subgraphs.items():
+            src = os.path.join(log_dir, "tg:resnet18:subgraph%d.log" % key)
+            if not os.path.isfile(src):
+                continue
+            name = "%s:resnet18:subgraph%d" % (tag, key)
+            with open(src, "r") as fin:
+                content = [line for line in fin if line.strip()]
+            with open(os.path.join(workdir, "tg:" + name + ".log"), "w") as fout:
+                for _ in range(copies):
+                    fout.writelines(content)
+            lines += len(content) * copies
+            contexts.append((name, subgraph))
+
+        beg = time.perf_counter()
+        best = []
+        for name, subgraph in contexts:
+            ctx = TGAutoScheduleContext(
+                name, workdir, subgraph, measure_opt, fast_resume=fast_resume
+            )
+            best.append(ctx.best_perf)
+        cost = time.perf_counter() - beg
+    finally:
+        shutil.rmtree(workdir)
+    return {
+        "mode": "bulk" if fast_resume else "replay",
+        "tasks": len(contexts),
+        "lines": lines,
+        "resume_s": cost,
+        "best_perf": best,
+    }
+
+
+def main(args):
+    log_dir = os.path.join(args.log_dir, "resnet18")
+    subgraphs = make_subgraphs(args.batch, args.dtype)
+    measure_opt = at.MeasureOptions(target=args.target, timeout=10)
+    results = []
+    for i in range(args.repeat):
+        for fast_resume in [False, True]:
+            tag = "resume%d%s" % (i, "bulk" if fast_resume else "replay")
+            res = resume(log_dir, subgraphs, measure_opt, fast_resume, args.copies, tag)
+            print(
+                "%-6s %3d tasks %6d lines  %8.3f s"
+                % (res["mode"], res["tasks"], res["lines"], res["resume_s"]),
+                flush=True,
+            )
+            results.append(res)
+    # both paths must pick the same best schedules
+    assert all(r["best_perf"] == results[0]["best_perf"] for r in results)
+    return results
+
+
+example_text = """
+ example:
+    python tg_resume_time.py --log-dir tuned_logs/3090/resnet18-b1 --copies 50 --output resume.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="resume time of TG auto-schedule logs",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--log-dir", type=str, default="tuned_logs/3090/resnet18-b1")
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument(
+        "--dtype", type=str, choices=["float16", "float32", "float64"], default="float16"
+    )
+    parser.add_argument("--target", type=str, default="cuda")
+    parser.add_argument(
+        "--copies", type=int, default=1, help="repeat every log to emulate longer tuning"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
@@ -0,0 +1,118 @@
+# time one simulated annealing step of SimulatedAnnealingOptimizer:
+# the per-point random walk with a heap merge against the numpy version
+import argparse
+import heapq
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from tvm import autotvm
+from tvm.autotvm.tuner.sa_model_optimizer import (
+    SimulatedAnnealingOptimizer,
+    random_walk,
+    random_walk_batch,
+    merge_topk,
+)
+
+
+class CosineModel(object):
+    """a cheap deterministic stand-in for the cost model"""
+
+    def predict(self, xs):
+        xs = np.asarray(xs, dtype=np.float64)
+        return np.cos(xs * 7e-4) + np.sin(xs * 1.3e-4) + 2
+
+
+def make_task():
+    cfg = autotvm.ConfigSpace()
+    cfg.define_split("tile_b", 64, num_outputs=2)
+    cfg.define_split("tile_y", 1024, num_outputs=4)
+    cfg.define_split("tile_x", 1024, num_outputs=4)
+    cfg.define_split("tile_k", 512, num_outputs=3)
+    cfg.define_knob("auto_unroll_max_step", [0, 512, 1500])
+    cfg.define_knob("unroll_explicit", [0, 1])
+    return SimpleNamespace(config_space=cfg)
+
+
+def loop_step(points, dims, heap_items, in_heap, model):
+    new_points = np.empty_like(points)
+    for i, p in enumerate(points):
+        new_points[i] = random_walk(p, dims)
+    new_scores = model.predict(new_points)
+    for s, p in zip(new_scores, new_points):
+        if s > heap_items[0][0] and p not in in_heap:
+            pop = heapq.heapreplace(heap_items, (s, p))
+            in_heap.remove(pop[1])
+            in_heap.add(p)
+    return new_points
+
+
+def batch_step(points, dims, top, exclusive, model):
+    new_points = random_walk_batch(points, dims)
+    new_scores = model.predict(new_points)
+    top[0], top[1], _ = merge_topk(top[0], top[1], new_scores, new_points, exclusive)
+    return new_points
+
+
+def bench(parallel_size, num, steps, n_iter):
+    task = make_task()
+    dims = [len(x) for x in task.config_space.space_map.values()]
+    model = CosineModel()
+    points = np.random.randint(0, len(task.config_space), parallel_size)
+
+    heap_items = [(float("-inf"), -1 - i) for i in range(num)]
+    in_heap = set([x[1] for x in heap_items])
+    tic = time.perf_counter()
+    for _ in range(steps):
+        loop_step(points, dims, heap_items, in_heap, model)
+    loop_ms = (time.perf_counter() - tic) / steps * 1e3
+
+    top = [np.full(num, float("-inf")), -1 - np.arange(num, dtype=np.int64)]
+    exclusive = np.array([], dtype=np.int64)
+    tic = time.perf_counter()
+    for _ in range(steps):
+        batch_step(points, dims, top, exclusive, model)
+    batch_ms = (time.perf_counter() - tic) / steps * 1e3
+
+    # both versions should find equally good maximums
+    quality = {}
+    for vectorized in [False, True]:
+        np.random.seed(0)
+        opt = SimulatedAnnealingOptimizer(
+            task, n_iter=n_iter, parallel_size=parallel_size, early_stop=None, log_interval=0
+        )
+        opt._vectorized = vectorized
+        found = opt.find_maximums(model, num, set())
+        quality["vectorized" if vectorized else "loop"] = float(np.mean(model.predict(found)))
+
+    return {
+        "parallel_size": parallel_size,
+        "space_size": len(task.config_space),
+        "loop_step_ms": loop_ms,
+        "batch_step_ms": batch_ms,
+        "speedup": loop_ms / batch_ms,
+        "mean_topk_score": quality,
+    }
+
+
+example_text = """
+ example:
+    python sa_step_benchmark.py --parallel_size 128 1024 4096
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="simulated annealing step benchmark",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--parallel_size", type=int, nargs="+", default=[128, 1024, 4096])
+    parser.add_argument("--num", type=int, default=64, help="size of the top-k set")
+    parser.add_argument("--steps", type=int, default=20, help="timed steps")
+    parser.add_argument("--n_iter", type=int, default=100, help="SA iterations of quality check")
+    args = parser.parse_args()
+
+    results = [bench(p, args.num, args.steps, args.n_iter) for p in args.parallel_size]
+    print(json.dumps(results, indent=2))
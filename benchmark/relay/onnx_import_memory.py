@@ -0,0 +1,116 @@
+# peak memory and time of importing (and optionally building) a synthetic
+# large onnx model with external data, eager params against lazy params
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def make_model(path, hidden, layers):
+    """an MLP with `layers` hidden x hidden weights stored as external data"""
+    import onnx
+    from onnx import helper, TensorProto
+    from onnx.external_data_helper import convert_model_to_external_data
+
+    nodes, inits = [], []
+    x = "x"
+    for i in range(layers):
+        w = np.random.uniform(-0.01, 0.01, size=(hidden, hidden)).astype("float32")
+        name = "w%d" % i
+        inits.append(helper.make_tensor(name, TensorProto.FLOAT, w.shape, w.tobytes(), raw=True))
+        nodes.append(helper.make_node("MatMul", [x, name], ["h%d" % i]))
+        nodes.append(helper.make_node("Relu", ["h%d" % i], ["y%d" % i]))
+        x = "y%d" % i
+        del w
+    graph = helper.make_graph(
+        nodes,
+        "large_mlp",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [1, hidden])],
+        outputs=[helper.make_tensor_value_info(x, TensorProto.FLOAT, [1, hidden])],
+        initializer=inits,
+    )
+    model = helper.make_model(graph, producer_name="large_mlp")
+    convert_model_to_external_data(
+        model, all_tensors_to_one_file=True, location="weights.bin", size_threshold=0
+    )
+    onnx.save_model(model, path)
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(path, hidden, lazy, build):
+    from tvm import relay
+
+    ret = {"lazy_params": lazy, "rss_before_MB": peak_rss_mb()}
+    tic = time.perf_counter()
+    mod, params = relay.frontend.from_onnx(path, {"x": (1, hidden)}, lazy_params=lazy)
+    ret["import_s"] = time.perf_counter() - tic
+    ret["import_peak_MB"] = peak_rss_mb()
+    if build:
+        tic = time.perf_counter()
+        relay.build(mod, target="llvm", params=params)
+        ret["build_s"] = time.perf_counter() - tic
+        ret["build_peak_MB"] = peak_rss_mb()
+    print(json.dumps(ret))
+
+
+def main(args):
+    os.makedirs(args.workdir, exist_ok=True)
+    path = os.path.join(args.workdir, "large_mlp.onnx")
+    if not os.path.isfile(path):
+        make_model(path, args.hidden, args.layers)
+    weight_mb = args.hidden * args.hidden * 4 * args.layers / 2 ** 20
+    print(
+        "model: %d x (%d x %d) fp32, %.0f MB of weights"
+        % (args.layers, args.hidden, args.hidden, weight_mb)
+    )
+
+    results = []
+    for lazy in [False, True]:
+        # a fresh process per mode, so the peak rss of one does not hide the other
+        cmd = [sys.executable, __file__, "--child", path, "--hidden", str(args.hidden)]
+        cmd += ["--lazy"] if lazy else []
+        cmd += ["--build"] if args.build else []
+        out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE).stdout.decode()
+        res = json.loads(out.strip().splitlines()[-1])
+        res["weights_MB"] = weight_mb
+        print(json.dumps(res))
+        results.append(res)
+    return results
+
+
+example_text = """
+ example:
+    python onnx_import_memory.py --hidden 4096 --layers 32 --build --output onnx_mem.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="peak memory of onnx import with eager and lazy params",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--hidden", type=int, default=4096)
+    parser.add_argument("--layers", type=int, default=32)
+    parser.add_argument("--workdir", type=str, default="onnx_import_memory")
+    parser.add_argument("--build", action="store_true", help="also measure relay.build")
+    parser.add_argument("--output", type=str, default="")
+    parser.add_argument("--child", type=str, default="", help=argparse.SUPPRESS)
+    parser.add_argument("--lazy", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.hidden, args.lazy, args.build)
+    else:
+        results = main(args)
+        if args.output:
+            with open(args.output, "w") as fout:
+                json.dump(results, fout, indent=2)
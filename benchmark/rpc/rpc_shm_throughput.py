@@ -0,0 +1,89 @@
+# upload + copyfrom throughput of a local rpc session,
+# through shared memory and through the socket
+import argparse
+import json
+import time
+
+import numpy as np
+from tvm import rpc
+from tvm.contrib import util
+
+
+def timeit(func, repeat):
+    func()  # warm up
+    beg = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - beg) / repeat
+
+
+def bench(remote, nbytes, repeat, use_shm):
+    remote.use_shm = use_shm
+    ctx = remote.cpu(0)
+    x = np.random.uniform(size=(nbytes // 4,)).astype("float32")
+    arr = remote.array(x, ctx)
+
+    temp = util.tempdir()
+    path = temp.relpath("blob.bin")
+    x.tofile(path)
+
+    upload = timeit(lambda: remote.upload(path, "blob.bin"), repeat)
+    copyfrom = timeit(lambda: remote.copyfrom(arr, x), repeat)
+    copyto = timeit(lambda: remote.asnumpy(arr), repeat)
+    np.testing.assert_equal(remote.asnumpy(arr), x)
+    remote.remove("blob.bin")
+    return {
+        "transport": "shm" if use_shm else "socket",
+        "bytes": nbytes,
+        "upload_GBps": nbytes / upload / 1e9,
+        "copyfrom_GBps": nbytes / copyfrom / 1e9,
+        "asnumpy_GBps": nbytes / copyto / 1e9,
+    }
+
+
+def main(sizes_mb, repeat):
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    if remote.shm_dir() is None:
+        print("shared memory is not available, only the socket is measured")
+    transports = [False, True] if remote.shm_dir() else [False]
+    results = []
+    for size in sizes_mb:
+        for use_shm in transports:
+            res = bench(remote, size << 20, repeat, use_shm)
+            print(
+                "%-7s %6d MB  upload %7.2f GB/s  copyfrom %7.2f GB/s  asnumpy %7.2f GB/s"
+                % (
+                    res["transport"],
+                    size,
+                    res["upload_GBps"],
+                    res["copyfrom_GBps"],
+                    res["asnumpy_GBps"],
+                ),
+                flush=True,
+            )
+            results.append(res)
+    server.terminate()
+    return results
+
+
+example_text = """
+ example:
+    python rpc_shm_throughput.py --sizes 1 16 256 1024 --output rpc_shm.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="local rpc transfer throughput",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16, 256, 1024], help="MB")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    results = main(args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
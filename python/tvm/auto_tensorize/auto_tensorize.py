@@ -29,8 +29,11 @@ from .search import (
     find_optimized_parameters,
     find_optimized_parameters_v2,
     find_optimized_parameters_v3,
+    load_candidates,
+    seeded_search,
+    BuildCache,
 )
-from .target import get_cuda_compute_version
+from .target import get_cuda_compute_version, is_cpu_target
 from .policy import first_fit, best_fit, all_fit, choose_one
 
 
@@ -179,7 +182,7 @@ def auto_tensorize_schedule(
         schedule_app = MaliScheduleApplier(match_result, sc_info)
         # TODO: write a checker for MALI GPU
         checker = MaliProgramChecker(arch="g76")
-    elif str(target) == "llvm -mcpu=skylake-avx512":
+    elif is_cpu_target(target):
         schedule_gen = LLVMScheduleGenerator(match_result, new_state, log_file=log_file)
         if os.path.exists(log_file) and os.path.isfile(log_file):
             schedule_gen.load_from_file(log_file)
@@ -558,7 +561,7 @@ def auto_tensorize_v3(
                 schedule_app = MaliScheduleApplier(match_result, sc_info)
                 # TODO: write a checker for MALI GPU
                 checker = MaliProgramChecker(arch="g76")
-            elif str(target) == "llvm -mcpu=skylake-avx512":
+            elif is_cpu_target(target):
                 schedule_gen = LLVMScheduleGenerator(
                     match_result, new_state, log_file=current_log_file
                 )
@@ -658,6 +661,7 @@ def auto_tensorize_v3(
     )
 
 
+@seeded_search
 def auto_tensorize_v4(
     target_dag,
     target,
@@ -682,7 +686,22 @@ def auto_tensorize_v4(
     explore_full_match=False,
     enable_perf_model=False,
     perf_percentage=0.5,
+    share_records=False,
+    share_topk=4,
+    replay=False,
+    build_cache=False,
 ):
+    """
+    Search mappings and schedules of target_dag.
+
+    Pass seed=<int> to make the search deterministic. Every measured
+    schedule candidate is traced next to its mapping log, replay=True
+    measures the traced candidates again in the same order (into
+    <log>.replay) instead of searching. build_cache=True builds and
+    measures every distinct lowered program once, the cache is kept in
+    <schedule_log_dir>/<schedule_log_file>.cache across runs (replay
+    always measures again).
+    """
 
     measure_opt.target = target
     match_results = get_match_results(target_dag, target)
@@ -801,6 +820,9 @@ def auto_tensorize_v4(
 
     if not (os.path.exists(schedule_log_dir) and os.path.isdir(schedule_log_dir)):
         os.mkdir(schedule_log_dir)
+    cache = None
+    if build_cache and not replay:
+        cache = BuildCache(os.path.join(schedule_log_dir, schedule_log_file + ".cache"))
     beg = time.time()
     for round in range(repeat_rounds):
         for match_id in range(total_matchings):
@@ -827,9 +849,15 @@ def auto_tensorize_v4(
                 current_log_file = os.path.join(
                     schedule_log_dir, "mapping_" + str(record_key) + "_" + schedule_log_file
                 )
+                trace_file = current_log_file + ".trace"
                 if record_key in schedule_context_cache:
                     sch_ctx = schedule_context_cache[record_key]
                 else:
+                    if replay:
+                        # keep the original log, the replay measures into a new one
+                        current_log_file = current_log_file + ".replay"
+                        if os.path.isfile(current_log_file):
+                            os.remove(current_log_file)
                     if str(target) == "cuda":
                         if not enable_split_K:
                             if use_shared_store:
@@ -890,7 +918,7 @@ def auto_tensorize_v4(
                         schedule_app = MaliScheduleApplier(match_result, sc_info)
                         # TODO: write a checker for MALI GPU
                         checker = MaliProgramChecker(arch="g76")
-                    elif str(target) == "llvm -mcpu=skylake-avx512":
+                    elif is_cpu_target(target):
                         schedule_gen = LLVMScheduleGenerator(
                             match_result, new_state, log_file=current_log_file
                         )
@@ -935,11 +963,47 @@ def auto_tensorize_v4(
                     else:
                         raise RuntimeError("Do not support target: %s" % target)
 
+                    if share_records and not schedule_gen.has_entry():
+                        # start from the best records of the explored sibling mappings
+                        num_seeds = 0
+                        for sibling in all_mappings[match_id]:
+                            sibling_ctx = schedule_context_cache.get(sibling.as_key(), None)
+                            if sibling_ctx is None or not sibling_ctx.schedule_gen.has_entry():
+                                continue
+                            num_seeds += schedule_gen.seed_from(
+                                sibling_ctx.schedule_gen, sibling_ctx.sc_info, k=share_topk
+                            )
+                        if num_seeds:
+                            print(
+                                "Seeded with %d records of sibling mappings." % num_seeds,
+                                flush=True,
+                            )
+
                     # tune loop
                     schedule_trials = tune_trials[mapping_id]
                     if schedule_trials and not pure_test:
                         # this returns a generator
-                        if enable_perf_model:
+                        if replay:
+                            if os.path.isfile(trace_file):
+                                candidates = load_candidates(schedule_gen, trace_file)
+                            else:
+                                candidates = []
+                            generate_schedule = find_optimized_parameters_v2(
+                                match_result,
+                                schedule_gen,
+                                schedule_app,
+                                measure_opt,
+                                checker,
+                                schedule_trials,
+                                builder=builder,
+                                runner=runner,
+                                verbose=verbose_schedule,
+                                search_group_size=search_group_size,
+                                build_parallel=build_parallel,
+                                run_parallel=run_parallel,
+                                candidates=candidates,
+                            )
+                        elif enable_perf_model:
                             generate_schedule = find_optimized_parameters_v3(
                                 match_result,
                                 schedule_gen,
@@ -969,6 +1033,8 @@ def auto_tensorize_v4(
                                 search_group_size=search_group_size,
                                 build_parallel=build_parallel,
                                 run_parallel=run_parallel,
+                                trace_file=trace_file,
+                                cache=cache,
                             )
                     else:
                         generate_schedule = None
@@ -1041,6 +1107,8 @@ def auto_tensorize_v4(
                     f"mapping {str(k)}: explored {v.schedule_gen.num_entries()} schedules",
                     flush=True,
                 )
+            if cache is not None:
+                print(cache.summary(), flush=True)
     end = time.time()
     if not pure_test:
         print(f"Mapping exploration uses time {(end - beg)} s.", flush=True)
@@ -22,6 +22,7 @@ import queue
 from tvm.runtime import Object
 
 from .. import _ffi_api
+from ..target import parse_cpu_target
 from ..hw_abstraction import (
     ComputeAbstraction,
     MemoryAbstraction,
@@ -91,6 +92,8 @@ class HwAbsDAGStage(Object):
 class HardwareAbstractionDAG(object):
     target = None
     scope = None
+    # the cpu features required by dags registered for generic "llvm"
+    required_features = frozenset()
 
     def __init__(self):
         self.hw_abs_dict = {}
@@ -499,6 +502,11 @@ class HardwareAbstractionDAGRegisterPool(object):
         assert isinstance(target, str)
         assert isinstance(mnemonic, str)
         if (target not in self.registries) or (mnemonic not in self.registries[target]):
+            # generic cpu dags are scheduled with the full llvm target
+            if parse_cpu_target(target) is not None and mnemonic in self.registries.get(
+                "llvm", {}
+            ):
+                return self.registries["llvm"][mnemonic]
             raise RuntimeError(("HwAbsDAG not found: target=%s, mnemonic=%s" % (target, mnemonic)))
         return self.registries[target][mnemonic]
 
@@ -508,6 +516,24 @@ class HardwareAbstractionDAGRegisterPool(object):
         else:
             return []
 
+    def enumerate_cpu(self, target):
+        """
+        target: str
+            any llvm target, e.g. llvm -mcpu=cascadelake
+        ---
+        Returns:
+        the hw_abs_dags registered for this -mcpu and the generic
+        "llvm" ones whose required features the cpu has
+        """
+        mcpu, features = parse_cpu_target(target)
+        ret = []
+        if mcpu:
+            ret.extend(self.enumerate("llvm -mcpu=%s" % mcpu))
+        for hw_abs_dag_class in self.enumerate("llvm"):
+            if hw_abs_dag_class.required_features <= features:
+                ret.append(hw_abs_dag_class)
+        return ret
+
 
 HARDWARE_ABSTRACTION_DAG_REGISTER_POOL = HardwareAbstractionDAGRegisterPool()
 
@@ -524,6 +550,8 @@ def register_hw_abs_dag(target, mnemonic, override=False):
 
 
 def query_hw_abs_dag(target):
+    if parse_cpu_target(target) is not None:
+        return HARDWARE_ABSTRACTION_DAG_REGISTER_POOL.enumerate_cpu(target)
     return HARDWARE_ABSTRACTION_DAG_REGISTER_POOL.enumerate(target)
 
 
@@ -1 +1,2 @@
-from .x86_gemv import *
\ No newline at end of file
+from .x86_gemv import *
+from .x86_dot import *
@@ -0,0 +1,115 @@
+import tvm
+from ...hw_abstraction import *
+from ...target import AVX2_FEATURES, AVX512_FEATURES, VNNI_FEATURES
+from ..hw_abs_dag_base import (
+    HardwareAbstractionDAG,
+    register_hw_abs_dag
+)
+from ..hw_abs_dag_base import InstructionScope
+
+
+class X86DotHwAbsDAG(HardwareAbstractionDAG):
+    """One vector instruction sequence of a cpu, registered for generic
+    "llvm" and selected by required_features of the target cpu
+    """
+
+    scope = InstructionScope.thread
+    hw_abs_class = None
+
+    def __init__(self):
+        self.hw_abs_dict = {"dot": self.hw_abs_class}
+        self.main_hw_abs_name = "dot"
+        self.anchor_point = "dot"
+        self.edges = {}
+        self.input_dtypes = {"dot": list(self.hw_abs_class.input_dtypes)}
+        self.output_dtypes = {"dot": [self.hw_abs_class.output_dtype]}
+
+    def get_memory_scope_realize(self, dtype, scope, constant_size, attributes):
+        """
+        dtype: str
+            e.g. int8
+        scope: str
+            e.g. local
+        constant_size: int
+            size of elements in the buffer
+        attributes: dict of {tvm.runtime.String, tvm.tir.StringImm}
+            other useful information, e.g., layout/leading dimension length
+        ---
+        """
+        return ["", constant_size]
+
+    def get_hw_abs_compute_expression(self, compute_key, shape_key, hw_abs_key):
+        hw_abs_class = self.hw_abs_dict[hw_abs_key]
+        hw_abs = hw_abs_class(self.get_name())
+        return hw_abs.get_compute_expression()
+
+    def get_standalone_hw_abs_compute_expression(self, compute_key, shape_key, hw_abs_key):
+        hw_abs_class = self.hw_abs_dict[hw_abs_key]
+        hw_abs = hw_abs_class(self.get_name())
+        return hw_abs.get_compute_expression()
+
+    def get_name(self):
+        return self.hw_abs_class._mnemonic
+
+    def get_intrinsic(self, compute_key, shape_key, hw_abs_key):
+        hw_abs_class = self.hw_abs_dict[hw_abs_key]
+        hw_abs = hw_abs_class(self.get_name())
+        return hw_abs.get_intrinsic()
+
+    def get_header(self):
+        return ""
+
+    def get_all_compute_keys(self):
+        return ["dummy"]
+
+    def get_all_shape_keys(self):
+        return ["%dx%d" % (self.hw_abs_class.lanes, self.hw_abs_class.reduce_len)]
+
+    def get_dag_compute_expression_with_inputs(
+        self, compute_key, shape_key, hw_abs_keys, read_graph
+    ):
+        """
+        ---
+        Returns:
+        inputs, outputs: list of tvm.te.tensor.Tensor
+            the compute expression can be tracked
+            through [output.op.body for output in outputs]
+        """
+        assert len(hw_abs_keys) > 0
+        cache = {}
+        dag_inputs = []
+        dag_outputs = []
+
+        for hw_abs_key in hw_abs_keys:
+            tmp, ret = self.get_standalone_hw_abs_compute_expression(
+                compute_key, shape_key, hw_abs_key
+            )
+            dag_inputs.extend(tmp)
+            cache[hw_abs_key] = ret
+            dag_outputs.extend(ret)
+
+        return dag_inputs, dag_outputs, cache
+
+
+@register_hw_abs_dag("llvm", "avx512-vnni-dot")
+class AVX512VNNIDotHwAbsDAG(X86DotHwAbsDAG):
+    required_features = VNNI_FEATURES
+    hw_abs_class = AVX512VNNIDot
+
+
+@register_hw_abs_dag("llvm", "avx2-dot")
+class AVX2DotHwAbsDAG(X86DotHwAbsDAG):
+    required_features = AVX2_FEATURES
+    hw_abs_class = AVX2Dot
+
+
+@register_hw_abs_dag("llvm", "avx512-fma-fp32")
+class AVX512FMAFp32HwAbsDAG(X86DotHwAbsDAG):
+    required_features = AVX512_FEATURES
+    hw_abs_class = AVX512FMAFp32
+
+
+@register_hw_abs_dag("llvm", "avx2-fma-fp32")
+class AVX2FMAFp32HwAbsDAG(X86DotHwAbsDAG):
+    required_features = AVX2_FEATURES
+    hw_abs_class = AVX2FMAFp32
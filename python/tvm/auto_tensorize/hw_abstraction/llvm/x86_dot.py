@@ -0,0 +1,258 @@
+import tvm
+from ..hw_abs_base import (
+    HardwareAbstraction,
+    register_abstraction,
+    MemoryAbstraction,
+    ComputeAbstraction,
+)
+
+
+class X86Dot(ComputeAbstraction):
+    """C[i] = sum_k A[k] * B[i, k] on one vector register of C,
+    B is [k, i] when kernel_layout is "ki"
+
+    The int8 kernels load the tile of B as one vector, it has to be
+    contiguous, as the operands AMOS materializes for the intrinsic are.
+    """
+
+    lanes = 16
+    reduce_len = 4
+    input_dtypes = ["uint8", "int8"]
+    output_dtype = "int32"
+    kernel_layout = "ik"
+    instruction = ""
+
+    def get_params_usage(self):
+        """
+        ---
+        Returns:
+        usage string: str
+            help to understand the instruction this hardware abstraction contains
+        """
+        usage = (
+            "%s(%s, %dx%d)"
+            % (self.__class__.__name__, self.instruction, self.lanes, self.reduce_len),
+            "Args:",
+            "---",
+            "A: vector pointer for A, type is prefix %s*" % self.input_dtypes[0],
+            "B: matrix pointer for B, type is prefix %s*" % self.input_dtypes[1],
+            "C: dst memory pointer C, type prefix %s*" % self.output_dtype,
+        )
+        return usage
+
+    def get_compute_expression(self):
+        """
+        ---
+        Returns:
+        inputs, outputs: list of tvm.te.tensor.Tensor
+            the compute expression can be tracked
+            through [output.op.body for output in outputs]
+        """
+        data = tvm.te.placeholder((self.reduce_len,), dtype=self.input_dtypes[0], name="data")
+        if self.kernel_layout == "ik":
+            kernel = tvm.te.placeholder(
+                (self.lanes, self.reduce_len), dtype=self.input_dtypes[1], name="kernel"
+            )
+        else:
+            kernel = tvm.te.placeholder(
+                (self.reduce_len, self.lanes), dtype=self.input_dtypes[1], name="kernel"
+            )
+        k = tvm.te.reduce_axis((0, self.reduce_len), name="k")
+
+        def get_kernel(i, k):
+            if self.kernel_layout == "ik":
+                return kernel[i, k]
+            return kernel[k, i]
+
+        C = tvm.te.compute(
+            (self.lanes,),
+            lambda i: tvm.te.sum(
+                data[k].astype(self.output_dtype) * get_kernel(i, k).astype(self.output_dtype),
+                axis=k,
+            ),
+            name="C",
+        )
+        return [data, kernel], [C]
+
+    def dot(self, ins, acc):
+        """
+        ins: list of tvm.tir.Buffer
+        acc: tvm.tir.PrimExpr
+            the vector to accumulate to, None for zero
+        ---
+        Returns:
+        the accumulated vector: tvm.tir.PrimExpr
+        """
+        raise NotImplementedError()
+
+    def get_intrinsic(self):
+        """
+        ---
+        Returns:
+        intrin: tvm.te.TensorIntrin
+        """
+        (A, B), (C,) = self.get_compute_expression()
+
+        A_buffer = tvm.tir.decl_buffer(
+            A.shape, dtype=A.dtype, name="a_buffer", offset_factor=1, strides=[1]
+        )
+        B_buffer = tvm.tir.decl_buffer(
+            B.shape, dtype=B.dtype, name="b_buffer", offset_factor=1, strides=[tvm.te.var("ldw"), 1]
+        )
+        bind_map = {A: A_buffer, B: B_buffer}
+        vec_type = "%sx%d" % (self.output_dtype, self.lanes)
+
+        def _intrin_func(ins, outs):
+            def _instr(index):
+                ib = tvm.tir.ir_builder.create()
+                if index == 1:
+                    ib.emit(outs[0].vstore(0, tvm.tir.const(0, vec_type)))
+                    return ib.get()
+                if index == 0:
+                    ib.emit(outs[0].vstore([0], self.dot(ins, None)))
+                else:
+                    ib.emit(outs[0].vstore([0], self.dot(ins, outs[0].vload([0], vec_type))))
+                return ib.get()
+
+            # body, reset, update
+            return _instr(0), _instr(1), _instr(2)
+
+        buffer_params = {"offset_factor": 1}
+        return tvm.te.decl_tensor_intrin(
+            C.op,
+            _intrin_func,
+            binds=bind_map,
+            default_buffer_params=buffer_params,
+        )
+
+    def get_buffer_memory_scope_info(self, arg_pos=0, args=None):
+        """
+        arg_pos: int
+            the position of argument which requires memory scope
+        args: optional list
+            the full args
+        ---
+        Returns:
+        memory scope info: dict of {tvm.runtime.String, tvm.tir.StringImm}
+            e.g., {target: opencl}
+        """
+        assert isinstance(arg_pos, int)
+        ret = {}
+        return ret
+
+    def get_instruction_prefix(self):
+        """
+        ---
+        Returns:
+        instruction prefix
+            e.g., arm_dot_vlen_local
+        """
+        return ""
+
+    def assemble_instruction(self, args):
+        """
+        args: list of str
+            the arguments in string format
+            args[0]: A
+            args[1]: B
+            args[2]: C
+            args[3]: L
+        ---
+        Returns:
+        full instruction: str
+            the instruction string in full format
+        """
+        assert len(args) == 4
+        for v in args:
+            assert isinstance(v, str)
+        return self.get_instruction_prefix()
+
+
+def broadcast_u8x4(ins, lanes):
+    """the 4 uint8 of A in every int32 lane"""
+    a_int8 = ins[0].vload([0], "uint8x4")
+    re_int32 = tvm.tir.call_intrin("int32", "tir.reinterpret", a_int8)
+    return re_int32.astype("int32x%d" % lanes)
+
+
+@register_abstraction("llvm", "avx512-vnni-dot")
+class AVX512VNNIDot(X86Dot):
+    lanes = 16
+    instruction = "vpdpbusd"
+
+    def dot(self, ins, acc):
+        vec_a = broadcast_u8x4(ins, self.lanes)
+        vec_b = tvm.tir.call_intrin("int32x16", "tir.reinterpret", ins[1].vload([0, 0], "int8x64"))
+        if acc is None:
+            acc = tvm.tir.const(0, "int32x16")
+        return tvm.tir.call_llvm_pure_intrin(
+            "int32x16",
+            "llvm.x86.avx512.vpdpbusd.512",
+            tvm.tir.const(0, "uint32"),
+            acc,
+            vec_a,
+            vec_b,
+        )
+
+
+@register_abstraction("llvm", "avx2-dot")
+class AVX2Dot(X86Dot):
+    """vpmaddubsw saturates the sum of each u8 x s8 pair to int16,
+    so the result is only exact while |A[2k] * B[i, 2k] + A[2k+1] * B[i, 2k+1]|
+    fits in int16, e.g. A below 128 and |B| up to 64. Full-range inputs
+    (255 * 127 * 2) can overflow.
+    """
+
+    lanes = 8
+    instruction = "vpmaddubsw+vpmaddwd"
+
+    def dot(self, ins, acc):
+        vec_a = tvm.tir.call_intrin("int8x32", "tir.reinterpret", broadcast_u8x4(ins, self.lanes))
+        vec_b = ins[1].vload([0, 0], "int8x32")
+        pair_reduction = tvm.tir.call_llvm_pure_intrin(
+            "int16x16",
+            "llvm.x86.avx2.pmadd.ub.sw",
+            tvm.tir.const(0, "uint32"),
+            vec_a,
+            vec_b,
+        )
+        quad_reduction = tvm.tir.call_llvm_pure_intrin(
+            "int32x8",
+            "llvm.x86.avx2.pmadd.wd",
+            tvm.tir.const(0, "uint32"),
+            pair_reduction,
+            tvm.tir.const(1, "int16x16"),
+        )
+        if acc is None:
+            return quad_reduction
+        return quad_reduction + acc
+
+
+class FMAFp32(X86Dot):
+    input_dtypes = ["float32", "float32"]
+    output_dtype = "float32"
+    kernel_layout = "ki"
+    instruction = "vfmadd231ps"
+
+    def dot(self, ins, acc):
+        vec_type = "float32x%d" % self.lanes
+        if acc is None:
+            acc = tvm.tir.const(0, vec_type)
+        for k in range(self.reduce_len):
+            vec_a = tvm.tir.Broadcast(ins[0].vload([k], "float32"), self.lanes)
+            vec_b = ins[1].vload([k, 0], vec_type)
+            # overloaded on the vector type, which is the one signature argument
+            acc = tvm.tir.call_llvm_pure_intrin(
+                vec_type, "llvm.fma", tvm.tir.const(1, "uint32"), vec_a, vec_b, acc
+            )
+        return acc
+
+
+@register_abstraction("llvm", "avx2-fma-fp32")
+class AVX2FMAFp32(FMAFp32):
+    lanes = 8
+
+
+@register_abstraction("llvm", "avx512-fma-fp32")
+class AVX512FMAFp32(FMAFp32):
+    lanes = 16
@@ -2,6 +2,7 @@ from functools import reduce
 from ..utils import bi_product
 import numpy as np
 from ..tensorization_phases import MappingGenerator, MappingApplier
+from ..search import get_rng
 
 
 def all_fit(match_results):
@@ -41,7 +42,7 @@ def first_fit(match_results):
             continue
         choices = bi_product(len(list(match_result.axis_map.values())[0]))
         # random permutation
-        np.random.shuffle(choices)
+        get_rng().shuffle(choices)
         gen = MappingGenerator(match_result)
         record = gen.get(policy="random")
         for bit_vec in choices:
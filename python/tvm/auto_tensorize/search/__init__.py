@@ -1,5 +1,6 @@
 from .ansor_integrate import *
 from .checker import *
 from .measure import *
+from .graph_evaluator import CachedGraphEvaluator, GraphEvaluateResult
 from .parameter import *
 from .record import Entry
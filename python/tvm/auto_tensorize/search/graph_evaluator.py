@@ -0,0 +1,234 @@
+import time
+import tvm
+import numpy as np
+from collections import OrderedDict
+from tvm import tg
+from .measure import MAX_FLOAT
+
+
+class GraphEvaluateResult(object):
+    """
+    Result of one end-to-end evaluation.
+
+    total: float
+        mean end-to-end latency in ms, MAX_FLOAT if any subgraph failed
+    subgraphs: dict of int to float
+        latency of each subgraph in ms, keyed by subgraph id
+    tags: dict of str to (int, float)
+        multiplicity and latency in ms of each unique subgraph
+    rebuilt: int
+        number of unique subgraphs built in this evaluation
+    errors: dict of str to str
+        error message of each failed unique subgraph
+    """
+
+    def __init__(self, total, subgraphs, tags, rebuilt, errors=None):
+        self.total = total
+        self.subgraphs = subgraphs
+        self.tags = tags
+        self.rebuilt = rebuilt
+        self.errors = {} if errors is None else errors
+
+    def to_json(self):
+        return {
+            "total": self.total,
+            "subgraphs": {str(k): v for k, v in self.subgraphs.items()},
+            "tags": {k: {"count": c, "latency": t} for k, (c, t) in self.tags.items()},
+            "rebuilt": self.rebuilt,
+            "errors": self.errors,
+        }
+
+
+class SubgraphEntry(object):
+    """What the evaluator keeps for one unique subgraph"""
+
+    def __init__(self):
+        self.schedule = None
+        self.hash = None
+        self.module = None
+        self.error = None
+        self.signature = None
+        self.arrays = None
+
+
+class CachedGraphEvaluator(object):
+    """
+    In-process end-to-end evaluator for TIRMultiGraph.
+
+    Built modules and buffers are cached by subgraph tag together with the
+    schedule hash, so evaluating after a tuning round only rebuilds the
+    subgraphs whose schedules changed. The schedule hash is the structural
+    hash of the lowered IR, which is much cheaper to get than a build.
+
+    A subgraph that fails to lower, build or run is recorded with MAX_FLOAT
+    and its error instead of raising, the same outcome the pooled
+    evaluate_graph gives a failing graph. Failures are cached with the
+    schedule, so a broken schedule is not rebuilt until it changes.
+
+    Parameters
+    ----------
+    target : str or Target
+
+    dev_id : int
+
+    target_host : str
+
+    number : int
+        number of timed end-to-end runs
+    """
+
+    def __init__(self, target, dev_id=0, target_host="llvm", number=100):
+        self.target = tvm.target.Target(target)
+        self.dev_id = dev_id
+        self.target_host = target_host
+        self.number = number
+        self.ctx = tvm.context(str(self.target.kind), dev_id)
+        # tag -> SubgraphEntry
+        self.subgraphs = {}
+        self.total_builds = 0
+
+    def get_entry(self, tag):
+        if tag not in self.subgraphs:
+            self.subgraphs[tag] = SubgraphEntry()
+        return self.subgraphs[tag]
+
+    def schedule_hash(self, entry, sch, args):
+        if entry.schedule is not None and entry.schedule.same_as(sch):
+            return entry.hash
+        ir_module = tvm.lower(sch, args, simple_mode=True)
+        return tvm.ir.structural_hash(ir_module)
+
+    def get_arrays(self, entry, args):
+        signature = [(tuple([int(x) for x in t.shape]), str(t.dtype)) for t in args]
+        if entry.signature != signature:
+            # the runtime also uses empty arrays, values do not change timing
+            entry.arrays = [tvm.nd.empty(shape, dtype, self.ctx) for shape, dtype in signature]
+            entry.signature = signature
+        return entry.arrays
+
+    def update(self, tag, sch, args):
+        """
+        Bring the entry of tag up to date with sch, building it if the
+        schedule changed.
+
+        Returns
+        -------
+        SubgraphEntry, whether it was built in this call
+        """
+        entry = self.get_entry(tag)
+        try:
+            value = self.schedule_hash(entry, sch, args)
+        except Exception as e:
+            entry.schedule, entry.hash, entry.module = None, None, None
+            entry.error = "lower: " + str(e)
+            return entry, False
+        if entry.hash == value and (entry.module is not None or entry.error is not None):
+            entry.schedule = sch
+            return entry, False
+        entry.schedule, entry.hash = sch, value
+        entry.module, entry.error = None, None
+        try:
+            entry.module = tvm.build(
+                sch, args, target=self.target, target_host=self.target_host, name="main"
+            )
+            self.get_arrays(entry, args)
+        except Exception as e:
+            entry.module = None
+            entry.error = "build: " + str(e)
+        self.total_builds += 1
+        return entry, True
+
+    def evaluate(self, multi_graph, sch_tensors, number=None):
+        """
+        Parameters
+        ----------
+        multi_graph : TIRMultiGraph
+
+        sch_tensors : dict of int to ScheduleTensors
+            e.g. from AutoScheduleMultiGraphDispatch.get_schedules
+
+        number : int or None
+            overrides the number given at construction
+
+        Returns
+        -------
+        GraphEvaluateResult
+        """
+        graphs = tg.get_graphs_from_tir_multi_graph(multi_graph)
+        graphs = {x.value: y for x, y in graphs.items()}
+        order = tg.get_graph_call_order(multi_graph)
+        tags = {key: graphs[key].tag for key in order}
+        return self.evaluate_calls(order, tags, sch_tensors, number=number)
+
+    def evaluate_calls(self, order, tags, sch_tensors, number=None):
+        """
+        Parameters
+        ----------
+        order : list of int
+            subgraph ids in call order
+
+        tags : dict of int to str
+            the tag of each subgraph id
+
+        sch_tensors : dict of int to ScheduleTensors
+
+        number : int or None
+
+        Returns
+        -------
+        GraphEvaluateResult
+        """
+        number = self.number if number is None else number
+        entries = OrderedDict()
+        rebuilt = 0
+        for key in order:
+            tag = tags[key]
+            if tag in entries:
+                continue
+            assert key in sch_tensors, "Missing schedule for subgraph %d." % key
+            sch = sch_tensors[key].schedule
+            args = list(sch_tensors[key].tensors)
+            entries[tag], built = self.update(tag, sch, args)
+            rebuilt += int(built)
+
+        per_tag = {}
+        for tag, entry in entries.items():
+            if entry.error is None:
+                try:
+                    evaluator = entry.module.time_evaluator("main", self.ctx, number=number)
+                    per_tag[tag] = evaluator(*entry.arrays).mean * 1e3
+                except Exception as e:
+                    entry.error = "run: " + str(e)
+            if entry.error is not None:
+                per_tag[tag] = MAX_FLOAT
+        errors = {tag: entry.error for tag, entry in entries.items() if entry.error is not None}
+
+        total = MAX_FLOAT
+        if not errors:
+            calls = [(entries[tags[key]].module["main"], entries[tags[key]].arrays) for key in order]
+            costs = []
+            try:
+                self.ctx.sync()
+                # the first run is warm up
+                for i in range(number + 1):
+                    beg = time.perf_counter()
+                    for func, arrays in calls:
+                        func(*arrays)
+                    self.ctx.sync()
+                    end = time.perf_counter()
+                    if i > 0:
+                        costs.append((end - beg) * 1e3)
+                total = float(np.mean(costs)) if costs else 0.0
+            except Exception as e:
+                errors["graph"] = "run: " + str(e)
+
+        counts = {}
+        for key in order:
+            counts[tags[key]] = counts.get(tags[key], 0) + 1
+        return GraphEvaluateResult(
+            total,
+            {key: per_tag[tags[key]] for key in order},
+            {tag: (counts[tag], per_tag[tag]) for tag in per_tag},
+            rebuilt,
+            errors,
+        )
@@ -2,8 +2,11 @@ from cgitb import enable
 import tvm
 import os
 import time
+import json
+import hashlib
 import tempfile
 import shutil
+import socket
 import traceback
 import numpy as np
 from tvm.contrib import tar, ndk
@@ -42,6 +45,7 @@ class MeasureOptions(object):
         host=None,
         port=None,
         priority=1,
+        n_parallel=None,
     ):
         self.target = target
         self.build_func = build_func
@@ -59,6 +63,8 @@ class MeasureOptions(object):
         self.host = host
         self.port = port
         self.priority = priority
+        # number of build processes, None means the cpu count
+        self.n_parallel = n_parallel
 
 
 GRAPH_EVALUATE_INPUTS = None
@@ -66,10 +72,289 @@ EVALUTE_INPUTS = None
 EVALUTE_SCHEDULE_INPUTS = None
 EVALUTE_SCHEDULES_INPUTS = None
 GLOBAL_BUILD_INPUTS = None
+GLOBAL_SCHEDULE_BUILD_INPUTS = None
 GLOBAL_RUN_INPUTS = None
 GLOBAL_RPC_BUILD_INPUTS = None
 GLOBAL_RPC_RUN_INPUTS = None
 MAX_FLOAT = 1e10
+BUILD_DIR_PREFIX = "at_build_"
+
+
+def _init_fork_worker(global_name, inputs, tmp_root):
+    """Initializer of forked build workers.
+
+    The inputs are bound per pool, so concurrent builders and workers
+    respawned after a timeout never see another batch's global.
+    Temporary files of the worker go to the batch directory.
+    """
+    globals()[global_name] = inputs
+    # the workers already occupy the cores. This only sizes a runtime thread
+    # pool created in the worker, a pool the parent created before the fork
+    # is inherited without its threads and can't be reset from here.
+    # Building does not launch parallel kernels, so it never uses that pool.
+    os.environ["TVM_NUM_THREADS"] = "1"
+    tempfile.tempdir = tmp_root
+
+
+def fork_build_pool(n_parallel, global_name, inputs):
+    """Create a forked ProcessPool whose workers see inputs as global_name.
+
+    Returns
+    -------
+    pool : ProcessPool
+    tmp_root : str
+        The temporary directory of this batch.
+    """
+    tmp_root = tempfile.mkdtemp(prefix=BUILD_DIR_PREFIX)
+    pool = ProcessPool(
+        n_parallel,
+        initializer=_init_fork_worker,
+        initargs=(global_name, inputs, tmp_root),
+        context=multi.get_context("fork"),
+    )
+    return pool, tmp_root
+
+
+def clean_build_dir(tmp_root, build_results):
+    """Remove what the batch left in tmp_root except the built modules,
+    e.g. the files of failed or killed builds"""
+    keep = set()
+    for res in build_results:
+        if res.error_no == auto_scheduler.measure.MeasureErrorNo.NO_ERROR and res.filename:
+            keep.add(os.path.dirname(res.filename.split("-***-")[0]))
+    for entry in os.listdir(tmp_root):
+        path = os.path.join(tmp_root, entry)
+        if path in keep:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+    remove_build_dir(None, tmp_root)
+
+
+def remove_build_dir(filename, tmp_root=None):
+    """Remove the directory of a built module, and its batch directory
+    once that is empty"""
+    if filename:
+        dirname = os.path.dirname(filename)
+        shutil.rmtree(dirname, ignore_errors=True)
+        tmp_root = os.path.dirname(dirname)
+    if tmp_root and os.path.basename(tmp_root).startswith(BUILD_DIR_PREFIX):
+        try:
+            os.rmdir(tmp_root)
+        except OSError:
+            pass
+
+
+class BuildCache(object):
+    """Content-addressed cache of built candidates
+
+    Candidates are keyed by the structural hash of their lowered IRModule,
+    so params that lower to the same program are built and measured once.
+    The built modules and their last measured costs are kept in cache_dir,
+    a restarted search reuses them. Costs are only reused on the same device
+    with the same measure options, see `cost_key`.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory of the cache, created if missing.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.log")
+        # key -> list of file names of the module
+        self.modules = {}
+        # key -> list of costs in seconds
+        self.costs = {}
+        self.lookups = 0
+        self.build_hits = 0
+        self.run_hits = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.isfile(self.index_file):
+            with open(self.index_file, "r") as fin:
+                for line in fin:
+                    if not line.strip():
+                        continue
+                    kind, key, value = json.loads(line)
+                    if kind == "module":
+                        if os.path.isdir(os.path.join(cache_dir, key)):
+                            self.modules[key] = value
+                    else:
+                        self.costs[key] = value
+
+    def _append(self, kind, key, value):
+        with open(self.index_file, "a") as fout:
+            print(json.dumps([kind, key, value]), file=fout, flush=True)
+
+    def lower(self, sch_app, params, target):
+        """Return the cache key and the arguments of params,
+        the key is None if params can't be lowered"""
+        target_dag = sch_app.target_dag
+        args = target_dag.get_inputs() + list(target_dag.tensors)
+        try:
+            sch = tvm.te.create_schedule([x.op for x in target_dag.tensors])
+            sch = sch_app.apply(sch, params)
+            ir_module = tvm.lower(sch, args, simple_mode=True)
+        # pylint: disable=broad-except
+        except Exception:
+            # leave the error report to the builder
+            return None, args
+        prefix = hashlib.md5(str(target).encode()).hexdigest()[:8]
+        return "%s_%d" % (prefix, tvm.ir.structural_hash(ir_module)), args
+
+    @staticmethod
+    def cost_key(key, measure_opt):
+        """The key of the costs of a module measured with measure_opt"""
+        if measure_opt.use_rpc:
+            device = ["rpc", measure_opt.key]
+        else:
+            # the name of the device is not queried, that would initialize
+            # the driver in the process that forks the runners
+            device = ["local", socket.gethostname(), measure_opt.dev_id]
+        salt = device + [
+            measure_opt.number,
+            measure_opt.repeat,
+            measure_opt.min_repeat_ms,
+            measure_opt.enable_cpu_cache_flush,
+        ]
+        return "%s@%s" % (key, hashlib.md5(json.dumps(salt).encode()).hexdigest()[:8])
+
+    def get_costs(self, key):
+        return self.costs.get(key, None)
+
+    def has_module(self, key):
+        return key in self.modules
+
+    def add_module(self, key, build_res):
+        """Copy a successfully built module into the cache"""
+        if key is None or key in self.modules:
+            return
+        if build_res.error_no != auto_scheduler.measure.MeasureErrorNo.NO_ERROR:
+            return
+        filenames = build_res.filename.split("-***-")
+        dst = os.path.join(self.cache_dir, key)
+        shutil.rmtree(dst, ignore_errors=True)
+        shutil.copytree(os.path.dirname(filenames[0]), dst)
+        self.modules[key] = [os.path.basename(x) for x in filenames]
+        self._append("module", key, self.modules[key])
+
+    def load_module(self, key, args):
+        """Return a BuildResult of a fresh copy of a cached module,
+        the runners remove what they have run"""
+        dst = os.path.join(tempfile.mkdtemp(prefix=BUILD_DIR_PREFIX), "module")
+        shutil.copytree(os.path.join(self.cache_dir, key), dst)
+        filename = "-***-".join([os.path.join(dst, x) for x in self.modules[key]])
+        return auto_scheduler.measure.BuildResult(
+            filename, args, auto_scheduler.measure.MeasureErrorNo.NO_ERROR, None, 0
+        )
+
+    def add_costs(self, key, run_res):
+        """Record the costs of a successful measurement"""
+        if key is None or run_res.error_no != auto_scheduler.measure.MeasureErrorNo.NO_ERROR:
+            return
+        costs = [x.value for x in run_res.costs]
+        self.costs[key] = costs
+        self._append("costs", key, costs)
+
+    def make_result(self, key):
+        costs = self.costs[key]
+        return auto_scheduler.measure.MeasureResult(
+            costs, auto_scheduler.measure.MeasureErrorNo.NO_ERROR, None, 0, time.time()
+        )
+
+    def hit_rate(self):
+        """Return the ratio of candidates that skipped the build
+        and the ratio of candidates that skipped the measurement"""
+        if not self.lookups:
+            return 0.0, 0.0
+        return self.build_hits / self.lookups, self.run_hits / self.lookups
+
+    def summary(self):
+        build_rate, run_rate = self.hit_rate()
+        return "Build cache: %d candidates, reused %d builds (%.1f%%), %d measurements (%.1f%%)" % (
+            self.lookups,
+            self.build_hits,
+            build_rate * 100,
+            self.run_hits,
+            run_rate * 100,
+        )
+
+
+def cached_build_and_run(
+    cache,
+    builder,
+    runner,
+    sch_app,
+    params_lst,
+    measure_opt,
+    checker,
+    build_parallel=1,
+    run_parallel=1,
+):
+    """Build and run params_lst with builder and runner,
+    skipping every candidate whose lowered program is already in cache
+
+    Returns
+    -------
+    res : List[MeasureResult]
+        The measure results in the order of params_lst.
+    """
+    run_results = [None for _ in params_lst]
+    # candidates left to measure, the duplicates in this batch are measured once
+    pending_keys = []
+    pending_args = []
+    pending_indices = []
+    position = {}
+    for i, params in enumerate(params_lst):
+        key, args = cache.lower(sch_app, params, measure_opt.target)
+        cache.lookups += 1
+        cost_key = cache.cost_key(key, measure_opt) if key is not None else None
+        if cost_key is not None and cache.get_costs(cost_key) is not None:
+            run_results[i] = cache.make_result(cost_key)
+            cache.build_hits += 1
+            cache.run_hits += 1
+        elif key is not None and key in position:
+            pending_indices[position[key]].append(i)
+            cache.build_hits += 1
+            cache.run_hits += 1
+        else:
+            if key is not None:
+                position[key] = len(pending_keys)
+                if cache.has_module(key):
+                    cache.build_hits += 1
+            pending_keys.append(key)
+            pending_args.append(args)
+            pending_indices.append([i])
+    if not pending_keys:
+        return run_results
+
+    to_build = [j for j, key in enumerate(pending_keys) if not cache.has_module(key)]
+    build_results = [None for _ in pending_keys]
+    if to_build:
+        built = builder(
+            sch_app,
+            [params_lst[pending_indices[j][0]] for j in to_build],
+            measure_opt,
+            checker,
+            n_parallel=build_parallel,
+        )
+        for j, res in zip(to_build, built):
+            cache.add_module(pending_keys[j], res)
+            build_results[j] = res
+    for j, key in enumerate(pending_keys):
+        if build_results[j] is None:
+            build_results[j] = cache.load_module(key, pending_args[j])
+
+    measured = runner(build_results, measure_opt, n_parallel=run_parallel)
+    for key, indices, res in zip(pending_keys, pending_indices, measured):
+        if key is not None:
+            cache.add_costs(cache.cost_key(key, measure_opt), res)
+        for i in indices:
+            run_results[i] = res
+    return run_results
 
 
 def get_np_arrays(tensors):
@@ -493,7 +778,7 @@ def pebble_local_builder_build(
         The timeout limit (in second) for each build thread.
         This is used in a wrapper of the multiprocessing.Process.join().
     n_parallel : int
-        Number of process used to build in parallel. Usually error when > 1.
+        Number of process used to build in parallel.
     build_func : str = 'default'
         The name of build function to process the built module.
     verbose: int = 1
@@ -511,9 +796,7 @@ def pebble_local_builder_build(
     verbose = measure_opt.verbose
     # We use fork and a global variable to copy arguments between processes.
     # This can avoid expensive serialization of TVM IR when using multiprocessing.Pool
-    global GLOBAL_BUILD_INPUTS
-
-    GLOBAL_BUILD_INPUTS = (
+    inputs = (
         sch_app,
         params_lst,
         build_func,
@@ -526,7 +809,8 @@ def pebble_local_builder_build(
         enable_perf_model,
     )
 
-    with ProcessPool(n_parallel) as pool:
+    pool, tmp_root = fork_build_pool(n_parallel, "GLOBAL_BUILD_INPUTS", inputs)
+    with pool:
         future = pool.map(pebble_local_build_worker, range(len(params_lst)), timeout=timeout)
         iterator = future.result()
 
@@ -552,6 +836,7 @@ def pebble_local_builder_build(
                     # print(error)
                 result = None, [], auto_scheduler.measure.MeasureErrorNo.COMPILE_HOST, None, timeout
             results.append(auto_scheduler.measure.BuildResult(*result))
+    clean_build_dir(tmp_root, results)
 
     if verbose >= 1:
         print("", flush=True)
@@ -559,6 +844,163 @@ def pebble_local_builder_build(
     return results
 
 
+def pebble_local_schedule_build_worker(index):
+    """
+    Build one of the ready-made schedules of pebble_local_schedule_builder_build.
+
+    Parameters
+    ----------
+    index : int
+        The index of the schedule to build.
+
+    Returns
+    -------
+    res : tuple
+        The fields of the BuildResult.
+    """
+    global GLOBAL_SCHEDULE_BUILD_INPUTS
+
+    if not GLOBAL_SCHEDULE_BUILD_INPUTS:
+        raise ValueError("GLOBAL_SCHEDULE_BUILD_INPUTS not found")
+    schs, args_lst, build_func, name, target, target_host, verbose = GLOBAL_SCHEDULE_BUILD_INPUTS
+    if build_func == "default":
+        build_func = tar.tar
+    elif build_func == "ndk":
+        build_func = ndk.create_shared
+    else:
+        raise ValueError("Invalid build_func" + build_func)
+
+    tic = time.time()
+    sch = schs[index]
+    args = list(args_lst[index])
+    error_no = auto_scheduler.measure.MeasureErrorNo.NO_ERROR
+    error_msg = None
+    dirname = tempfile.mkdtemp()
+    filename = os.path.join(dirname, "tmp_func." + build_func.output_format)
+    try:
+        with transform.PassContext():
+            func = build_module.build(sch, args, target=target, target_host=target_host, name=name)
+        func.export_library(filename, build_func)
+    # pylint: disable=broad-except
+    except Exception:
+        error_no = auto_scheduler.measure.MeasureErrorNo.COMPILE_HOST
+        error_msg = auto_scheduler.measure.make_error_msg()
+        shutil.rmtree(dirname)
+        filename = ""
+
+    if verbose >= 1:
+        if error_no == auto_scheduler.measure.MeasureErrorNo.NO_ERROR:
+            print(".Y", end="", flush=True)
+        else:
+            print(".E", end="", flush=True)  # Build error
+
+    return (filename, args, error_no, error_msg, time.time() - tic)
+
+
+def pebble_local_schedule_builder_build(schs, args_lst, measure_opt, n_parallel=1, name="main"):
+    """
+    Build ready-made schedules in parallel, e.g. the candidates of tensor graph
+    auto-scheduling, to be measured by pebble_local_runner_run.
+
+    Parameters
+    ----------
+    schs : List[Schedule]
+        The schedules to build.
+    args_lst : List[List[Tensor]]
+        The arguments of every schedule.
+    measure_opt : MeasureOptions
+        The target, build_func, timeout and verbosity are used.
+    n_parallel : int
+        Number of processes used to build in parallel.
+    name : str
+        The name of the built functions.
+
+    Returns
+    -------
+    res : List[BuildResult]
+        The build results of the schedules.
+    """
+    verbose = measure_opt.verbose
+    timeout = measure_opt.timeout
+    inputs = (
+        schs,
+        args_lst,
+        measure_opt.build_func,
+        name,
+        measure_opt.target,
+        measure_opt.target_host,
+        verbose,
+    )
+
+    results = []
+    pool, tmp_root = fork_build_pool(n_parallel, "GLOBAL_SCHEDULE_BUILD_INPUTS", inputs)
+    with pool:
+        future = pool.map(pebble_local_schedule_build_worker, range(len(schs)), timeout=timeout)
+        iterator = future.result()
+
+        while True:
+            try:
+                result = next(iterator)
+            except StopIteration:
+                break
+            except TimeoutError:
+                if verbose >= 1:
+                    print(".T", end="", flush=True)
+                result = (
+                    None,
+                    [],
+                    auto_scheduler.measure.MeasureErrorNo.BUILD_TIMEOUT,
+                    None,
+                    timeout,
+                )
+            except Exception:
+                if verbose >= 1:
+                    print(".F", end="", flush=True)
+                result = None, [], auto_scheduler.measure.MeasureErrorNo.COMPILE_HOST, None, timeout
+            results.append(auto_scheduler.measure.BuildResult(*result))
+    clean_build_dir(tmp_root, results)
+
+    return results
+
+
+def build_and_run_schedules(schs, args_lst, measure_opt, n_parallel=None, name="main"):
+    """
+    Measure ready-made schedules with a parallel build stage and a runner stage
+    that has the device to itself. A drop-in replacement of evaluate_schedules.
+
+    Parameters
+    ----------
+    schs : List[Schedule]
+        The schedules to measure.
+    args_lst : List[List[Tensor]]
+        The arguments of every schedule.
+    measure_opt : MeasureOptions
+        The measure options.
+    n_parallel : int, optional
+        Number of build processes, measure_opt.n_parallel or the cpu count by default.
+    name : str
+        The name of the built functions.
+
+    Returns
+    -------
+    costs : List[float]
+        The mean cost of every schedule in ms, MAX_FLOAT if it failed.
+    """
+    n_parallel = n_parallel or getattr(measure_opt, "n_parallel", None) or multi.cpu_count()
+    n_parallel = max(1, min(n_parallel, len(schs)))
+    build_results = pebble_local_schedule_builder_build(
+        schs, args_lst, measure_opt, n_parallel=n_parallel, name=name
+    )
+    run_results = pebble_local_runner_run(build_results, measure_opt, name=name, n_parallel=1)
+    costs = []
+    for res in run_results:
+        if res.error_no != auto_scheduler.measure.MeasureErrorNo.NO_ERROR:
+            costs.append(MAX_FLOAT)
+        else:
+            costs.append(float(np.mean([float(x) for x in res.costs])) * 1e3)
+    return costs
+
+
 def pebble_local_run_worker(index):
     global GLOBAL_RUN_INPUTS
     (
@@ -710,7 +1152,7 @@ def pebble_local_run_worker(index):
                         error_msg = auto_scheduler.measure.make_error_msg()
                         # print(error_msg)
 
-        shutil.rmtree(os.path.dirname(build_res.filename))
+        remove_build_dir(build_res.filename)
         toc = time.time()
         time.sleep(cooldown_interval)
 
@@ -894,7 +1336,7 @@ def pebble_rpc_run_worker(index):
                 error_no = auto_scheduler.measure.MeasureErrorNo.RUNTIME_DEVICE
                 error_msg = auto_scheduler.measure.make_error_msg()
 
-        shutil.rmtree(os.path.dirname(build_res.filename))
+        remove_build_dir(build_res.filename)
         toc = time.time()
 
         time.sleep(cooldown_interval)
@@ -10,9 +10,69 @@ import json
 import sys
 import os
 import math
+import functools
 
 
-class ParamGenerator(object):
+# the random number generators of the running searches,
+# the global np.random when no search is seeded
+_RNG_STACK = [np.random]
+
+
+def get_rng():
+    """Get the random number generator of the current search"""
+    return _RNG_STACK[-1]
+
+
+class rng_scope(object):
+    """Generators created in this scope draw from one seeded RNG,
+    so the same search can be replayed.
+
+    Parameters
+    ----------
+    seed: int or np.random.RandomState, optional
+        No new RNG is used when it is None.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None or isinstance(seed, np.random.RandomState):
+            self.rng = seed
+        else:
+            self.rng = np.random.RandomState(seed)
+
+    def __enter__(self):
+        _RNG_STACK.append(self.rng if self.rng is not None else get_rng())
+        return _RNG_STACK[-1]
+
+    def __exit__(self, ptype, value, trace):
+        _RNG_STACK.pop()
+
+
+def seeded_search(func):
+    """Run a search function in the rng_scope of its seed keyword"""
+
+    @functools.wraps(func)
+    def _inner(*args, seed=None, **kwargs):
+        with rng_scope(seed):
+            return func(*args, **kwargs)
+
+    return _inner
+
+
+class RandomMixin(object):
+    """The RNG of a generator is the one of the search that created it"""
+
+    @property
+    def rng(self):
+        if "_rng" not in self.__dict__:
+            self._rng = get_rng()
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+
+
+class ParamGenerator(RandomMixin):
     def get(self, *args, **kwargs):
         raise NotImplementedError()
 
@@ -39,7 +99,7 @@ class CDParamGenerator(ParamGenerator):
                 des = self.move_towards_direction(x, d)
                 if self.valid(des):
                     # initial random value
-                    entry[self.to_hashable(d)] = (des, np.random.random())
+                    entry[self.to_hashable(d)] = (des, self.rng.random_sample())
                     if self.to_hashable(des) not in visited:
                         q.put(des)
                         visited.add(self.to_hashable(des))
@@ -73,7 +133,7 @@ class CDParamGenerator(ParamGenerator):
         choices = []
         for d, (des, q_value) in self.Q_table[self.to_hashable(init)].items():
             choices.append((d, des))
-        choice = np.random.randint(0, len(choices))
+        choice = self.rng.randint(0, len(choices))
         return choices[choice]
 
     def get_q_direction(self, init, eps=0.01):
@@ -93,7 +153,7 @@ class CDParamGenerator(ParamGenerator):
 
     def get(self, hint=None, policy="random"):
         if hint is None:
-            choice = np.random.randint(0, len(self.choices))
+            choice = self.rng.randint(0, len(self.choices))
             hint = self.choices[choice]
         else:
             hint = self.map_to_hidden(hint)
@@ -111,6 +171,20 @@ class CDParamGenerator(ParamGenerator):
             ret.append((self.map_from_hidden(choice), -1))
         return ret
 
+    def closest(self, value):
+        """Get the choice nearest to value (in log scale),
+        value may come from another space, e.g. a sibling mapping"""
+
+        def distance(a, b):
+            if isinstance(a, (list, tuple)):
+                if not isinstance(b, (list, tuple)) or len(a) != len(b):
+                    return float("inf")
+                return sum([distance(x, y) for x, y in zip(a, b)])
+            return abs(math.log(a + 1) - math.log(b + 1))
+
+        choice = min(self.choices, key=lambda x: distance(self.map_from_hidden(x), value))
+        return (self.map_from_hidden(choice), -1)
+
     def diameter(self):
         raise NotImplementedError()
 
@@ -141,7 +215,7 @@ class CDParamGenerator(ParamGenerator):
             yield self.get()
 
 
-class EntryGenerator(object):
+class EntryGenerator(RandomMixin):
     def get(self, *args, **kwargs):
         raise NotImplementedError()
 
@@ -173,6 +247,8 @@ class SAEntryGenerator(EntryGenerator):
         self.last_value = 0.0
         self.gen = self._get_next(self.allow_repeat)
         self.verbose_init = verbose_init
+        # records to try before searching, e.g. the best of sibling mappings
+        self.seeds = []
 
     def init_logger(self, verbose=True):
         if self.log_file is not None and self.log_file != "":
@@ -194,7 +270,7 @@ class SAEntryGenerator(EntryGenerator):
         return np.exp((x - best) / (2 * (best + 1e-5)))
 
     def greedy(self, cnt):
-        p = np.random.random()
+        p = self.rng.random_sample()
         q = self.eps / (cnt // 100 + 1)
         return p > q
 
@@ -207,8 +283,8 @@ class SAEntryGenerator(EntryGenerator):
 
         num_cand = len(cand)
         for i in range((max_num + 3) // 4):
-            choice = np.random.randint(0, num_cand)
-            if np.random.random() < ps[choice]:
+            choice = self.rng.randint(0, num_cand)
+            if self.rng.random_sample() < ps[choice]:
                 return cand[choice]
         # no chosen, return the best
         return cand[0]
@@ -280,9 +356,13 @@ class SAEntryGenerator(EntryGenerator):
     def record_from_json(self, obj):
         raise NotImplementedError()
 
+    def add_seeds(self, records):
+        self.seeds.extend(records)
+
     def clear(self, log_file):
         self.entries = []
         self.visited = {}
+        self.seeds = []
         self.last_choice = None
         self.last_value = 0.0
         self.gen = self._get_next(repeat=self.allow_repeat)
@@ -337,7 +417,13 @@ class SAEntryGenerator(EntryGenerator):
     def _get_next(self, repeat=False):
         count = 0
         while True:
-            if not self.entries:
+            if self.seeds:
+                record = self.seeds.pop(0)
+                if str(record) not in self.visited and self.valid(record):
+                    self.visited[str(record)] = 0.0
+                    count += 1
+                    yield record
+            elif not self.entries:
                 self.last_choice = None
                 self.last_value = 0.0
                 count += 1
@@ -473,7 +559,24 @@ def find_optimized_parameters_v2(
     verbose=False,
     build_parallel=1,
     run_parallel=1,
+    trace_file=None,
+    candidates=None,
+    cache=None,
 ):
+    """
+    Search parameters by measuring search_group_size candidates a time,
+    yield the best (value, params) after every trials candidates
+
+    Parameters
+    ----------
+    trace_file: str = None
+        write every measured candidate of this search to this file, in order
+    candidates: list = None
+        replay mode, measure these candidates in order instead of searching,
+        stop when they run out
+    cache: BuildCache = None
+        reuse the builds and measurements of candidates lowering to known programs
+    """
     best_value = 1 / MAX_FLOAT
     best_params = None
     if schedule_gen.has_entry():
@@ -493,57 +596,101 @@ def find_optimized_parameters_v2(
             search_group_num,
             flush=True,
         )
+    # the trace holds the candidates of this search only, so a replay
+    # does not measure the ones of earlier runs again
+    trace = open(trace_file, "w") if trace_file is not None else None
+    if candidates is not None:
+        candidates = iter(candidates)
     tic = time.time()
-    while True:
-        for b in range(search_group_num):
-            if verbose:
-                print("Search round:", b, flush=True)
-            schedule_gen.refresh()
-            params_lst = []
-            for i in range(search_group_size):
-                if b * search_group_size + i < trials:
-                    # params = schedule_gen.get(policy=policy)
-                    params = schedule_gen.get_next(policy=policy)
-                    # print(str(params))
-                    params_lst.append(params)
-            assert params_lst
-            build_results = builder(
-                schedule_app, params_lst, measure_opt, checker, n_parallel=build_parallel
-            )
-            run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
-
-            max_value = 1 / MAX_FLOAT
-            for params, res in zip(params_lst, run_results):
+    try:
+        while True:
+            for b in range(search_group_num):
                 if verbose:
-                    print(res)
-                # use absolute performance
-                value = 1 / np.mean([x.value for x in res.costs])
-                max_value = max(max_value, value)
-                if value > 1 / MAX_FLOAT:  # valid results
-                    schedule_gen.feedback(params, value)
-                if value > best_value:
-                    # print(np.mean([x.value for x in res.costs]))
-                    # cost = evaluate_params(
-                    #     schedule_app,
-                    #     params,
-                    #     measure_opt)
-                    # print("Re-evaluate: %f ms" % cost, flush=True)
-                    best_value = value
-                    best_params = params
+                    print("Search round:", b, flush=True)
+                schedule_gen.refresh()
+                params_lst = []
+                for i in range(search_group_size):
+                    if b * search_group_size + i < trials:
+                        if candidates is not None:
+                            params = next(candidates, None)
+                            if params is None:
+                                break
+                        else:
+                            # params = schedule_gen.get(policy=policy)
+                            params = schedule_gen.get_next(policy=policy)
+                        # print(str(params))
+                        params_lst.append(params)
+                        if trace is not None:
+                            print(json.dumps(params.to_json()), file=trace, flush=True)
+                if not params_lst and candidates is not None:
+                    # nothing left to replay
+                    break
+                assert params_lst
+                if cache is not None:
+                    run_results = cached_build_and_run(
+                        cache,
+                        builder,
+                        runner,
+                        schedule_app,
+                        params_lst,
+                        measure_opt,
+                        checker,
+                        build_parallel=build_parallel,
+                        run_parallel=run_parallel,
+                    )
+                else:
+                    build_results = builder(
+                        schedule_app, params_lst, measure_opt, checker, n_parallel=build_parallel
+                    )
+                    run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
+
+                max_value = 1 / MAX_FLOAT
+                for params, res in zip(params_lst, run_results):
+                    if verbose:
+                        print(res)
+                    # use absolute performance
+                    value = 1 / np.mean([x.value for x in res.costs])
+                    max_value = max(max_value, value)
+                    if value > 1 / MAX_FLOAT:  # valid results
+                        schedule_gen.feedback(params, value)
+                    if value > best_value:
+                        # print(np.mean([x.value for x in res.costs]))
+                        # cost = evaluate_params(
+                        #     schedule_app,
+                        #     params,
+                        #     measure_opt)
+                        # print("Re-evaluate: %f ms" % cost, flush=True)
+                        best_value = value
+                        best_params = params
 
-            if verbose:
-                print("Current best timecost: ", 1 / best_value * 1e3, "ms", flush=True)
-            else:
-                print(f"iteration={b+1}: {max_value}/{best_value}", flush=True)
-            if best_params is not None and verbose:
-                print("Current best params:\n", best_params.to_json(), flush=True)
-        yield best_value, best_params
+                if verbose:
+                    print("Current best timecost: ", 1 / best_value * 1e3, "ms", flush=True)
+                else:
+                    print(f"iteration={b+1}: {max_value}/{best_value}", flush=True)
+                if best_params is not None and verbose:
+                    print("Current best params:\n", best_params.to_json(), flush=True)
+            yield best_value, best_params
+    finally:
+        if trace is not None:
+            trace.close()
     toc = time.time()
     if verbose:
         print("Search %d trials costs %f seconds" % (trials, toc - tic), flush=True)
+        if cache is not None:
+            print(cache.summary(), flush=True)
     return best_value, best_params
 
 
+def load_candidates(schedule_gen, trace_file):
+    """Load the candidates recorded by find_optimized_parameters_v2 for replay"""
+    ret = []
+    with open(trace_file, "r") as fin:
+        for line in fin:
+            if line.strip():
+                ret.append(schedule_gen.record_from_json(json.loads(line)))
+    return ret
+
+
 def find_optimized_parameters_v3(
     match_results,
     schedule_gen,
@@ -7,14 +7,85 @@ from concurrent.futures import TimeoutError
 supported_target = ["cuda", "opencl", "llvm -mcpu=skylake-avx512"]
 
 
+# the x86 extensions used by the cpu intrinsics
+AVX2_FEATURES = frozenset(["avx2", "fma"])
+AVX512_FEATURES = AVX2_FEATURES | frozenset(["avx512"])
+VNNI_FEATURES = AVX512_FEATURES | frozenset(["vnni"])
+
+CPU_FEATURES = {
+    "haswell": AVX2_FEATURES,
+    "broadwell": AVX2_FEATURES,
+    "skylake": AVX2_FEATURES,
+    "core-avx2": AVX2_FEATURES,
+    "alderlake": AVX2_FEATURES,
+    "znver1": AVX2_FEATURES,
+    "znver2": AVX2_FEATURES,
+    "znver3": AVX2_FEATURES,
+    "skylake-avx512": AVX512_FEATURES,
+    "skx": AVX512_FEATURES,
+    "cascadelake": VNNI_FEATURES,
+    "cooperlake": VNNI_FEATURES,
+    "icelake-client": VNNI_FEATURES,
+    "icelake-server": VNNI_FEATURES,
+    "tigerlake": VNNI_FEATURES,
+    "sapphirerapids": VNNI_FEATURES,
+    "znver4": VNNI_FEATURES,
+}
+
+# -mattr names of llvm
+LLVM_ATTR_FEATURES = {
+    "avx2": "avx2",
+    "fma": "fma",
+    "avx512f": "avx512",
+    "avx512vnni": "vnni",
+}
+
+
+def parse_cpu_target(target):
+    """
+    target: str or tvm.target.Target
+    ---
+    Returns:
+    (mcpu, features): (str, frozenset of str)
+        features are the keys of LLVM_ATTR_FEATURES values,
+        None if target is not llvm
+    """
+    parts = str(target).split()
+    if not parts or parts[0] != "llvm":
+        return None
+    mcpu = ""
+    attrs = []
+    for part in parts[1:]:
+        if part.startswith("-mcpu="):
+            mcpu = part[len("-mcpu=") :]
+        elif part.startswith("-mattr="):
+            attrs.extend(part[len("-mattr=") :].split(","))
+    features = set(CPU_FEATURES.get(mcpu, []))
+    for attr in attrs:
+        name = LLVM_ATTR_FEATURES.get(attr[1:], None)
+        if name is None:
+            continue
+        if attr[0] == "+":
+            features.add(name)
+        elif attr[0] == "-":
+            features.discard(name)
+    return mcpu, frozenset(features)
+
+
+def is_cpu_target(target):
+    return parse_cpu_target(target) is not None
+
+
 def get_vector_bitwidth(target):
+    cpu = parse_cpu_target(target)
+    if cpu is not None:
+        # llvm prefers 256-bit vectors on avx-512 cpus as well
+        return 256 if "avx2" in cpu[1] else 128
     assert target in supported_target
     if target == "cuda":
         return 128
     elif target == "opencl":
         return 128
-    elif target == "llvm -mcpu=skylake-avx512":
-        return 256
 
 
 def get_vector_length(target, dtype):
@@ -113,7 +113,7 @@ def mapping_main_op(init, request):
 
 
 class VMappingGenerator(CDParamGenerator):
-    def __init__(self, axis_map, unify=True):
+    def __init__(self, axis_map, unify=True, max_mappings=1000, exhaustive_limit=15):
         num_items = 0
         keys = []
         values = []
@@ -126,64 +126,37 @@ class VMappingGenerator(CDParamGenerator):
             values.append(lst)
 
         tuples = list(zip(*values))
-
-        def unify_helper(bit_vec, tuples, visited, results):
-            super_tuple = []
-            num_key = len(tuples[0])
-            for i, bit in enumerate(bit_vec):
-                if bit:
-                    super_tuple.append(tuples[i])
-            if not super_tuple:
-                return
-            merged_tuple = []
-            for i in range(num_key):
-                tmp = set()
-                for v in super_tuple:
-                    tmp.add(str(v[i].var.name))
-                merged_tuple.append(tuple(sorted(list(tmp))))
-            merged_tuple = tuple(merged_tuple)
-
-            if merged_tuple in visited:
-                return
-            else:
-                visited.add(merged_tuple)
-                results.append(bit_vec)
-
-        if unify and num_items <= 15:
+        self.intrin_extents = [int(k.dom.extent) for k in keys]
+        self.item_names = [[str(v.var.name) for v in item] for item in tuples]
+        self.axis_extents = {}
+        for item in tuples:
+            for v in item:
+                self.axis_extents[str(v.var.name)] = int(v.dom.extent)
+
+        if unify and num_items <= exhaustive_limit:
             # when just a few choices
-
             vmaps = bi_product(num_items)
             visited = set()
             unified_vmaps = []
             for bit_vec in vmaps:
-                unify_helper(bit_vec, tuples, visited, unified_vmaps)
-
+                merged_tuple = self.merge(bit_vec)
+                if merged_tuple is not None and merged_tuple not in visited:
+                    visited.add(merged_tuple)
+                    unified_vmaps.append(bit_vec)
             self.vmaps = unified_vmaps
         elif unify:
-            # when too many choices
-            # we mainly consider two kinds of choices:
-            # 1. single item choice
-            # 2. all items
-
-            vmaps = []
-            for i, item in enumerate(tuples):
-                choose = True
-                for a, b in zip(item, keys):
-                    if int(a.dom.extent) != int(b.dom.extent):
-                        choose = False
-                        break
-                if choose:
-                    vmaps.append([1 if j == i else 0 for j in range(num_items)])
-            if not vmaps:
-                vmaps = [[1 if j == i else 0 for j in range(num_items)] for i in range(num_items)]
-            vmaps.append([1 for i in range(num_items)])
-            visited = set()
-            unified_vmaps = []
-            for bit_vec in vmaps:
-                unify_helper(bit_vec, tuples, visited, unified_vmaps)
-            self.vmaps = unified_vmaps
+            # when too many choices, enumerate the distinct mappings lazily
+            # from the best one and keep at most max_mappings of them
+            self.vmaps = []
+            for bit_vec in self.iter_vmaps():
+                self.vmaps.append(bit_vec)
+                if len(self.vmaps) >= max_mappings:
+                    break
         else:
             self.vmaps = bi_product(num_items)
+        if unify:
+            # neighbor choices have similar padding
+            self.vmaps = sorted(self.vmaps, key=lambda x: self.score(self.merge(x)), reverse=True)
         print(f"Totally {len(self.vmaps)} different mappings for this matching", flush=True)
         # self.vmaps = [[1 for _ in range(num_items)]]
         self.choices = list(range(len(self.vmaps)))
@@ -193,6 +166,65 @@ class VMappingGenerator(CDParamGenerator):
         # self.directions = [0]
         self.init_Q_table()
 
+    def merge(self, bit_vec):
+        """The canonical form of a bit vector: the target axes
+        mapped to each intrinsic axis. Bit vectors with the same
+        canonical form lead to the same transformation."""
+        merged_tuple = None
+        for i, bit in enumerate(bit_vec):
+            if bit:
+                merged_tuple = self.merge_item(merged_tuple, i)
+        return merged_tuple
+
+    def merge_item(self, merged_tuple, i):
+        if merged_tuple is None:
+            return tuple((name,) for name in self.item_names[i])
+        return tuple(
+            tuple(sorted(set(names) | {name}))
+            for names, name in zip(merged_tuple, self.item_names[i])
+        )
+
+    def score(self, merged_tuple):
+        """Padding efficiency of a canonical mapping: the ratio of
+        useful work after the fused target axes are padded to
+        the intrinsic. Larger fused extents break ties."""
+        efficiency = 1.0
+        total = 1
+        for names, intrin_extent in zip(merged_tuple, self.intrin_extents):
+            extent = reduce(lambda x, y: x * self.axis_extents[y], names, 1)
+            padded = (extent + intrin_extent - 1) // intrin_extent * intrin_extent
+            efficiency *= extent / padded
+            total *= extent
+        return efficiency, total
+
+    def iter_vmaps(self):
+        """Lazily enumerate bit vectors of distinct mappings, best score first.
+
+        A mapping is reached from a smaller one by adding an item,
+        so every canonical form is visited once without enumerating
+        all the 2^n bit vectors.
+        """
+        num_items = len(self.item_names)
+        visited = set()
+        heap = []
+
+        def push(merged_tuple, mask):
+            if merged_tuple in visited:
+                return
+            visited.add(merged_tuple)
+            efficiency, total = self.score(merged_tuple)
+            # the mask keeps the order deterministic for equal scores
+            heapq.heappush(heap, (-efficiency, -total, mask, merged_tuple))
+
+        for i in range(num_items):
+            push(self.merge_item(None, i), 1 << i)
+        while heap:
+            _, _, mask, merged_tuple = heapq.heappop(heap)
+            yield tuple((mask >> j) & 1 for j in range(num_items))
+            for i in range(num_items):
+                if not (mask >> i) & 1:
+                    push(self.merge_item(merged_tuple, i), mask | (1 << i))
+
     def map_to_hidden(self, factors):
         return self.reverse_map[self.to_hashable(factors)]
 
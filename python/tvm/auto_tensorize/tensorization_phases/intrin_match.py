@@ -173,6 +173,9 @@ def get_match_results(target_dag, target):
     ret = []
     for hw_abs_dag_cls in query_hw_abs_dag(target):
         hw_abs_dag = hw_abs_dag_cls()
+        if hw_abs_dag.target == "llvm":
+            # generic cpu dag, schedule for the given cpu
+            hw_abs_dag.target = str(target)
         for compute_key in hw_abs_dag.get_all_compute_keys():
             for shape_key in hw_abs_dag.get_all_shape_keys():
                 ret.extend(
@@ -190,3 +190,54 @@ class SplitKGenerator(CDParamGenerator):
 class AcceleratorScheduleGenerator(SAEntryGenerator):
     def get_schedule_compute_info(self):
         raise NotImplementedError()
+
+    def translate_record(self, record):
+        raise NotImplementedError()
+
+    def translate_splits(self, gens, factors):
+        """Move the split factors of a sibling record to the nearest
+        choices of the split generators of this space"""
+        # the inner axes sit next to the intrinsic and line up
+        # across mappings, so align the lists from the innermost
+        offset = len(factors) - len(gens)
+        ret = []
+        for i, gen in enumerate(gens):
+            if 0 <= i + offset < len(factors):
+                ret.append(gen.closest(factors[i + offset][0]))
+            else:
+                ret.append(gen.get())
+        return ret
+
+    def seed_from(self, other, sc_info, k=4):
+        """Try the top-k records of a sibling generator (another mapping
+        of the same match) first, the records are moved to the nearest
+        valid choices of this space.
+
+        Parameters
+        ----------
+        other: AcceleratorScheduleGenerator
+            The generator of the sibling mapping.
+
+        sc_info: ScheduleComputeInfo
+            The compute info of the sibling mapping.
+
+        k: int
+            How many records to take.
+
+        Returns
+        -------
+        int
+            The number of seeds added.
+        """
+        my_info = self.get_schedule_compute_info()
+        # records of different tiling structures can't be translated
+        if sc_info.kwargs != my_info.kwargs:
+            return 0
+        seeds = []
+        for entry in other.topk(k):
+            try:
+                seeds.append(self.translate_record(entry.record))
+            except (KeyError, IndexError, ValueError, NotImplementedError):
+                continue
+        self.add_seeds(seeds)
+        return len(seeds)
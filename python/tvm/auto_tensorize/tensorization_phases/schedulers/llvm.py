@@ -316,6 +316,16 @@ class LLVMScheduleGenerator(AcceleratorScheduleGenerator):
             )
         return record
 
+    def translate_record(self, record):
+        """Translate a record of a sibling mapping into this space"""
+        return self.record_cls(
+            self.inline.closest(record.inline[0]),
+            self.vectorize.closest(record.vectorize[0]),
+            self.translate_splits(self.spatial_splits, record.spatial_factors),
+            self.translate_splits(self.reduce_splits, record.reduce_factors),
+            self.translate_splits(self.last_splits, record.last_factors),
+        )
+
     def get_records_mutate_one_generator(self, record, to_mutate, steps):
         inline = record.inline
         vec = record.vectorize
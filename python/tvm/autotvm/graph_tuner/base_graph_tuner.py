@@ -17,6 +17,7 @@
 # pylint: disable=too-many-arguments,too-many-locals,too-many-statements,too-many-instance-attributes,too-many-branches,too-many-nested-blocks,invalid-name,unused-argument,unused-variable,no-member,no-value-for-parameter
 """Base class for graph tuner."""
 import logging
+import os
 from abc import abstractmethod
 
 import numpy as np
@@ -27,7 +28,8 @@ from tvm import te
 from tvm import autotvm, relay
 from tvm.autotvm.task import get_config
 from tvm.autotvm.record import encode, load_from_file
-from tvm.autotvm.measure import MeasureResult, MeasureInput
+from tvm.autotvm.measure import MeasureResult, MeasureInput, create_measure_batch
+from tvm.autotvm.env import GLOBAL_SCOPE
 
 from ...target import Target
 from .utils import (
@@ -374,6 +376,9 @@ class BaseGraphTuner(object):
         layout_records=None,
         target_host=None,
         infer_layout=False,
+        cache_file=None,
+        estimate_below=0,
+        estimate_bandwidth=10.0,
     ):
         """Benchmark all possible layout transformation in the graph,
         given a set of schedule candidates for each workload of target operator.
@@ -437,6 +442,20 @@ class BaseGraphTuner(object):
             of benchmarking on target device.
 
             This might bring performance loss comparing to benchmarking layout transformation.
+
+        cache_file : str, optional
+            Persistent cache of layout_transform records. Records of the same workload
+            (shape, dtype, source and destination layout) and target are reused
+            instead of benchmarking, new measurements are appended to it.
+
+        estimate_below : int, optional
+            Layout transformations whose input has fewer elements than this are
+            estimated instead of benchmarked. The time per element of the known
+            records is used if there is any, otherwise the time to read and write the
+            tensor once at estimate_bandwidth.
+
+        estimate_bandwidth : float, optional
+            Memory bandwidth in GB/s used by the estimation.
         """
         self._logger.info("Start to benchmark layout transformation...")
         if layout_records is None and infer_layout:
@@ -458,6 +477,18 @@ class BaseGraphTuner(object):
                 flops = np.prod(input_shape)
                 num_flops += flops
                 total_time += record[1].costs[0]
+        if cache_file is not None and os.path.isfile(cache_file):
+            num_cached = 0
+            for record in load_from_file(cache_file):
+                if str(record[0].target) != str(self._target) or record[1].error_no != 0:
+                    continue
+                ltf_wkl = record[0].task.workload
+                if ltf_wkl not in self._layout_transform_perf_records:
+                    self._layout_transform_perf_records[ltf_wkl] = record
+                    num_flops += np.prod(ltf_wkl[1][1])
+                    total_time += record[1].costs[0]
+                    num_cached += 1
+            self._logger.info("Load %d layout transformation records from cache.", num_cached)
         avg_time = total_time / num_flops if num_flops > 0 else 0
 
         args_list = []
@@ -470,15 +501,6 @@ class BaseGraphTuner(object):
 
         self._iterate_layout_transform(_fetch_args_callback)
 
-        def _log_to_list(record_list):
-            """Callback to log result to a list."""
-
-            def _callback(_, inputs, results):
-                """Callback implementation"""
-                record_list.append((inputs[0], results[0]))
-
-            return _callback
-
         builder = autotvm.LocalBuilder(n_parallel=n_parallel, build_func=build_func)
         runner = autotvm.LocalRunner(number=min_exec_num, repeat=1, timeout=timeout)
         if use_rpc:
@@ -494,18 +516,19 @@ class BaseGraphTuner(object):
                 timeout=timeout,
             )
         measure_option = autotvm.measure_option(builder=builder, runner=runner)
+        to_measure = {}
         for args in args_list:
             data, in_layout, out_layout = args
             ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
-            if ltf_workload in self._layout_transform_perf_records:
+            if ltf_workload in self._layout_transform_perf_records or ltf_workload in to_measure:
                 continue
 
-            if infer_layout:
-                input_shape = ltf_workload[1][1]
-                flops = 1
-                for i in input_shape:
-                    flops *= i
+            input_shape = ltf_workload[1][1]
+            flops = 1
+            for i in input_shape:
+                flops *= i
 
+            if infer_layout or flops < estimate_below:
                 # Rule out invalid layout transformations
                 out = topi.layout_transform(data, in_layout, out_layout)
                 out_flops = 1
@@ -514,8 +537,12 @@ class BaseGraphTuner(object):
 
                 if flops != out_flops:
                     inferred_time = INVALID_LAYOUT_TIME
-                else:
+                elif infer_layout or avg_time > 0:
                     inferred_time = flops * avg_time
+                else:
+                    # read and write the tensor once
+                    nbytes = flops * tvm.runtime.DataType(ltf_workload[1][2]).bits // 8
+                    inferred_time = 2 * nbytes / (estimate_bandwidth * 1e9)
 
                 record_input = MeasureInput(target=self._target, task=None, config=None)
                 record_output = MeasureResult(
@@ -524,19 +551,50 @@ class BaseGraphTuner(object):
                 self._layout_transform_perf_records[ltf_workload] = (record_input, record_output)
                 continue
 
-            records = []
-            task = autotvm.task.create(
-                "layout_transform", args=args, target=self._target, target_host=target_host
-            )
-            tuner = autotvm.tuner.GridSearchTuner(task)
-            tuner.tune(n_trial=1, measure_option=measure_option, callbacks=[_log_to_list(records)])
-            if not isinstance(records[0][1].costs[0], float):
-                records[0] = (records[0][0], records[0][1]._replace(costs=(INVALID_LAYOUT_TIME,)))
-            self._layout_transform_perf_records[ltf_workload] = records[0]
+            to_measure[ltf_workload] = args
+
+        if to_measure:
+            self._measure_layout_transforms(to_measure, measure_option, target_host, cache_file)
 
         self._iterate_layout_transform(self._create_matrix_callback)
         self._logger.info("Benchmarking layout transformation successful.")
 
+    def _measure_layout_transforms(self, workloads, measure_option, target_host, cache_file):
+        """Measure layout transformations in batches of the builder's n_parallel.
+        Workloads of a batch are built concurrently, and also run concurrently
+        when the runner allows it (e.g. RPCRunner)."""
+        items = []
+        for ltf_workload, args in workloads.items():
+            task = autotvm.task.create(
+                "layout_transform", args=args, target=self._target, target_host=target_host
+            )
+            items.append((ltf_workload, MeasureInput(task.target, task, task.config_space.get(0))))
+
+        measure_batch = create_measure_batch(items[0][1].task, measure_option)
+        n_parallel = getattr(measure_batch, "n_parallel", 1)
+        cache = open(cache_file, "a") if cache_file is not None else None
+        GLOBAL_SCOPE.in_tuning = True
+        try:
+            for i in range(0, len(items), n_parallel):
+                batch = items[i : i + n_parallel]
+                results = measure_batch([inp for _, inp in batch])
+                for (ltf_workload, inp), res in zip(batch, results):
+                    if res.error_no == 0 and cache is not None:
+                        cache.write(encode(inp, res) + "\n")
+                    if not isinstance(res.costs[0], float):
+                        res = res._replace(costs=(INVALID_LAYOUT_TIME,))
+                    self._layout_transform_perf_records[ltf_workload] = (inp, res)
+                self._logger.info(
+                    "Benchmarked %d/%d layout transformations.",
+                    min(i + n_parallel, len(items)),
+                    len(items),
+                )
+        finally:
+            GLOBAL_SCOPE.in_tuning = False
+            if cache is not None:
+                cache.close()
+        del measure_batch
+
     @property
     def layout_transform_perf_records(self):
         """Get layout transformation dictionary for input graph.
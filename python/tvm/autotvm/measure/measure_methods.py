@@ -594,7 +594,7 @@ def run_through_rpc(
 
         # set input
         if ref_input:
-            args = [nd.array(x, ctx=ctx) for x in ref_input]
+            args = [remote.array(x, ctx) for x in ref_input]
         else:
             try:
                 random_fill = remote.get_function("tvm.contrib.random.random_fill")
@@ -622,7 +622,7 @@ def run_through_rpc(
         # check correctness of output
         if ref_output:
             for expected, real in zip(ref_output, args):
-                if not np.allclose(expected, real.asnumpy(), rtol=1e-4):
+                if not np.allclose(expected, remote.asnumpy(real), rtol=1e-4):
                     logger.warning("Wrong Answer!")
                     errno = MeasureErrorNo.WRONG_ANSWER
     except TVMError as exc:
@@ -20,6 +20,7 @@
 
 import argparse
 import base64
+import hashlib
 import logging
 import multiprocessing
 import pickle
@@ -122,6 +123,19 @@ def encode(inp, result, protocol="json"):
     raise RuntimeError("Invalid log protocol: " + protocol)
 
 
+def clean_json_to_python(x):
+    """1. Convert all list in x to tuple (hashable)
+    2. Convert unicode to str for python2
+    """
+    if isinstance(x, list):
+        return tuple([clean_json_to_python(a) for a in x])
+    if isinstance(x, _unicode):
+        return str(x)
+    if isinstance(x, (_long, int)):
+        return int(x)
+    return x
+
+
 def decode(row, protocol="json"):
     """Decode encoded record string to python object
 
@@ -156,18 +170,6 @@ def decode(row, protocol="json"):
             tgt = tgt.replace("-target", "-mtriple")
         tgt = Target(str(tgt))
 
-        def clean_json_to_python(x):
-            """1. Convert all list in x to tuple (hashable)
-            2. Convert unicode to str for python2
-            """
-            if isinstance(x, list):
-                return tuple([clean_json_to_python(a) for a in x])
-            if isinstance(x, _unicode):
-                return str(x)
-            if isinstance(x, (_long, int)):
-                return int(x)
-            return x
-
         tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
         config = ConfigEntity.from_json_dict(row["config"])
         inp = MeasureInput(tgt, tsk, config)
@@ -194,25 +196,262 @@ def decode(row, protocol="json"):
     raise RuntimeError("Invalid log protocol: " + protocol)
 
 
-def load_from_file(filename):
+def _decode_chunk(rows):
+    return [ret for ret in map(decode, rows) if ret is not None]
+
+
+def _iter_chunks(iterable, chunk_size):
+    chunk = []
+    for x in iterable:
+        chunk.append(x)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_from_file(filename, n_parallel=1, chunk_size=4096):
     """Generator: load records from file.
     This is a generator that yields the records.
 
     Parameters
     ----------
     filename: str
+    n_parallel: int, optional
+        Number of processes used to decode the rows. Rows are decoded
+        chunk by chunk and yielded in the file order.
+    chunk_size: int, optional
+        Number of rows sent to a process at once
 
     Yields
     ------
     input: autotvm.measure.MeasureInput
     result: autotvm.measure.MeasureResult
     """
-    for row in open(filename):
-        if row and not row.startswith("#"):
-            ret = decode(row)
-            if ret is None:
-                continue
-            yield ret
+    rows = (row for row in open(filename) if row and not row.startswith("#"))
+    if n_parallel is None or n_parallel > 1:
+        pool = multiprocessing.Pool(n_parallel)
+        try:
+            for chunk in pool.imap(_decode_chunk, _iter_chunks(rows, chunk_size)):
+                for ret in chunk:
+                    yield ret
+        finally:
+            pool.terminate()
+        return
+    for row in rows:
+        ret = decode(row)
+        if ret is None:
+            continue
+        yield ret
+
+
+RECORD_INDEX_VERSION = 1
+_RECORD_INDEX_DTYPE = np.dtype(
+    [("key", "<u8"), ("offset", "<i8"), ("length", "<i8"), ("cost", "<f8")]
+)
+# target str -> (keys, model)
+_target_key_cache = {}
+
+
+def _index_key(kind, key, workload):
+    """hash (kind, model or target key, workload) to uint64, kind is "model" or "key"."""
+    digest = hashlib.md5(repr((kind, key, workload)).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _target_keys(tgt):
+    if tgt not in _target_key_cache:
+        target = Target(tgt.replace("-target", "-mtriple"))
+        _target_key_cache[tgt] = (tuple(str(k) for k in target.keys), str(target.model))
+    return _target_key_cache[tgt]
+
+
+def _scan_chunk(lines):
+    """Index a chunk of (offset, raw line) without building MeasureInput.
+    Failed measurements and old version rows are skipped like ApplyHistoryBest does."""
+    ret = []
+    for offset, line in lines:
+        if not line.strip() or line.startswith(b"#"):
+            continue
+        row = json.loads(line)
+        if "v" in row and row["v"] == 0.1:
+            continue
+        if row["result"][1] != 0:
+            continue
+        tgt, task_name, task_args, _ = row["input"]
+        workload = (clean_json_to_python(task_name),) + clean_json_to_python(task_args)
+        cost = float(np.mean(row["result"][0]))
+        keys, model = _target_keys(str(tgt))
+        for k in keys:
+            ret.append((_index_key("key", k, workload), offset, len(line), cost))
+        if model != "unknown":
+            ret.append((_index_key("model", model, workload), offset, len(line), cost))
+    return ret
+
+
+def _iter_lines_with_offset(filename):
+    offset = 0
+    with open(filename, "rb") as fin:
+        for line in fin:
+            yield offset, line
+            offset += len(line)
+
+
+class RecordIndex(object):
+    """Binary index from (model or target key, workload) to the best record of a log file.
+
+    The index is stored next to the log as ``<log>.index.npy``, a sorted array of
+    (key hash, byte offset, byte length, mean cost), with ``<log>.index.json``
+    recording the size and mtime of the indexed log. It is memory-mapped, so a
+    lookup only reads and decodes the row that is actually queried.
+
+    Only the json protocol is supported.
+
+    Parameters
+    ----------
+    filename: str
+        The log file
+    entries: numpy.ndarray
+        The sorted index entries
+    """
+
+    def __init__(self, filename, entries):
+        self.filename = filename
+        self.entries = entries
+
+    @staticmethod
+    def index_path(filename):
+        return filename + ".index.npy"
+
+    @staticmethod
+    def meta_path(filename):
+        return filename + ".index.json"
+
+    @staticmethod
+    def _log_stat(filename):
+        stat = os.stat(filename)
+        return {"version": RECORD_INDEX_VERSION, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    @staticmethod
+    def build(filename, n_parallel=1, chunk_size=16384, save=True):
+        """Scan a log file and build its index.
+
+        Parameters
+        ----------
+        filename: str
+            The log file
+        n_parallel: int, optional
+            Number of processes used to scan the file
+        chunk_size: int, optional
+            Number of rows sent to a process at once
+        save: bool, optional
+            Whether to write the sidecar files
+
+        Returns
+        -------
+        index: RecordIndex
+        """
+        tic = time.time()
+        meta = RecordIndex._log_stat(filename)
+        chunks = _iter_chunks(_iter_lines_with_offset(filename), chunk_size)
+        if n_parallel is None or n_parallel > 1:
+            pool = multiprocessing.Pool(n_parallel)
+            try:
+                rows = list(itertools.chain.from_iterable(pool.imap(_scan_chunk, chunks)))
+            finally:
+                pool.terminate()
+        else:
+            rows = list(itertools.chain.from_iterable(map(_scan_chunk, chunks)))
+
+        entries = np.array(rows, dtype=_RECORD_INDEX_DTYPE)
+        if entries.size:
+            # keep the first record with the lowest cost of every key,
+            # the same record ApplyHistoryBest keeps
+            order = np.lexsort((entries["offset"], entries["cost"], entries["key"]))
+            entries = entries[order]
+            first = np.ones(entries.size, dtype=bool)
+            first[1:] = entries["key"][1:] != entries["key"][:-1]
+            entries = entries[first]
+        logger.info(
+            "Index %d keys from %s in %.2f s", entries.size, filename, time.time() - tic
+        )
+
+        if save:
+            np.save(RecordIndex.index_path(filename), entries)
+            with open(RecordIndex.meta_path(filename), "w") as fout:
+                json.dump(meta, fout)
+        return RecordIndex(filename, entries)
+
+    @staticmethod
+    def open(filename, n_parallel=1, rebuild=False):
+        """Load the index of a log file, build it if it is missing or outdated.
+
+        Parameters
+        ----------
+        filename: str
+            The log file
+        n_parallel: int, optional
+            Number of processes used if the index is (re)built
+        rebuild: bool, optional
+            Always rebuild the index
+
+        Returns
+        -------
+        index: RecordIndex
+        """
+        index_path = RecordIndex.index_path(filename)
+        meta_path = RecordIndex.meta_path(filename)
+        if not rebuild and os.path.isfile(index_path) and os.path.isfile(meta_path):
+            with open(meta_path) as fin:
+                meta = json.load(fin)
+            if meta == RecordIndex._log_stat(filename):
+                return RecordIndex(filename, np.load(index_path, mmap_mode="r"))
+            logger.info("Index of %s is outdated, rebuild it", filename)
+        return RecordIndex.build(filename, n_parallel=n_parallel)
+
+    def __len__(self):
+        return self.entries.size
+
+    def _read(self, offset, length):
+        with open(self.filename, "rb") as fin:
+            fin.seek(offset)
+            return fin.read(length)
+
+    def lookup(self, kind, key, workload):
+        """Find the best record.
+
+        Parameters
+        ----------
+        kind: str
+            "model" or "key"
+        key: str
+            target model or one of the target keys
+        workload: tuple
+            Task.workload
+
+        Returns
+        -------
+        ret: tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult), or None
+        """
+        if not self.entries.size:
+            return None
+        value = _index_key(kind, key, workload)
+        pos = np.searchsorted(self.entries["key"], np.uint64(value))
+        if pos >= self.entries.size or int(self.entries["key"][pos]) != value:
+            return None
+        entry = self.entries[pos]
+        ret = decode(self._read(int(entry["offset"]), int(entry["length"])).decode())
+        # guard against hash collision
+        if ret is None or ret[0].task.workload != workload:
+            return None
+        return ret
+
+    def best_rows(self):
+        """(offset, length) of all best records in the file order"""
+        offsets, pos = np.unique(self.entries["offset"], return_index=True)
+        lengths = self.entries["length"][pos]
+        return list(zip(offsets.tolist(), lengths.tolist()))
 
 
 def split_workload(in_file, clean=True):
@@ -266,7 +505,7 @@ def split_workload(in_file, clean=True):
                     fout.write(encode(inp, res) + "\n")
 
 
-def pick_best(in_file, out_file):
+def pick_best(in_file, out_file, n_parallel=1):
     """
     Pick best entries from a file and store it to another file.
     This distill the useful log entries from a large log file.
@@ -279,8 +518,24 @@ def pick_best(in_file, out_file):
         The filename of input
     out_file: str or file
         The filename of output
+    n_parallel: int, optional
+        Number of processes used to read in_file
     """
-    context = load_from_file(in_file)
+    if not isinstance(out_file, str) or not os.path.isfile(out_file):
+        # nothing to merge, copy the best rows found by the index
+        index = RecordIndex.build(in_file, n_parallel=n_parallel, save=False)
+        rows = index.best_rows()
+        logger.info("Extract %d best records from the %s", len(rows), in_file)
+        fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+        with open(in_file, "rb") as fin:
+            for offset, length in rows:
+                fin.seek(offset)
+                fout.write(fin.read(length).decode().rstrip("\n") + "\n")
+        if isinstance(out_file, str):
+            fout.close()
+        return
+
+    context = load_from_file(in_file, n_parallel=n_parallel)
     if os.path.isfile(out_file):
         out_context = load_from_file(out_file)
         context = itertools.chain(context, out_context)
@@ -305,7 +560,7 @@ def pick_best(in_file, out_file):
 
 """
 Usage:
-This record executable module has three modes.
+This record executable module has four modes.
 
 * Print log file in readable format
 e.g. python -m tvm.autotvm.record --mode read --i collect_conv.log --begin 0 --end 5 --ir --code
@@ -315,23 +570,27 @@ e.g. python -m tvm.autotvm.record --mode pick --i collect.log
 
 * Split a log file into separate files, each of which contains only a single wkl
 e.g. python -m tvm.autotvm.record --mode split --i collect.log
+
+* Build the best record index used by ApplyHistoryBest(..., use_index=True)
+e.g. python -m tvm.autotvm.record --mode index --i collect.log --j 8
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["read", "pick", "split"], default="read")
+    parser.add_argument("--mode", choices=["read", "pick", "split", "index"], default="read")
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
     parser.add_argument("--begin", type=int, default=0)
     parser.add_argument("--end", type=int, default=5)
     parser.add_argument("--ir", action="store_true")
     parser.add_argument("--code", action="store_true")
+    parser.add_argument("--j", type=int, default=1, help="number of processes")
 
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
     if args.mode == "pick":
         args.o = args.o or args.i + ".best.log"
-        pick_best(args.i, args.o)
+        pick_best(args.i, args.o, n_parallel=args.j)
     elif args.mode == "read":
         for i, (inp, result) in enumerate(load_from_file(args.i)):
             if args.begin <= i < args.end:
@@ -352,3 +611,5 @@ if __name__ == "__main__":
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
         split_workload(args.i)
+    elif args.mode == "index":
+        RecordIndex.build(args.i, n_parallel=args.j)
@@ -188,14 +188,24 @@ class ApplyHistoryBest(DispatchContext):
         Collection of tuning records.
         If is str, then it should be the filename of a records log file.
         Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+    use_index : bool
+        If True, log files are not decoded at load time. A binary index of the best
+        records (see autotvm.record.RecordIndex) is memory-mapped instead and only
+        the queried records are decoded.
+    n_parallel : int
+        Number of processes used to decode log files or build their index.
     """
 
-    def __init__(self, records):
+    def __init__(self, records, use_index=False, n_parallel=1):
         super(ApplyHistoryBest, self).__init__()
 
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        self.use_index = use_index
+        self.n_parallel = n_parallel
+        self._indexes = []
+        self._index_queried = set()
 
         if records:
             self.load(records)
@@ -212,13 +222,17 @@ class ApplyHistoryBest(DispatchContext):
         """
         # pylint: disable=import-outside-toplevel
         from pathlib import Path
-        from ..record import load_from_file
+        from ..record import load_from_file, RecordIndex
 
         if isinstance(records, Path):
             records = str(records)
 
         if isinstance(records, str):
-            records = load_from_file(records)
+            if self.use_index:
+                self._indexes.append(RecordIndex.open(records, n_parallel=self.n_parallel))
+                self._index_queried.clear()
+                return
+            records = load_from_file(records, n_parallel=self.n_parallel)
         if not records:
             return
 
@@ -265,6 +279,7 @@ class ApplyHistoryBest(DispatchContext):
         key = (target.model, workload)
         if key in self._best_user_defined:
             return self._best_user_defined[key]
+        self._load_from_index("model", key, self.best_by_model)
         if key in self.best_by_model:
             inp, _ = self.best_by_model[key]
             return inp.config
@@ -274,12 +289,27 @@ class ApplyHistoryBest(DispatchContext):
             key = (k, workload)
             if key in self._best_user_defined:
                 return self._best_user_defined[key]
+            self._load_from_index("key", key, self.best_by_targetkey)
             if key in self.best_by_targetkey:
                 inp, _ = self.best_by_targetkey[key]
                 return inp.config
 
         return None
 
+    def _load_from_index(self, kind, key, best_map):
+        """Merge the indexed best record of key into best_map, only once per key."""
+        if not self._indexes:
+            return
+        if (kind, key) in self._index_queried:
+            return
+        self._index_queried.add((kind, key))
+        for index in self._indexes:
+            ret = index.lookup(kind, key[0], key[1])
+            if ret is None:
+                continue
+            if key not in best_map or np.mean(best_map[key][1].costs) > np.mean(ret[1].costs):
+                best_map[key] = ret
+
     def update(self, target, workload, cfg):
         model = target.model
         key = (model, workload)
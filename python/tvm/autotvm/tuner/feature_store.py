@@ -0,0 +1,165 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""On-disk feature store shared by cost models of different tuners and tasks"""
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger("autotvm")
+
+AUTOTVM_FEATURE_STORE_PATH = os.path.join(os.path.expanduser("~"), ".tvm", "autotvm_features")
+
+
+class FeatureBucket(object):
+    """Features of one (task workload, target, feature type), keyed by config index.
+
+    Each item is (feature, flop). feature is None if the extraction failed.
+    flop is nan if it is unknown.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.items = {}
+        self.dirty = False
+        self.feature_len = None
+        if os.path.isfile(filename):
+            self.items.update(self._read(filename))
+
+    @staticmethod
+    def _read(filename):
+        ret = {}
+        try:
+            with np.load(filename) as data:
+                for i, fea, valid, flop in zip(
+                    data["index"], data["feature"], data["valid"], data["flop"]
+                ):
+                    ret[int(i)] = (fea if valid else None, float(flop))
+        except (IOError, ValueError, KeyError) as e:
+            logger.warning("Ignore broken feature store file %s: %s", filename, str(e))
+        return ret
+
+    def __contains__(self, index):
+        return index in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, index, default=None):
+        return self.items.get(index, default)
+
+    def put(self, index, fea, flop=float("nan")):
+        """Add a feature, features with a length different from the others are not stored"""
+        if fea is not None:
+            fea = np.asarray(fea, dtype=np.float32)
+            if self.feature_len is None:
+                self.feature_len = self._first_len()
+            if self.feature_len is None:
+                self.feature_len = fea.shape[-1]
+            if fea.shape[-1] != self.feature_len:
+                return
+        old = self.items.get(index, None)
+        if old is not None and not np.isnan(old[1]) and np.isnan(flop):
+            flop = old[1]
+        self.items[index] = (fea, flop)
+        self.dirty = True
+
+    def _first_len(self):
+        for fea, _ in self.items.values():
+            if fea is not None:
+                return fea.shape[-1]
+        return None
+
+    def flush(self):
+        """Merge with the file (another process may have written it) and save"""
+        if not self.dirty:
+            return
+        if os.path.isfile(self.filename):
+            for k, v in self._read(self.filename).items():
+                self.items.setdefault(k, v)
+        feature_len = self._first_len() or 0
+        items = sorted(
+            [
+                (k, v)
+                for k, v in self.items.items()
+                if v[0] is None or v[0].shape[-1] == feature_len
+            ],
+            key=lambda x: x[0],
+        )
+        index = np.array([k for k, _ in items], dtype=np.int64)
+        feature = np.zeros((len(items), feature_len), dtype=np.float32)
+        valid = np.zeros(len(items), dtype=bool)
+        flop = np.array([v[1] for _, v in items], dtype=np.float64)
+        for i, (_, (fea, _)) in enumerate(items):
+            if fea is not None:
+                feature[i] = fea
+                valid[i] = True
+        tmp = "%s.%d.tmp.npz" % (self.filename[: -len(".npz")], os.getpid())
+        np.savez(tmp, index=index, feature=feature, valid=valid, flop=flop)
+        # atomic, readers never see a partial file
+        os.replace(tmp, self.filename)
+        self.dirty = False
+
+
+class FeatureStore(object):
+    """Persistent feature store keyed by (task workload, target, feature type, config index).
+
+    Every bucket is a .npz file under `path`. Buckets are loaded when they are first
+    used and written back by `flush`.
+
+    Parameters
+    ----------
+    path: str, optional
+        The directory of the store, `~/.tvm/autotvm_features` by default
+    """
+
+    def __init__(self, path=None):
+        self.path = path or AUTOTVM_FEATURE_STORE_PATH
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        self.buckets = {}
+        self.hit_ct = 0
+        self.miss_ct = 0
+
+    @staticmethod
+    def bucket_key(workload, target, feature_type):
+        text = repr((workload, str(target), feature_type))
+        return hashlib.md5(text.encode()).hexdigest()
+
+    def bucket(self, workload, target, feature_type):
+        """Get the bucket of a task
+
+        Parameters
+        ----------
+        workload: tuple
+            Task.workload
+        target: Target or str
+        feature_type: str
+
+        Returns
+        -------
+        bucket: FeatureBucket
+        """
+        key = self.bucket_key(workload, target, feature_type)
+        if key not in self.buckets:
+            self.buckets[key] = FeatureBucket(os.path.join(self.path, key + ".npz"))
+        return self.buckets[key]
+
+    def flush(self):
+        for bucket in self.buckets.values():
+            bucket.flush()
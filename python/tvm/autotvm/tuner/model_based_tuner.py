@@ -328,6 +328,23 @@ def knob2point(knob, dims):
     return p
 
 
+def _knob_strides(dims):
+    strides = np.ones(len(dims), dtype=np.int64)
+    strides[1:] = np.cumprod(dims[:-1])
+    return strides
+
+
+def points2knobs(points, dims):
+    """batched point2knob, convert an array of points to an array of knobs (n x len(dims))"""
+    points = np.asarray(points, dtype=np.int64)
+    return (points[:, None] // _knob_strides(dims)) % np.asarray(dims, dtype=np.int64)
+
+
+def knobs2points(knobs, dims):
+    """batched knob2point, convert an array of knobs (n x len(dims)) to an array of points"""
+    return np.asarray(knobs, dtype=np.int64).dot(_knob_strides(dims))
+
+
 def submodular_pick(scores, knobs, n_pick, knob_weight=1.0):
     """Run greedy optimization to pick points with regard to both score and diversity.
     DiversityScore = knob_weight * number of unique knobs in the selected set
@@ -19,14 +19,13 @@
 Cost model optimizer based on simulated annealing
 """
 
-import heapq
 import logging
 import time
 
 import numpy as np
 
 from ..util import sample_ints
-from .model_based_tuner import ModelOptimizer, knob2point, point2knob
+from .model_based_tuner import ModelOptimizer, knob2point, point2knob, knobs2points, points2knobs
 
 logger = logging.getLogger("autotvm")
 
@@ -71,6 +70,8 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         self.early_stop = early_stop or 1e9
         self.log_interval = log_interval
         self.points = None
+        # walk all the points at once with numpy when the space fits in int64
+        self._vectorized = int(np.prod(self.dims, dtype=object)) < 2 ** 63
 
     def find_maximums(self, model, num, exclusive):
         tic = time.time()
@@ -88,17 +89,12 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
 
         scores = model.predict(points)
 
-        # build heap and insert initial points
-        heap_items = [(float("-inf"), -1 - i) for i in range(num)]
-        heapq.heapify(heap_items)
-        in_heap = set(exclusive)
-        in_heap.update([x[1] for x in heap_items])
+        # top-k set kept as arrays, the unfilled slots have negative points
+        top_scores = np.full(num, float("-inf"))
+        top_points = -1 - np.arange(num, dtype=np.int64)
+        exclusive = np.array(sorted(exclusive))
 
-        for s, p in zip(scores, points):
-            if s > heap_items[0][0] and p not in in_heap:
-                pop = heapq.heapreplace(heap_items, (s, p))
-                in_heap.remove(pop[1])
-                in_heap.add(p)
+        top_scores, top_points, _ = merge_topk(top_scores, top_points, scores, points, exclusive)
 
         k = 0
         k_last_modify = 0
@@ -111,9 +107,12 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             cool = 0
 
         while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = random_walk(p, self.dims)
+            if self._vectorized:
+                new_points = random_walk_batch(points, self.dims)
+            else:
+                new_points = np.empty_like(points)
+                for i, p in enumerate(points):
+                    new_points[i] = random_walk(p, self.dims)
 
             new_scores = model.predict(new_points)
 
@@ -123,12 +122,11 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             points[ac_index] = new_points[ac_index]
             scores[ac_index] = new_scores[ac_index]
 
-            for s, p in zip(new_scores, new_points):
-                if s > heap_items[0][0] and p not in in_heap:
-                    pop = heapq.heapreplace(heap_items, (s, p))
-                    in_heap.remove(pop[1])
-                    in_heap.add(p)
-                    k_last_modify = k
+            top_scores, top_points, modified = merge_topk(
+                top_scores, top_points, new_scores, new_points, exclusive
+            )
+            if modified:
+                k_last_modify = k
 
             k += 1
             t -= cool
@@ -140,14 +138,14 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
                     "elapsed: %.2f",
                     k,
                     k_last_modify,
-                    heap_items[0][0],
-                    np.max([v for v, _ in heap_items]),
+                    np.min(top_scores),
+                    np.max(top_scores),
                     t_str,
                     time.time() - tic,
                 )
 
-        heap_items.sort(key=lambda item: -item[0])
-        heap_items = [x for x in heap_items if x[0] >= 0]
+        order = np.argsort(-top_scores, kind="stable")
+        heap_items = [(top_scores[i], top_points[i]) for i in order if top_scores[i] >= 0]
         logger.debug(
             "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
         )
@@ -156,7 +154,54 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         if self.persistent:
             self.points = points
 
-        return [x[1] for x in heap_items]
+        return [int(x[1]) for x in heap_items]
+
+
+def merge_topk(top_scores, top_points, scores, points, exclusive):
+    """merge a batch of scored points into the top-k set
+
+    Parameters
+    ----------
+    top_scores: Array of float
+        scores of the current top-k set
+    top_points: Array of int
+        points of the current top-k set
+    scores: Array of float
+        scores of the new points
+    points: Array of int
+        the new points
+    exclusive: Array of int
+        sorted points that are not allowed in the top-k set
+
+    Returns
+    -------
+    top_scores: Array of float
+    top_points: Array of int
+    modified: bool
+        whether any new point enters the top-k set
+    """
+    num = len(top_scores)
+    points = np.asarray(points)
+    scores = np.asarray(scores, dtype=np.float64)
+    # only the points that beat the current minimum can enter
+    keep = scores > np.min(top_scores)
+    keep &= ~np.isin(points, top_points)
+    if len(exclusive):
+        keep &= ~np.isin(points, exclusive)
+    if not np.any(keep):
+        return top_scores, top_points, False
+    points, scores = points[keep], scores[keep]
+    # the same point may be walked to more than once
+    points, index = np.unique(points, return_index=True)
+    scores = scores[index]
+
+    all_scores = np.concatenate([top_scores, scores])
+    all_points = np.concatenate([top_points, points])
+    if len(all_scores) > num:
+        pick = np.argpartition(-all_scores, num - 1)[:num]
+        all_scores, all_points = all_scores[pick], all_points[pick]
+    modified = bool(np.any(np.isin(points, all_points)))
+    return all_scores, all_points, modified
 
 
 def random_walk(p, dims):
@@ -186,3 +231,36 @@ def random_walk(p, dims):
 
     # transform to index form
     return knob2point(new, dims)
+
+
+def random_walk_batch(points, dims):
+    """random walk of a batch of points, numpy version of random_walk.
+
+    Like random_walk, each point moves to a different value of one of its knobs.
+    The knob is chosen with probability proportional to (dim - 1) / dim, which is
+    the distribution random_walk gets by retrying until the knob changes.
+
+    Parameters
+    ----------
+    points: Array of int
+        indexes of the ConfigEntity
+    dims: Array of int
+        sizes of each dimension
+
+    Returns
+    -------
+    new_points: Array of int
+        new neighborhood indexes
+    """
+    dims_arr = np.asarray(dims, dtype=np.int64)
+    weights = (dims_arr - 1) / dims_arr
+    if not np.any(weights > 0):
+        return np.array(points, dtype=np.int64)
+    n = len(points)
+    knobs = points2knobs(points, dims)
+    from_i = np.random.choice(len(dims), size=n, p=weights / weights.sum())
+    # a random value different from the old one
+    step = (np.random.random(n) * (dims_arr[from_i] - 1)).astype(np.int64) + 1
+    rows = np.arange(n)
+    knobs[rows, from_i] = (knobs[rows, from_i] + step) % dims_arr[from_i]
+    return knobs2points(knobs, dims)
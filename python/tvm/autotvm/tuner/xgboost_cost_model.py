@@ -32,6 +32,7 @@ from .. import feature
 from ..util import get_rank
 from .metric import max_curve, recall_curve, cover_curve
 from .model_based_tuner import CostModel, FeatureCache
+from .feature_store import FeatureStore
 
 logger = logging.getLogger("autotvm")
 
@@ -70,10 +71,20 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_store: FeatureStore or str, optional
+        Persistent feature store (or its directory) shared by different tuners and tasks.
+        Features found in the store are not extracted again.
     """
 
     def __init__(
-        self, task, feature_type, loss_type, num_threads=None, log_interval=25, upper_model=None
+        self,
+        task,
+        feature_type,
+        loss_type,
+        num_threads=None,
+        log_interval=25,
+        upper_model=None,
+        feature_store=None,
     ):
         super(XGBoostCostModel, self).__init__()
 
@@ -134,31 +145,35 @@ class XGBoostCostModel(CostModel):
 
         if upper_model:  # share a same feature cache with upper model
             self.feature_cache = upper_model.feature_cache
+            feature_store = upper_model.feature_store
         else:
             self.feature_cache = FeatureCache()
+        if isinstance(feature_store, str):
+            feature_store = FeatureStore(feature_store)
+        self.feature_store = feature_store
         self.upper_model = upper_model
         self.feature_extra_ct = 0
         self.pool = None
+        self._pool_context = None
         self.base_model = None
 
         self._sample_size = 0
         self._reset_pool(self.space, self.target, self.task)
 
     def _reset_pool(self, space, target, task):
-        """reset processing pool for feature extraction"""
+        """reset the context of feature extraction, the processing pool is created
+        lazily and kept alive as long as the context does not change"""
 
         if self.upper_model:  # base model will reuse upper model's pool,
             self.upper_model._reset_pool(space, target, task)
             return
 
-        self._close_pool()
+        context = self._pool_context
+        if context and all(x is y for x, y in zip(context, (space, target, task))):
+            return
 
-        # use global variable to pass common arguments
-        global _extract_space, _extract_target, _extract_task
-        _extract_space = space
-        _extract_target = target
-        _extract_task = task
-        self.pool = multiprocessing.Pool(self.num_threads)
+        self._close_pool()
+        self._pool_context = (space, target, task)
 
     def _close_pool(self):
         if self.pool:
@@ -169,8 +184,24 @@ class XGBoostCostModel(CostModel):
     def _get_pool(self):
         if self.upper_model:
             return self.upper_model._get_pool()
+        if self.pool is None:
+            # use global variable to pass common arguments,
+            # workers see the values at the time they are forked
+            global _extract_space, _extract_target, _extract_task
+            _extract_space, _extract_target, _extract_task = self._pool_context
+            self.pool = multiprocessing.Pool(self.num_threads)
         return self.pool
 
+    def _get_bucket(self, workload, target):
+        if self.feature_store is None:
+            return None
+        return self.feature_store.bucket(workload, target, self.fea_type)
+
+    def flush_feature_store(self):
+        """write new features to the persistent feature store"""
+        if self.feature_store is not None:
+            self.feature_store.flush()
+
     def _base_model_discount(self):
         return 1.0 / (2 ** (self._sample_size / 64.0))
 
@@ -221,6 +252,7 @@ class XGBoostCostModel(CostModel):
             len(xs) - np.sum(valid_index),
             self.feature_cache.size(self.fea_type),
         )
+        self.flush_feature_store()
 
     def fit_log(self, records, plan_size):
         tic = time.time()
@@ -235,7 +267,6 @@ class XGBoostCostModel(CostModel):
 
         # extract feature
         self._reset_pool(self.space, self.target, self.task)
-        pool = self._get_pool()
         if self.fea_type == "itervar":
             feature_extract_func = _extract_itervar_feature_log
         elif self.fea_type == "knob":
@@ -244,13 +275,45 @@ class XGBoostCostModel(CostModel):
             feature_extract_func = _extract_curve_feature_log
         else:
             raise RuntimeError("Invalid feature type: " + self.fea_type)
-        res = pool.map(feature_extract_func, data)
+        res = [None] * len(data)
+        need_extract = []
+        for i, (inp, r) in enumerate(data):
+            bucket = self._get_bucket(inp.task.workload, inp.target)
+            item = bucket.get(inp.config.index) if bucket is not None else None
+            # flop is needed to get the throughput of a valid record
+            if item is None or (r.error_no == 0 and np.isnan(item[1])):
+                need_extract.append(i)
+                continue
+            fea, flop = item
+            if fea is not None:
+                res[i] = (fea, flop / np.mean(r.costs) if r.error_no == 0 else 0.0)
+
+        logger.debug(
+            "XGB feature store hit: %d\tmiss: %d", len(data) - len(need_extract), len(need_extract)
+        )
+        if need_extract:
+            pool = self._get_pool()
+            extracted = pool.map(feature_extract_func, [data[i] for i in need_extract])
+            for i, ret in zip(need_extract, extracted):
+                res[i] = ret
+                inp, r = data[i]
+                bucket = self._get_bucket(inp.task.workload, inp.target)
+                if bucket is None:
+                    continue
+                if ret is None:
+                    bucket.put(inp.config.index, None)
+                else:
+                    x, y = ret
+                    # y = flop / mean(costs)
+                    flop = y * np.mean(r.costs) if r.error_no == 0 else float("nan")
+                    bucket.put(inp.config.index, x, flop)
+            self.flush_feature_store()
 
         # filter out feature with different shapes
         fea_len = len(self._get_feature([0])[0])
 
         xs, ys = [], []
-        for x, y in res:
+        for x, y in [r for r in res if r is not None]:
             if len(x) == fea_len:
                 xs.append(x)
                 ys.append(y)
@@ -322,11 +385,20 @@ class XGBoostCostModel(CostModel):
         indexes = np.array(indexes)
         need_extract = [x for x in indexes if x not in fea_cache]
 
+        bucket = self._get_bucket(self.task.workload, self.target)
+        if need_extract and bucket is not None:
+            for i in need_extract:
+                if i in bucket:
+                    fea_cache[i] = bucket.get(i)[0]
+            need_extract = [x for x in need_extract if x not in fea_cache]
+
         if need_extract:
             pool = self._get_pool()
             feas = pool.map(self.feature_extract_func, need_extract)
             for i, fea in zip(need_extract, feas):
                 fea_cache[i] = fea
+                if bucket is not None:
+                    bucket.put(int(i), fea)
 
         feature_len = None
         for idx in indexes:
@@ -68,6 +68,10 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    feature_store: FeatureStore or str, optional
+        Persistent feature store (or its directory). Tuners of the same or other
+        tasks sharing a store do not extract the features of a config twice.
     """
 
     def __init__(
@@ -80,6 +84,7 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        feature_store=None,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -87,6 +92,7 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            feature_store=feature_store,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
@@ -104,3 +110,4 @@ class XGBTuner(ModelBasedTuner):
 
         # manually close pool to avoid multiprocessing issues
         self.cost_model._close_pool()
+        self.cost_model.flush_feature_store()
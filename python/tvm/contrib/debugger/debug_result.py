@@ -246,6 +246,214 @@ class DebugResult(object):
         print(self.get_debug_result(sort_by_time))
 
 
+def estimate_flop(func_name, input_shapes, output_shapes):
+    """Estimate the floating point operations of a fused operator from its shapes.
+
+    conv, dense and batch_matmul count two operations per multiply-add of the
+    reduction, every other operator counts one operation per output element.
+
+    Parameters
+    ----------
+    func_name : str
+        The name of the fused function, e.g. fused_nn_conv2d_add_nn_relu
+
+    input_shapes : list of tuple of int
+        The shapes of the inputs
+
+    output_shapes : list of tuple of int
+        The shapes of the outputs
+
+    Returns
+    -------
+    flop : int
+        The estimated number of operations
+    """
+    out_size = sum(int(np.prod(shape)) for shape in output_shapes)
+    if not output_shapes:
+        return 0
+    oshape = output_shapes[0]
+    if "batch_matmul" in func_name and input_shapes and input_shapes[0]:
+        return 2 * int(np.prod(oshape)) * int(input_shapes[0][-1])
+    if ("conv" in func_name or "dense" in func_name) and len(input_shapes) >= 2:
+        wshape = input_shapes[1]
+        if wshape:
+            # OIHW / NK weights put the output channels first, HWIO puts them last
+            cout = wshape[0]
+            if len(oshape) > 1 and wshape[0] != oshape[1] and wshape[-1] == oshape[-1]:
+                cout = wshape[-1]
+            return 2 * int(np.prod(oshape)) * int(np.prod(wshape)) // max(int(cout), 1)
+    return out_size
+
+
+class ProfileResult(object):
+    """Per-operator timing of a graph, aggregated over runs and kept in memory.
+
+    Parameters
+    ----------
+    graph_json : str
+        The graph to be deployed in json format output by graph compiler.
+    """
+
+    def __init__(self, graph_json):
+        graph = json.loads(graph_json)
+        nodes = graph["nodes"]
+        row_ptr = graph.get("node_row_ptr", list(range(len(nodes) + 1)))
+        shapes = graph["attrs"]["shape"][1]
+        dtypes = graph["attrs"]["dltype"][1]
+
+        def entry_bytes(eid):
+            return int(np.prod(shapes[eid])) * np.dtype(dtypes[eid]).itemsize
+
+        self.nodes = []
+        for nid, node in enumerate(nodes):
+            if node["op"] != "tvm_op":
+                continue
+            in_eids = [row_ptr[x[0]] + x[1] for x in node["inputs"]]
+            out_eids = list(range(row_ptr[nid], row_ptr[nid + 1]))
+            func_name = node["attrs"]["func_name"]
+            self.nodes.append(
+                {
+                    "index": nid,
+                    "name": node["name"],
+                    "op": func_name,
+                    "shape": [tuple(shapes[e]) for e in out_eids],
+                    "dtype": [dtypes[e] for e in out_eids],
+                    "flop": estimate_flop(
+                        func_name,
+                        [tuple(shapes[e]) for e in in_eids],
+                        [tuple(shapes[e]) for e in out_eids],
+                    ),
+                    "bytes": sum(entry_bytes(e) for e in in_eids + out_eids),
+                }
+            )
+        self._index = np.array([x["index"] for x in self.nodes], dtype="int64")
+        self._times = []
+
+    def add(self, time_per_node):
+        """Add the per-node times (in us, one value per graph node) of one run"""
+        times = np.asarray(time_per_node, dtype="float64")
+        self._times.append(times[self._index])
+
+    def reset(self):
+        self._times = []
+
+    @property
+    def num_runs(self):
+        return len(self._times)
+
+    @property
+    def times(self):
+        """The collected times in us, an array of shape (num_runs, num_ops)"""
+        if not self._times:
+            return np.zeros((0, len(self.nodes)))
+        return np.stack(self._times)
+
+    def records(self, sort_by_time=False):
+        """Return one record per operator, e.g. for pandas.DataFrame(records)
+
+        Returns
+        -------
+        records : list of dict
+            The name, function and output shapes and dtypes of every operator
+            with the mean/min/max/std time in us, the share of the total time,
+            the estimated flop and GFLOPS, the accessed bytes and the achieved
+            bandwidth in GB/s.
+        """
+        times = self.times
+        if times.shape[0] == 0:
+            raise RuntimeError("No profile data, call profile() first")
+        mean = times.mean(axis=0)
+        total = mean.sum()
+        ret = []
+        for i, node in enumerate(self.nodes):
+            t = mean[i]
+            ret.append(
+                {
+                    "name": node["name"],
+                    "op": node["op"],
+                    "shape": node["shape"],
+                    "dtype": node["dtype"],
+                    "count": times.shape[0],
+                    "mean_us": float(t),
+                    "min_us": float(times[:, i].min()),
+                    "max_us": float(times[:, i].max()),
+                    "std_us": float(times[:, i].std()),
+                    "percent": float(t / total * 100) if total > 0 else 0.0,
+                    "flop": node["flop"],
+                    "gflops": float(node["flop"] / t / 1e3) if t > 0 else 0.0,
+                    "bytes": node["bytes"],
+                    "bandwidth_GBps": float(node["bytes"] / t / 1e3) if t > 0 else 0.0,
+                }
+            )
+        if sort_by_time:
+            ret.sort(key=lambda x: x["mean_us"], reverse=True)
+        return ret
+
+    def chrome_trace(self, path=None):
+        """Return the mean timeline as a Chrome trace (chrome://tracing)
+
+        Parameters
+        ----------
+        path : str, optional
+            If given, the trace is also written to this file.
+
+        Returns
+        -------
+        trace : dict
+            The trace in the Chrome trace.json format.
+        """
+        events = []
+        ts = 0.0
+        for rec in self.records():
+            events.append(
+                {
+                    "name": rec["name"],
+                    "cat": rec["op"],
+                    "ph": "X",
+                    "ts": ts,
+                    "dur": rec["mean_us"],
+                    "pid": 1,
+                    "tid": 1,
+                    "args": {
+                        "min_us": rec["min_us"],
+                        "max_us": rec["max_us"],
+                        "gflops": rec["gflops"],
+                        "bandwidth_GBps": rec["bandwidth_GBps"],
+                        "runs": rec["count"],
+                    },
+                }
+            )
+            ts += rec["mean_us"]
+        result = dict(displayTimeUnit="ns", traceEvents=events)
+        if path:
+            with open(path, "w") as trace_f:
+                json.dump(result, trace_f)
+        return result
+
+    def table(self, sort_by_time=True):
+        """Return the profile as a text table"""
+        header = ["Node Name", "Ops", "Time(us)", "Time(%)", "GFLOPS", "GB/s", "Shape"]
+        data = [
+            [
+                rec["name"],
+                rec["op"],
+                round(rec["mean_us"], 3),
+                round(rec["percent"], 3),
+                round(rec["gflops"], 3),
+                round(rec["bandwidth_GBps"], 3),
+                str(rec["shape"][0] if len(rec["shape"]) == 1 else rec["shape"]),
+            ]
+            for rec in self.records(sort_by_time)
+        ]
+        total = round(float(self.times.mean(axis=0).sum()), 3)
+        data.append(["Total_time", "-", total, "-", "-", "-", "-"])
+        widths = [max([len(header[i])] + [len(str(row[i])) for row in data]) for i in range(7)]
+        fmt = "".join("{:<" + str(w + 2) + "}" for w in widths)
+        log = [fmt.format(*header), fmt.format(*["-" * len(x) for x in header])]
+        log.extend(fmt.format(*row) for row in data)
+        return "\n".join(log)
+
+
 def save_tensors(params):
     """Save parameter dictionary to binary bytes.
 
@@ -30,7 +30,7 @@ _DUMP_ROOT_PREFIX = "tvmdbg_"
 _DUMP_PATH_PREFIX = "_tvmdbg_"
 
 
-def create(graph_json_str, libmod, ctx, dump_root=None):
+def create(graph_json_str, libmod, ctx, dump_root=None, profile_only=False):
     """Create a runtime executor module given a graph and module.
 
     Parameters
@@ -49,6 +49,11 @@ def create(graph_json_str, libmod, ctx, dump_root=None):
     dump_root : str
         To select which folder the outputs should be kept.
         None will make a temp folder in /tmp/tvmdbg<rand_string> and does the dumping
+
+    profile_only : bool
+        Keep the profile in memory and never write to dump_root, unless
+        `dump_output_tensors` is called.
+
     Returns
     -------
     graph_module : GraphModuleDebug
@@ -68,7 +73,7 @@ def create(graph_json_str, libmod, ctx, dump_root=None):
             "config.cmake and rebuild TVM to enable debug mode"
         )
     func_obj = fcreate(graph_json_str, libmod, *device_type_id)
-    return GraphModuleDebug(func_obj, ctx, graph_json_str, dump_root)
+    return GraphModuleDebug(func_obj, ctx, graph_json_str, dump_root, profile_only)
 
 
 class GraphModuleDebug(graph_runtime.GraphModule):
@@ -93,15 +98,25 @@ class GraphModuleDebug(graph_runtime.GraphModule):
     dump_root : str
         To select which folder the outputs should be kept.
         None will make a temp folder in /tmp/tvmdbg<rand_string> and does the dumping
+
+    profile_only : bool
+        Keep the profile in memory and never write to dump_root, unless
+        `dump_output_tensors` is called.
     """
 
-    def __init__(self, module, ctx, graph_json_str, dump_root):
+    def __init__(self, module, ctx, graph_json_str, dump_root, profile_only=False):
         self._dump_root = dump_root
         self._dump_path = None
+        self._profile_only = profile_only
+        self._graph_json_str = graph_json_str
+        self._ctx = ctx
+        self.debug_datum = None
         self._get_output_by_layer = module["get_output_by_layer"]
         self._run_individual = module["run_individual"]
         graph_runtime.GraphModule.__init__(self, module)
-        self._create_debug_env(graph_json_str, ctx)
+        self.profile_result = debug_result.ProfileResult(graph_json_str)
+        if not profile_only:
+            self._create_debug_env(graph_json_str, ctx)
 
     def _format_context(self, ctx):
         return str(ctx[0]).upper().replace("(", ":").replace(")", "")
@@ -139,7 +154,7 @@ class GraphModuleDebug(graph_runtime.GraphModule):
         return path
 
     def _remove_dump_root(self):
-        if os.path.isdir(self._dump_root):
+        if self._dump_root and os.path.isdir(self._dump_root):
             shutil.rmtree(self._dump_root)
 
     def _create_debug_env(self, graph_json, ctx):
@@ -176,6 +191,7 @@ class GraphModuleDebug(graph_runtime.GraphModule):
 
         """
         self.debug_datum._time_list = [[float(t) * 1e-6] for t in self.run_individual(10, 1, 1)]
+        self.debug_datum._output_tensor_list = []
         for i, node in enumerate(self.debug_datum.get_graph_nodes()):
             num_outputs = self.debug_datum.get_graph_node_output_num(node)
             for j in range(num_outputs):
@@ -213,6 +229,9 @@ class GraphModuleDebug(graph_runtime.GraphModule):
     def run(self, **input_dict):
         """Run forward execution of the graph with debug
 
+        In profile_only mode, the graph is profiled in memory and the
+        result is displayed, nothing is dumped.
+
         Parameters
         ----------
         input_dict : dict of str to NDArray
@@ -221,6 +240,11 @@ class GraphModuleDebug(graph_runtime.GraphModule):
         if input_dict:
             self.set_input(**input_dict)
 
+        if self._profile_only:
+            self.profile()
+            print(self.profile_result.table())
+            return
+
         # Step 1. Execute the graph
         self._run_debug()
         # Step 2. Dump the output tensors to the dump folder
@@ -234,6 +258,53 @@ class GraphModuleDebug(graph_runtime.GraphModule):
         ret = self._run_individual(number, repeat, min_repeat_ms)
         return ret.strip(",").split(",") if ret else []
 
+    def profile(self, number=10, repeat=1, min_repeat_ms=0, **input_dict):
+        """Time every operator and add the result to `profile_result`.
+
+        Nothing is written to disk and no intermediate tensor is copied.
+        Calling it several times aggregates the runs.
+
+        Parameters
+        ----------
+        number : int
+            The number of runs averaged into one measurement.
+
+        repeat : int
+            The number of measurements, each one is added to the profile.
+
+        min_repeat_ms : int
+            The minimum duration of one measurement in milliseconds.
+
+        input_dict : dict of str to NDArray
+            List of input values to be feed to
+
+        Returns
+        -------
+        profile_result : ProfileResult
+            Use `records()` for pandas, `chrome_trace()` for chrome://tracing
+            or `table()` for a text summary.
+        """
+        if input_dict:
+            self.set_input(**input_dict)
+        for _ in range(repeat):
+            times = self.run_individual(number, 1, min_repeat_ms)
+            self.profile_result.add([float(t) for t in times])
+        return self.profile_result
+
+    def dump_output_tensors(self):
+        """Run the graph once and dump every intermediate tensor to the dump folder.
+
+        Returns
+        -------
+        path : str
+            The folder the tensors are written to.
+        """
+        if self.debug_datum is None:
+            self._create_debug_env(self._graph_json_str, self._ctx)
+        self._run_debug()
+        self.debug_datum.dump_output_tensor()
+        return self._dump_path
+
     def exit(self):
         """Exits the dump folder and all its contents"""
         self._remove_dump_root()
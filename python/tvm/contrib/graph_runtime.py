@@ -15,8 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 """Minimum graph runtime that executes graph containing TVM PackedFunc."""
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import tvm._ffi
+from tvm.runtime import ndarray as _nd
 
 from tvm.rpc import _ffi_api as _rpc_ffi_api
 from tvm.rpc import base as rpc_base
@@ -160,6 +163,7 @@ class GraphModule(object):
         self._get_num_inputs = module["get_num_inputs"]
         self._load_params = module["load_params"]
         self._share_params = module["share_params"]
+        self._run_batch = None
 
     def set_input(self, key=None, value=None, **params):
         """Set inputs to the module via kwargs
@@ -205,6 +209,81 @@ class GraphModule(object):
             self.set_input(**input_dict)
         self._run()
 
+    def _get_run_batch(self):
+        if self._run_batch is None:
+            try:
+                self._run_batch = self.module["run_batch"]
+            except AttributeError:
+                # e.g. an rpc server built before run_batch was added
+                self._run_batch = False
+        return self._run_batch
+
+    def _bind_batch(self, inputs, outputs):
+        """Convert a batch of requests to NDArrays on the devices of the graph"""
+        keys = list(inputs[0].keys()) if inputs else []
+        ctxs = {}
+        for k in keys:
+            v = self._get_input(k)
+            if v is None:
+                raise RuntimeError("Could not find '%s' in graph's inputs" % k)
+            ctxs[k] = v.ctx
+        in_arrays = []
+        for req in inputs:
+            if set(req.keys()) != set(keys):
+                raise ValueError("All requests of a batch must set the same inputs")
+            for k in keys:
+                v = req[k]
+                if not isinstance(v, _nd.NDArray):
+                    v = _nd.array(np.asarray(v), ctxs[k])
+                in_arrays.append(v)
+
+        if outputs is None:
+            templates = [self._get_output(i) for i in range(self._get_num_outputs())]
+            outputs = [[_nd.empty(t.shape, t.dtype, t.ctx) for t in templates] for _ in inputs]
+        elif len(outputs) != len(inputs):
+            raise ValueError("Expect %d output lists, got %d" % (len(inputs), len(outputs)))
+        return keys, in_arrays, outputs
+
+    def run_batch(self, inputs, outputs=None):
+        """Run a batch of requests with one call into the runtime.
+
+        The inputs of every request are converted to NDArrays and the output
+        containers are allocated before the call, then all requests are run
+        by the native ``run_batch`` function of the module.
+
+        Parameters
+        ----------
+        inputs : list of dict of str to NDArray or numpy.ndarray
+            The inputs of every request. All requests must set the same inputs.
+
+        outputs : list of list of NDArray, optional
+            Pre-allocated output containers, one list per request.
+
+        Returns
+        -------
+        outputs : list of list of NDArray
+            The outputs of every request.
+        """
+        inputs = list(inputs)
+        if not inputs:
+            return []
+        keys, in_arrays, outputs = self._bind_batch(inputs, outputs)
+        out_arrays = [arr for outs in outputs for arr in outs]
+
+        frun_batch = self._get_run_batch()
+        if frun_batch:
+            frun_batch(len(keys), *(keys + in_arrays + out_arrays))
+            return outputs
+
+        num_inputs = len(keys)
+        for i, outs in enumerate(outputs):
+            for j, k in enumerate(keys):
+                self._get_input(k).copyfrom(in_arrays[i * num_inputs + j])
+            self._run()
+            for j, out in enumerate(outs):
+                self._get_output(j, out)
+        return outputs
+
     def get_num_outputs(self):
         """Get the number of outputs from the graph
 
@@ -304,3 +383,94 @@ class GraphModule(object):
             The key to the module.
         """
         return self.module[key]
+
+
+class GraphModulePool(object):
+    """A pool of graph runtime modules that share one copy of the parameters.
+
+    Every module of the pool has its own intermediate buffers, so requests
+    can be run on all of them at the same time. A batch given to `run_batch`
+    is split into contiguous chunks, one per module, and every chunk is
+    run by a single `GraphModule.run_batch` call in a thread of the pool.
+
+    Parameters
+    ----------
+    graph_json_str : str
+        The graph to be deployed in json format output by json graph.
+
+    libmod : tvm.runtime.Module
+        The module of the corresponding function
+
+    ctx : TVMContext or list of TVMContext
+        The context to deploy the modules.
+
+    params_bytes : bytearray
+        The serialized parameter dict.
+
+    num_workers : int
+        The number of modules in the pool.
+
+    Note
+    ----
+    The threads only overlap when the FFI releases the GIL during the call
+    (the ctypes FFI does), otherwise the pool still saves the per-request
+    FFI calls but runs the chunks one after another.
+    """
+
+    def __init__(self, graph_json_str, libmod, ctx, params_bytes, num_workers=1):
+        if num_workers < 1:
+            raise ValueError("num_workers must be positive")
+        params_bytes = bytearray(params_bytes)
+        self.modules = [create(graph_json_str, libmod, ctx)]
+        self.modules[0].load_params(params_bytes)
+        for _ in range(num_workers - 1):
+            mod = create(graph_json_str, libmod, ctx)
+            mod.share_params(self.modules[0], params_bytes)
+            self.modules.append(mod)
+        self._executor = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+
+    @property
+    def num_workers(self):
+        return len(self.modules)
+
+    def run_batch(self, inputs, outputs=None):
+        """Run a batch of requests on all modules of the pool.
+
+        Parameters
+        ----------
+        inputs : list of dict of str to NDArray or numpy.ndarray
+            The inputs of every request. All requests must set the same inputs.
+
+        outputs : list of list of NDArray, optional
+            Pre-allocated output containers, one list per request.
+
+        Returns
+        -------
+        outputs : list of list of NDArray
+            The outputs of every request, in the order of the inputs.
+        """
+        inputs = list(inputs)
+        if self._executor is None or len(inputs) <= 1:
+            return self.modules[0].run_batch(inputs, outputs)
+
+        num_chunks = min(self.num_workers, len(inputs))
+        bounds = np.linspace(0, len(inputs), num_chunks + 1).astype("int64")
+        futures = []
+        for i in range(num_chunks):
+            beg, end = bounds[i], bounds[i + 1]
+            futures.append(
+                self._executor.submit(
+                    self.modules[i].run_batch,
+                    inputs[beg:end],
+                    None if outputs is None else outputs[beg:end],
+                )
+            )
+        ret = []
+        for future in futures:
+            ret.extend(future.result())
+        return ret
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
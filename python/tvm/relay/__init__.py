@@ -137,3 +137,4 @@ ScopeBuilder = scope_builder.ScopeBuilder
 # Param Serialization
 save_param_dict = param_dict.save_param_dict
 load_param_dict = param_dict.load_param_dict
+LazyParam = param_dict.LazyParam
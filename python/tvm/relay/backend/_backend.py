@@ -44,6 +44,15 @@ def lower(sch, inputs, func_name, source_func):
     """
     # pylint: disable=broad-except, import-outside-toplevel
     import traceback
+    from .compile_engine import get_compile_cache, pop_selections
+
+    cache = get_compile_cache()
+    target = tvm.target.Target.current()
+    selection = pop_selections(source_func)
+    if cache is not None:
+        f = cache.get(source_func, target, func_name, selection)
+        if f is not None:
+            return f
 
     try:
         f = tvm.driver.lower(sch, inputs, name=func_name)
@@ -55,6 +64,8 @@ def lower(sch, inputs, func_name, source_func):
         msg += "-----------------------------\n"
         msg += source_func.astext()
         raise RuntimeError(msg)
+    if cache is not None:
+        cache.put(source_func, target, f, selection)
     return f
 
 
@@ -18,7 +18,12 @@
 """Backend code generation engine."""
 from __future__ import absolute_import
 
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import shutil
 import numpy as np
 import tvm
 from tvm import te
@@ -76,6 +81,454 @@ def _get_cache_key(source_func, target):
     return source_func
 
 
+COMPILE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".tvm", "relay_compile_cache")
+
+
+def _config_fingerprint(cfg):
+    """The part of an AutoTVM config a lowered function depends on"""
+    # the content of a fallback config is filled in by the template itself
+    # and the cost of a tuned one is rewritten by DispatchContext.update
+    return "fallback" if cfg.is_fallback else repr(cfg)
+
+
+def _as_tuple(value):
+    """Restore the tuples of a workload read back from json"""
+    if isinstance(value, list):
+        return tuple(_as_tuple(x) for x in value)
+    return value
+
+
+def _pass_context_fields():
+    pass_ctx = tvm.transform.PassContext.current()
+    return [
+        tvm.__version__,
+        str(pass_ctx.opt_level),
+        str(sorted(str(x) for x in pass_ctx.required_pass)),
+        str(sorted(str(x) for x in pass_ctx.disabled_pass)),
+        str(sorted((str(k), str(v)) for k, v in pass_ctx.config.items())),
+    ]
+
+
+# (call, implementation name, config fingerprints) appended by lower_call
+_SELECTIONS = []
+
+
+def pop_selections(source_func):
+    """Take the implementations lower_call selected for the calls of a function.
+
+    Parameters
+    ----------
+    source_func : tvm.relay.Function
+        The primitive function being lowered.
+
+    Returns
+    -------
+    selection : str
+        The implementation of every call and the fingerprints of the AutoTVM
+        configs it was chosen from, in the order the calls were lowered.
+    """
+    global _SELECTIONS
+    calls = set()
+
+    def fvisit(node):
+        if isinstance(node, tvm.relay.Call):
+            calls.add(node)
+
+    tvm.relay.analysis.post_order_visit(source_func, fvisit)
+    # records left over by a function that failed or skipped lowering are dropped
+    selection = [(name, configs) for call, name, configs in _SELECTIONS if call in calls]
+    _SELECTIONS = []
+    return str(selection)
+
+
+class DispatchRecorder(autotvm.task.DispatchContext):
+    """Record the AutoTVM configs read from the enclosing dispatch context.
+
+    The configs stored with `update`, e.g. by AlterOpLayout for an altered
+    workload, are answered by the recorder and not recorded, they follow
+    from the config queried for the original workload.
+    """
+
+    def __init__(self):
+        super(DispatchRecorder, self).__init__()
+        self.configs = {}
+        self._updated = {}
+
+    def query(self, target, workload):
+        key = (str(target), workload)
+        if key in self._updated:
+            return self._updated[key]
+        cfg = self._old_ctx.query(target, workload)
+        self.configs.setdefault(key, _config_fingerprint(cfg))
+        return cfg
+
+    def update(self, target, workload, cfg):
+        self._updated[(str(target), workload)] = cfg
+        self._old_ctx.update(target, workload, cfg)
+
+    def records(self):
+        """The recorded (target, workload, config fingerprint) triples"""
+        return [[target, workload, fp] for (target, workload), fp in self.configs.items()]
+
+
+def _configs_unchanged(records):
+    """Whether the current dispatch context answers the recorded queries the same way"""
+    dispatch_ctx = autotvm.task.DispatchContext.current
+    silent = autotvm.GLOBAL_SCOPE.silent
+    autotvm.GLOBAL_SCOPE.silent = True
+    try:
+        for target, workload, fingerprint in records:
+            cfg = dispatch_ctx.query(Target(target), _as_tuple(workload))
+            if _config_fingerprint(cfg) != fingerprint:
+                return False
+    finally:
+        autotvm.GLOBAL_SCOPE.silent = silent
+    return True
+
+
+def build_cacheable():
+    """Whether a built module can be reused under the current AutoTVM state.
+
+    Task extraction has to run the topi computes, and ApplyGraphBest hands
+    out configs by the order of the queries rather than by workload.
+    """
+    env = autotvm.task.TaskExtractEnv.current
+    if env is not None and env.tracing:
+        return False
+    ctx = autotvm.task.DispatchContext.current
+    while ctx is not None:
+        if isinstance(ctx, autotvm.task.ApplyGraphBest):
+            return False
+        ctx = ctx._old_ctx
+    return True
+
+
+class CompileCache(object):
+    """On-disk cache of lowered primitive functions and built modules.
+
+    A lowered function is keyed by the structural hash of the source relay
+    function, the target, the pass context and the op implementations
+    selected for its calls with the AutoTVM configs they were chosen from,
+    so retuning or applying another log never returns a stale schedule.
+    The source function is stored with the lowered module and compared on
+    lookup to rule out hash collisions.
+
+    `relay.build` also stores the module it builds together with the
+    configs it read from the AutoTVM dispatch context, so rebuilding an
+    unchanged model skips optimization, lowering and codegen altogether
+    as long as the context still gives the same configs.
+
+    It can be enabled globally with `set_compile_cache` or for a scope with
+    ``with CompileCache(path):``.
+
+    Parameters
+    ----------
+    path : str, optional
+        The directory of the cache, `~/.tvm/relay_compile_cache` by default
+    """
+
+    def __init__(self, path=None):
+        self.path = path or COMPILE_CACHE_PATH
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        self.hit_ct = 0
+        self.miss_ct = 0
+        self.build_hit_ct = 0
+        self.build_miss_ct = 0
+        self._prev = None
+
+    @staticmethod
+    def key(source_func, target, selection=""):
+        """The file name of the entry of a source function"""
+        text = "|".join(
+            [str(tvm.ir.structural_hash(source_func)), str(target), selection]
+            + _pass_context_fields()
+        )
+        return hashlib.md5(text.encode()).hexdigest() + ".json"
+
+    def get(self, source_func, target, func_name, selection=""):
+        """Load the lowered module of a source function.
+
+        Parameters
+        ----------
+        source_func : tvm.relay.Function
+            The source relay function.
+
+        target : tvm.Target
+            The target platform.
+
+        func_name : str
+            The name the lowered function is renamed to.
+
+        selection : str
+            The implementations selected for the calls, see `pop_selections`.
+
+        Returns
+        -------
+        mod : Optional[tvm.IRModule]
+            The lowered module, None if it is not cached.
+        """
+        filename = os.path.join(self.path, self.key(source_func, target, selection))
+        try:
+            with open(filename) as fin:
+                entry = json.load(fin)
+            cached_source = tvm.ir.load_json(entry["source"])
+            lowered = tvm.ir.load_json(entry["lowered"])
+        except (IOError, ValueError, KeyError, tvm.TVMError):
+            self.miss_ct += 1
+            return None
+        if not tvm.ir.structural_equal(cached_source, source_func):
+            self.miss_ct += 1
+            return None
+        self.hit_ct += 1
+        ((_, func),) = lowered.functions.items()
+        func = func.with_attr("global_symbol", func_name)
+        return tvm.IRModule({tvm.ir.GlobalVar(func_name): func})
+
+    def put(self, source_func, target, mod, selection=""):
+        """Save the lowered module of a source function"""
+        if len(mod.functions) != 1:
+            return
+        entry = {"source": tvm.ir.save_json(source_func), "lowered": tvm.ir.save_json(mod)}
+        filename = os.path.join(self.path, self.key(source_func, target, selection))
+        tmp = "%s.%d.tmp" % (filename, os.getpid())
+        with open(tmp, "w") as fout:
+            json.dump(entry, fout)
+        # atomic, concurrent builds never read a partial entry
+        os.replace(tmp, filename)
+
+    @staticmethod
+    def build_key(mod, target, target_host, params):
+        """The directory name of the entry of a built relay module.
+
+        Parameters
+        ----------
+        mod : tvm.IRModule
+            The relay module to build.
+
+        target : Dict[int, tvm.target.Target]
+            The targets of the build.
+
+        target_host : Optional[tvm.target.Target]
+            The host target.
+
+        params : Optional[Dict[str, Union[NDArray, numpy.ndarray, LazyParam]]]
+            The parameters bound at build time.
+
+        Returns
+        -------
+        key : str
+            The name of the entry.
+        """
+        params_hash = hashlib.md5()
+        for name in sorted(params or {}):
+            data = params[name]
+            data = np.ascontiguousarray(data.asnumpy() if hasattr(data, "asnumpy") else data)
+            params_hash.update(("%s|%s|%s|" % (name, data.dtype, data.shape)).encode())
+            params_hash.update(data.tobytes())
+        text = "|".join(
+            [
+                str(tvm.ir.structural_hash(mod)),
+                params_hash.hexdigest(),
+                str(sorted((str(k), str(v)) for k, v in target.items())),
+                str(target_host),
+            ]
+            + _pass_context_fields()
+        )
+        return hashlib.md5(text.encode()).hexdigest() + ".build"
+
+    def load_build(self, key, mod):
+        """Load a built module.
+
+        Parameters
+        ----------
+        key : str
+            The entry, see `build_key`.
+
+        mod : tvm.IRModule
+            The relay module that was built.
+
+        Returns
+        -------
+        built : Optional[Tuple[str, tvm.runtime.Module, Dict[str, NDArray]]]
+            The graph json, the library and the parameters, None if the
+            module is not cached or was built with other AutoTVM configs.
+        """
+        # pylint: disable=import-outside-toplevel
+        from ..param_dict import load_param_dict
+
+        dirname = os.path.join(self.path, key)
+        built = None
+        try:
+            with open(os.path.join(dirname, "entry.json")) as fin:
+                entry = json.load(fin)
+            if tvm.ir.structural_equal(
+                tvm.ir.load_json(entry["source"]), mod
+            ) and _configs_unchanged(entry["configs"]):
+                lib = tvm.runtime.load_module(os.path.join(dirname, "lib.so"))
+                with open(os.path.join(dirname, "params.bin"), "rb") as fin:
+                    params = load_param_dict(bytearray(fin.read()))
+                built = entry["graph_json"], lib, params
+        except (IOError, ValueError, KeyError, tvm.TVMError):
+            built = None
+        if built is None:
+            self.build_miss_ct += 1
+        else:
+            self.build_hit_ct += 1
+        return built
+
+    def save_build(self, key, mod, built, configs):
+        """Save a built module.
+
+        Parameters
+        ----------
+        key : str
+            The entry, see `build_key`.
+
+        mod : tvm.IRModule
+            The relay module that was built.
+
+        built : Tuple[str, tvm.runtime.Module, Dict[str, NDArray]]
+            The graph json, the library and the parameters.
+
+        configs : List
+            The AutoTVM configs the build read, see `DispatchRecorder.records`.
+        """
+        # pylint: disable=import-outside-toplevel, broad-except
+        from ..param_dict import save_param_dict
+
+        graph_json, lib, params = built
+        dirname = os.path.join(self.path, key)
+        tmp = "%s.%d.tmp" % (dirname, os.getpid())
+        try:
+            os.makedirs(tmp)
+            lib.export_library(os.path.join(tmp, "lib.so"))
+            with open(os.path.join(tmp, "params.bin"), "wb") as fout:
+                fout.write(save_param_dict(params))
+            entry = {"source": tvm.ir.save_json(mod), "graph_json": graph_json, "configs": configs}
+            with open(os.path.join(tmp, "entry.json"), "w") as fout:
+                json.dump(entry, fout)
+            # an entry built with other configs is replaced
+            shutil.rmtree(dirname, ignore_errors=True)
+            os.replace(tmp, dirname)
+        except Exception as err:
+            # e.g. a module that can not be exported, or a concurrent build won
+            logger.debug("The built module is not cached: %s", err)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def __enter__(self):
+        self._prev = set_compile_cache(self)
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        set_compile_cache(self._prev)
+
+
+_COMPILE_CACHE = None
+
+
+def set_compile_cache(cache):
+    """Set the compile cache used when lowering primitive functions.
+
+    Parameters
+    ----------
+    cache : Union[str, CompileCache, None]
+        The cache or the directory of the cache. None disables it.
+
+    Returns
+    -------
+    prev : Optional[CompileCache]
+        The previous cache.
+    """
+    global _COMPILE_CACHE
+    prev = _COMPILE_CACHE
+    _COMPILE_CACHE = CompileCache(cache) if isinstance(cache, str) else cache
+    return prev
+
+
+def get_compile_cache():
+    """Get the current compile cache, None if it is disabled."""
+    return _COMPILE_CACHE
+
+
+def primitive_functions(mod):
+    """Collect the distinct fused primitive functions of an optimized module.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The module after fusion, e.g. the output of relay.optimize.
+
+    Returns
+    -------
+    funcs : List[tvm.relay.Function]
+        The primitive functions, external functions are skipped.
+    """
+    funcs = {}
+
+    def fvisit(node):
+        if (
+            isinstance(node, _function.Function)
+            and node.attrs
+            and "Primitive" in node.attrs
+            and int(node.attrs["Primitive"]) == 1
+            and "Compiler" not in node.attrs
+        ):
+            funcs.setdefault(tvm.ir.structural_hash(node), node)
+
+    for _, func in mod.functions.items():
+        if isinstance(func, _function.Function):
+            tvm.relay.analysis.post_order_visit(func, fvisit)
+    return list(funcs.values())
+
+
+# keys to lower in the forked workers of populate_compile_cache
+_PENDING_KEYS = []
+
+
+def _lower_worker(index):
+    # pylint: disable=broad-except
+    try:
+        _backend._CompileEngineLower(get(), _PENDING_KEYS[index])
+        return True
+    except Exception:
+        # the error is raised again when the function is lowered in the main process
+        return False
+
+
+def populate_compile_cache(source_funcs, target=None, n_parallel=None):
+    """Lower source functions into the current compile cache with forked workers.
+
+    The lowered functions are not added to the compile engine of this
+    process, lowering them here afterwards only selects the implementations
+    and reads the entries back.
+
+    Parameters
+    ----------
+    source_funcs : List[Union[tvm.relay.Function, CCacheKey]]
+        The source relay functions.
+
+    target : tvm.Target
+        The target platform.
+
+    n_parallel : int, optional
+        The number of processes, the cpu count by default.
+    """
+    global _PENDING_KEYS
+    assert get_compile_cache() is not None, "populate_compile_cache needs a compile cache"
+    keys = [_get_cache_key(func, target) for func in source_funcs]
+    n_parallel = n_parallel or multiprocessing.cpu_count()
+    if n_parallel > 1 and len(keys) > 1:
+        _PENDING_KEYS = keys
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(min(n_parallel, len(keys))) as pool:
+                pool.map(_lower_worker, range(len(keys)))
+        finally:
+            _PENDING_KEYS = []
+
+
 def get_shape(shape):
     """Convert the shape to correct dtype and vars."""
     ret = []
@@ -183,6 +636,13 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
     ret : tuple(relay.op.OpImplementation, List[tvm.te.Tensor])
         The best op implementation and the corresponding output tensors.
     """
+    best_impl, outputs, _ = _select_implementation(op, attrs, inputs, out_type, target, use_autotvm)
+    return best_impl, outputs
+
+
+def _select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True):
+    """select_implementation, also returning the fingerprints of the AutoTVM
+    configs the choice was made from, see `_config_fingerprint`."""
     all_impls = get_valid_implementations(op, attrs, inputs, out_type, target)
 
     best_plevel_impl = max(all_impls, key=lambda x: x.plevel)
@@ -194,10 +654,11 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
             best_plevel_impl.plevel,
         )
         outs = best_plevel_impl.compute(attrs, inputs, out_type)
-        return best_plevel_impl, outs
+        return best_plevel_impl, outs, []
 
     outputs = {}
     workloads = {}
+    configs = []
     best_autotvm_impl = None
     best_cfg = None
     dispatch_ctx = autotvm.task.DispatchContext.current
@@ -211,6 +672,7 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
             # Not an AutoTVM tunable implementation
             continue
         cfg = dispatch_ctx.query(target, workload)
+        configs.append((str(workload), _config_fingerprint(cfg)))
         if cfg.is_fallback:
             # Skip fallback config
             continue
@@ -227,7 +689,7 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
             op.name,
             best_cfg.cost,
         )
-        return best_autotvm_impl, outputs[best_autotvm_impl]
+        return best_autotvm_impl, outputs[best_autotvm_impl], configs
     # Use the implementation with highest plevel
     if workloads[best_plevel_impl] is not None:
         msg = (
@@ -244,7 +706,7 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
         op.name,
         best_plevel_impl.plevel,
     )
-    return best_plevel_impl, outputs[best_plevel_impl]
+    return best_plevel_impl, outputs[best_plevel_impl], configs
 
 
 @tvm._ffi.register_func("relay.backend.lower_call")
@@ -281,13 +743,16 @@ def lower_call(call, inputs, target):
             reenable_tracing = True
 
     if not is_dyn:
-        best_impl, outputs = select_implementation(op, call.attrs, inputs, ret_type, target)
+        best_impl, outputs, configs = _select_implementation(
+            op, call.attrs, inputs, ret_type, target
+        )
     else:
         # TODO(@icemelon9): Allow tvm to generate multiple kernels for dynamic shapes.
         #   Currently, we just use the implementation with highest plevel
-        best_impl, outputs = select_implementation(
+        best_impl, outputs, configs = _select_implementation(
             op, call.attrs, inputs, ret_type, target, use_autotvm=False
         )
+    _SELECTIONS.append((call, best_impl.name, configs))
 
     # re-enable AutoTVM tracing
     if reenable_tracing:
@@ -332,6 +797,42 @@ class CompileEngine(Object):
             msg += "--------------------------\n"
             raise RuntimeError(msg)
 
+    def lower_parallel(self, source_funcs, target=None, n_parallel=None):
+        """Lower many source functions with a pool of processes.
+
+        The functions are lowered by forked workers which write them to the
+        compile cache, then lowered in this process and read back from the
+        cache, see `populate_compile_cache`.
+        A temporary cache is used if none is set.
+
+        Parameters
+        ----------
+        source_funcs : List[Union[tvm.relay.Function, CCacheKey]]
+            The source relay functions.
+
+        target : tvm.Target
+            The target platform.
+
+        n_parallel : int, optional
+            The number of processes, the cpu count by default.
+
+        Returns
+        -------
+        cached_funcs: List[CachedFunc]
+            The results of lowering.
+        """
+        # pylint: disable=import-outside-toplevel
+        keys = [_get_cache_key(func, target) for func in source_funcs]
+        if get_compile_cache() is None:
+            from tvm.contrib import util
+
+            temp = util.tempdir()
+            with CompileCache(temp.temp_dir):
+                return self.lower_parallel(keys, target, n_parallel)
+
+        populate_compile_cache(keys, target, n_parallel)
+        return [self.lower(key) for key in keys]
+
     def lower_shape_func(self, source_func, target=None):
         key = _get_cache_key(source_func, target)
         return _backend._CompileEngineLowerShapeFunc(self, key)
@@ -27,11 +27,14 @@ from tvm.tir import expr as tvm_expr
 from .. import nd as _nd, autotvm
 from ..target import Target
 from ..contrib import graph_runtime as _graph_rt
+from ..contrib import util as _util
 from . import _build_module
 from . import ty as _ty
 from . import expr as _expr
 from . import function as _function
 from .transform import InferType
+from .param_dict import LazyParam
+from .backend import compile_engine as _compile_engine
 from .backend import graph_runtime_factory as _graph_runtime_factory
 from .backend import interpreter as _interpreter
 from .backend.vm import VMExecutor
@@ -62,7 +65,9 @@ def _update_target(target):
 def _convert_param_map(params):
     inputs = {}
     for name, param in params.items():
-        if isinstance(param, np.ndarray):
+        if isinstance(param, LazyParam):
+            param = param.materialize()
+        elif isinstance(param, np.ndarray):
             param = _nd.array(param)
         inputs[name] = _expr.const(param)
     return inputs
@@ -82,7 +87,7 @@ class BuildModule(object):
         self._set_params_func = self.mod["set_params"]
         self._get_params_func = self.mod["get_params"]
 
-    def build(self, mod, target=None, target_host=None, params=None):
+    def build(self, mod, target=None, target_host=None, params=None, optimized=False):
         """
         Parameters
         ----------
@@ -107,6 +112,10 @@ class BuildModule(object):
             Input parameters to the graph that do not change
             during inference time. Used for constant folding.
 
+        optimized : bool
+            Whether mod is the output of `optimize`, which is not run again then.
+            The params are already bound to it.
+
         Returns
         -------
         graph_json : str
@@ -124,7 +133,7 @@ class BuildModule(object):
         if params:
             self._set_params(params)
         # Build the IR module
-        self._build(mod, target, target_host)
+        self._build(mod, target, target_host, optimized)
         # Get artifacts
         graph_json = self.get_json()
         mod = self.get_module()
@@ -187,7 +196,19 @@ class BuildModule(object):
         return ret
 
 
-def build(mod, target=None, target_host=None, params=None, mod_name="default"):
+def _build(mod, target, target_host, params, n_parallel):
+    """Build mod, lowering its fused functions in parallel if n_parallel is not 1"""
+    bld_mod = BuildModule()
+    if n_parallel == 1 or len(target) != 1:
+        # the device of every function is only known inside the build
+        return bld_mod.build(mod, target, target_host, params)
+    mod, _ = bld_mod.optimize(mod, target, params)
+    funcs = _compile_engine.primitive_functions(mod)
+    _compile_engine.populate_compile_cache(funcs, list(target.values())[0], n_parallel)
+    return bld_mod.build(mod, target, target_host, optimized=True)
+
+
+def build(mod, target=None, target_host=None, params=None, mod_name="default", n_parallel=1):
     """Helper function that builds a Relay function to run on TVM graph
     runtime.
 
@@ -217,6 +238,15 @@ def build(mod, target=None, target_host=None, params=None, mod_name="default"):
     mod_name: Optional[str]
         The module name we will build
 
+    n_parallel: Optional[int]
+        The number of processes lowering the fused functions, None means
+        the cpu count. Only used for homogeneous compilation. The lowered
+        functions go through the compile cache (see
+        `relay.backend.compile_engine.set_compile_cache`), a temporary
+        one is used if it is disabled. When a compile cache is set, the
+        built module is stored in it and reused by the next build of the
+        same module.
+
     Returns
     -------
     graph_json : str
@@ -255,10 +285,24 @@ def build(mod, target=None, target_host=None, params=None, mod_name="default"):
     else:
         tophub_context = autotvm.util.EmptyContext()
 
-    with tophub_context:
-        bld_mod = BuildModule()
-        graph_json, mod, params = bld_mod.build(mod, target, target_host, params)
-        mod = _graph_runtime_factory.GraphRuntimeFactoryModule(graph_json, mod, mod_name, params)
+    compile_cache = _compile_engine.get_compile_cache()
+    temp_cache = autotvm.util.EmptyContext()
+    if n_parallel != 1 and compile_cache is None:
+        temp = _util.tempdir()
+        temp_cache = _compile_engine.CompileCache(temp.temp_dir)
+
+    with tophub_context, temp_cache:
+        if compile_cache is not None and _compile_engine.build_cacheable():
+            key = compile_cache.build_key(mod, target, target_host, params)
+            built = compile_cache.load_build(key, mod)
+            if built is None:
+                with _compile_engine.DispatchRecorder() as recorder:
+                    built = _build(mod, target, target_host, params, n_parallel)
+                compile_cache.save_build(key, mod, built, recorder.records())
+        else:
+            built = _build(mod, target, target_host, params, n_parallel)
+        graph_json, lib, params = built
+        mod = _graph_runtime_factory.GraphRuntimeFactoryModule(graph_json, lib, mod_name, params)
         return mod
 
 
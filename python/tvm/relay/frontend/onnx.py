@@ -17,6 +17,7 @@
 # pylint: disable=invalid-name, import-self, len-as-condition, unused-argument, too-many-lines
 # pylint: disable=import-outside-toplevel
 """ONNX: Open Neural Network Exchange frontend for Relay."""
+import os
 import numpy as np
 import tvm
 from tvm.ir import IRModule
@@ -27,6 +28,7 @@ from .. import expr as _expr
 from .. import function as _function
 from .. import op as _op
 from .. import vision as _vision
+from ..param_dict import LazyParam
 
 from .common import AttrCvt, Renamer
 from .common import get_relay_op, new_var, infer_shape, infer_channels
@@ -2145,7 +2147,7 @@ class GraphProto:
         The input types to the graph
     """
 
-    def __init__(self, shape, dtype):
+    def __init__(self, shape, dtype, lazy_params=False, base_dir=None):
         self._nodes = {}
         self._params = {}
         self._inputs = {}
@@ -2154,11 +2156,16 @@ class GraphProto:
         self._num_param = 0
         self._shape = shape if shape else {}
         self._dtype = dtype
+        self._lazy_params = lazy_params
+        self._base_dir = base_dir or os.getcwd()
 
     def freeze(self, func, params):
         bind_map = {}
         for name in params.keys():
-            bind_map[self._nodes[name]] = _expr.const(params[name])
+            param = params[name]
+            if isinstance(param, LazyParam):
+                param = param.materialize()
+            bind_map[self._nodes[name]] = _expr.const(param)
         body = _expr.bind(func.body, bind_map)
         fn = _function.Function(analysis.free_vars(body), body)
         return fn, {}
@@ -2199,7 +2206,10 @@ class GraphProto:
         for init_tensor in graph.initializer:
             if not init_tensor.name.strip():
                 raise ValueError("Tensor's name is required.")
-            self._params[init_tensor.name] = self._parse_array(init_tensor)
+            if self._lazy_params:
+                self._params[init_tensor.name] = self._parse_lazy_array(init_tensor)
+            else:
+                self._params[init_tensor.name] = self._parse_array(init_tensor)
             self._nodes[init_tensor.name] = new_var(
                 init_tensor.name,
                 shape=self._params[init_tensor.name].shape,
@@ -2323,6 +2333,24 @@ class GraphProto:
         np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
         return _nd.array(np_array)
 
+    def _parse_lazy_array(self, tensor_proto):
+        """Refer to the data of an initializer without loading it.
+
+        External data is mapped from its file, embedded data is read from
+        the protobuf when the parameter is needed.
+        """
+        from onnx import TensorProto
+        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE
+
+        shape = tuple(tensor_proto.dims)
+        dtype = TENSOR_TYPE_TO_NP_TYPE[tensor_proto.data_type]
+        if tensor_proto.data_location == TensorProto.EXTERNAL:
+            info = {x.key: x.value for x in tensor_proto.external_data}
+            if tensor_proto.data_type != TensorProto.STRING and "location" in info:
+                path = os.path.join(self._base_dir, info["location"])
+                return LazyParam.memmap(path, shape, dtype, int(info.get("offset", 0)))
+        return LazyParam(lambda: get_numpy(tensor_proto), shape, dtype)
+
     def _parse_attr(self, attr_proto):
         """Convert a list of AttributeProto to a dict, with names as keys."""
         attrs = {}
@@ -2393,7 +2421,9 @@ class GraphProto:
         return outputs
 
 
-def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=False):
+def from_onnx(
+    model, shape=None, dtype="float32", opset=None, freeze_params=False, lazy_params=False
+):
     """Convert a ONNX model into an equivalent Relay Function.
 
     ONNX graphs are represented as Python Protobuf objects.
@@ -2412,8 +2442,8 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
 
     Parameters
     ----------
-    model : protobuf object
-        ONNX ModelProto after ONNX v1.1.0
+    model : protobuf object or str
+        ONNX ModelProto after ONNX v1.1.0, or the path of the model file
 
     shape : dict of str to tuple, optional
         The input shape to the graph
@@ -2432,14 +2462,27 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
         at compile time and helps in making models static if certain inputs represent
         attributes relay would traditionally consider compile-time constants.
 
+    lazy_params: bool
+        If this parameter is true, the weights are returned as `relay.LazyParam`
+        and only read when relay.build needs them. External data is memory-mapped
+        from its file instead of being loaded, so pass the path of the model to
+        keep the weights out of memory during the import. External data locations
+        of a ModelProto are relative to the current directory.
+
     Returns
     -------
     mod : tvm.IRModule
         The relay module for compilation
 
-    params : dict of str to tvm.nd.NDArray
+    params : dict of str to tvm.nd.NDArray or relay.LazyParam
         The parameter dict to be used by relay
     """
+    base_dir = None
+    if isinstance(model, str):
+        import onnx
+
+        base_dir = os.path.dirname(os.path.abspath(model))
+        model = onnx.load(model, load_external_data=not lazy_params)
     try:
         import onnx
 
@@ -2447,14 +2490,14 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
             # try use onnx's own model checker before converting any model
             try:
                 onnx.checker.check_model(model)
-            except onnx.onnx_cpp2py_export.checker.ValidationError as e:
+            except (onnx.onnx_cpp2py_export.checker.ValidationError, ValueError) as e:
                 import warnings
 
                 # the checker is a bit violent about errors, so simply print warnings here
                 warnings.warn(str(e))
     except ImportError:
         pass
-    g = GraphProto(shape, dtype)
+    g = GraphProto(shape, dtype, lazy_params, base_dir)
     graph = model.graph
     if opset is None:
         try:
@@ -39,6 +39,7 @@ from .common import infer_value as _infer_value
 from .common import try_infer_value
 from .common import infer_value_simulated as _infer_value_simulated
 from .common import infer_type as _infer_type
+from ..param_dict import LazyParam
 from ..prelude import Prelude, StaticTensorArrayOps
 
 from . import qnn_torch
@@ -2684,8 +2685,19 @@ def _run_jit_passes(graph):
     torch._C._jit_pass_inline(graph)
 
 
-def _get_tensor_and_var(torch_tensor, name):
-    tensor = tvm.nd.array(torch_tensor.cpu().numpy())
+def _get_tensor_and_var(torch_tensor, name, lazy_params=False):
+    if lazy_params:
+        # the numpy view of a cpu tensor shares its memory
+        import torch
+
+        tensor = torch_tensor.detach()
+        if tensor.device.type == "cpu":
+            tensor = LazyParam.from_numpy(tensor.numpy())
+        else:
+            dtype = torch.empty(0, dtype=tensor.dtype).numpy().dtype
+            tensor = LazyParam(lambda t=tensor: t.cpu().numpy(), tensor.shape, dtype)
+    else:
+        tensor = tvm.nd.array(torch_tensor.cpu().numpy())
     var = _expr.var(name, shape=tensor.shape, dtype=tensor.dtype)
     return tensor, var
 
@@ -3007,9 +3019,9 @@ def get_attr_chains(root_getattr_node):
     return get_use_chains(root_getattr_node, terminate)
 
 
-def convert_params(graph, state_dict):
+def convert_params(graph, state_dict, lazy_params=False):
     """
-    Return Relay vars and TVM NDArrays for input parameters
+    Return Relay vars and TVM NDArrays (or LazyParams) for input parameters
     A chain of prim::GetAttr nodes is processed one at a time
     """
     getattr_nodes = graph.findAllNodes("prim::GetAttr", recurse=True)
@@ -3038,7 +3050,7 @@ def convert_params(graph, state_dict):
                     var = vars_by_name[full_attr]
                 else:
                     torch_tensor = state_dict[full_attr]
-                    tensor, var = _get_tensor_and_var(torch_tensor, full_attr)
+                    tensor, var = _get_tensor_and_var(torch_tensor, full_attr, lazy_params)
                     param_tensors[full_attr] = tensor
                     vars_by_name[full_attr] = var
                 params[full_attr_node_name] = var
@@ -3260,7 +3272,9 @@ def get_all_op_names(graph):
     return set(node.kind() for node in nodes)
 
 
-def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dtype="float32"):
+def from_pytorch(
+    script_module, input_infos, custom_convert_map=None, default_dtype="float32", lazy_params=False
+):
     """Load PyTorch model in the form of a scripted PyTorch model and convert into relay.
     The companion parameters will be handled automatically.
 
@@ -3283,12 +3297,16 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
     custom_convert_map: Dictionary of str to Relay op
         A custom op conversion map in the same format as _convert_map above
 
+    lazy_params: bool
+        Return the weights as `relay.LazyParam` referring to the torch tensors,
+        they are only copied when relay.build needs them.
+
     Returns
     -------
     mod : tvm.relay.Module
         The module that optimizations will be performed on.
 
-    params : dict of str to tvm.runtime.NDArray
+    params : dict of str to tvm.runtime.NDArray or relay.LazyParam
         Dict of converted parameters stored in tvm.runtime.ndarray format
     """
     import torch
@@ -3312,8 +3330,9 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
     outputs = _get_relay_input_vars(
         graph, input_infos, prelude, default_dtype=default_dtype, is_module=is_module
     )
-    param_vars, tensors, packed_param_map = convert_params(graph, params)
-    tvm_params = {k: tvm.nd.array(v) for k, v in tensors.items()}
+    param_vars, tensors, packed_param_map = convert_params(graph, params, lazy_params)
+    # the tensors are already converted, do not copy them again
+    tvm_params = dict(tensors)
 
     outputs.update(param_vars)
     ret_name = _get_input_names(graph.return_node())
@@ -28,6 +28,7 @@ from .. import expr as _expr
 from .. import function as _function
 from .. import op as _op
 from .. import qnn as _qnn
+from ..param_dict import LazyParam
 from ... import nd as _nd
 from .common import ExprTable
 from .common import infer_shape as _infer_shape
@@ -3248,7 +3249,7 @@ def get_tensor_name(subgraph, tensor_idx):
     return subgraph.Tensors(tensor_idx).Name().decode("utf-8")
 
 
-def from_tflite(model, shape_dict, dtype_dict):
+def from_tflite(model, shape_dict, dtype_dict, lazy_params=False):
     """Convert from tflite model into compatible relay Function.
 
     Parameters
@@ -3262,12 +3263,16 @@ def from_tflite(model, shape_dict, dtype_dict):
     dtype_dict : dict of str to str
         Input types of the model.
 
+    lazy_params : bool
+        Return the weights as `relay.LazyParam` referring to the buffers of
+        the flatbuffer model, they are only copied when relay.build needs them.
+
     Returns
     -------
     mod : tvm.IRModule
         The relay module for compilation.
 
-    params : dict of str to tvm.nd.NDArray
+    params : dict of str to tvm.nd.NDArray or relay.LazyParam
         The parameter dict to be used by relay
     """
     try:
@@ -3307,7 +3312,11 @@ def from_tflite(model, shape_dict, dtype_dict):
     op_converter.convert_op_to_relay()
 
     # params and outputs
-    params = {k: _nd.array(np.array(v)) for k, v in exp_tab.params.items()}
+    # the values are often views of the model buffer, copy them once only
+    if lazy_params:
+        params = {k: LazyParam.from_numpy(v) for k, v in exp_tab.params.items()}
+    else:
+        params = {k: _nd.array(np.asarray(v)) for k, v in exp_tab.params.items()}
     outputs = [exp_tab.get_expr(get_tensor_name(subgraph, i)) for i in model_outputs]
     outputs = outputs[0] if len(outputs) == 1 else _expr.Tuple(outputs)
     func = _function.Function(analysis.free_vars(outputs), outputs)
@@ -16,6 +16,7 @@
 # under the License.
 # pylint: disable=invalid-name
 """Helper utility to save parameter dicts."""
+import numpy as np
 import tvm
 import tvm._ffi
 
@@ -76,3 +77,62 @@ def load_param_dict(param_bytes):
         param_bytes = bytearray(param_bytes)
     load_arr = _load_param_dict(param_bytes)
     return {v.name: v.array for v in load_arr}
+
+
+class LazyParam(object):
+    """A parameter whose data is only read when it is needed.
+
+    Frontends return it instead of an NDArray when importing with
+    ``lazy_params=True``, so the weights stay in the source file (or the
+    framework tensor) until `relay.build` converts them. The data is not
+    cached, every `asnumpy` call reads it again.
+
+    Parameters
+    ----------
+    loader : Callable[[], numpy.ndarray]
+        Return the data, e.g. a numpy.memmap of the source file.
+
+    shape : tuple of int
+        The shape of the parameter.
+
+    dtype : str
+        The data type of the parameter.
+    """
+
+    def __init__(self, loader, shape, dtype):
+        self._loader = loader
+        self.shape = tuple(int(x) for x in shape)
+        self.dtype = str(np.dtype(dtype))
+
+    @staticmethod
+    def memmap(path, shape, dtype, offset=0):
+        """A parameter mapped from the raw data at offset of a file"""
+        shape = tuple(int(x) for x in shape)
+
+        def _load():
+            if int(np.prod(shape)) == 0:
+                return np.zeros(shape, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+        return LazyParam(_load, shape, dtype)
+
+    @staticmethod
+    def from_numpy(array):
+        """A parameter referring to an existing array without copying it"""
+        array = np.asarray(array)
+        return LazyParam(lambda: array, array.shape, array.dtype)
+
+    def asnumpy(self):
+        """Read the data as a numpy array, it may be a read-only view of the source"""
+        return np.asarray(self._loader()).reshape(self.shape)
+
+    def __array__(self, dtype=None):
+        arr = self.asnumpy()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def materialize(self, ctx=tvm.cpu(0)):
+        """Copy the data to a new NDArray"""
+        return tvm.nd.array(self.asnumpy(), ctx)
+
+    def __repr__(self):
+        return "LazyParam(shape=%s, dtype=%s)" % (self.shape, self.dtype)
@@ -16,11 +16,15 @@
 # under the License.
 """RPC client tools"""
 import os
+import shutil
 import stat
 import socket
 import struct
+import tempfile
 import time
 
+import numpy as np
+
 import tvm._ffi
 from tvm.contrib import util
 from tvm._ffi.base import TVMError
@@ -31,17 +35,28 @@ from . import server
 from . import _ffi_api
 
 
+SHM_DIR = server.SHM_DIR
+
+
 class RPCSession(object):
     """RPC Client session module
 
     Do not directly create the obhect, call connect
+
+    Files and arrays larger than shm_threshold bytes are transferred through
+    shared memory instead of the socket when the server is on the same host.
+    Set use_shm to False to always use the socket.
     """
 
+    shm_threshold = 1 << 16
+
     # pylint: disable=invalid-name
     def __init__(self, sess):
         self._sess = sess
         self._tbl_index = _ffi_api.SessTableIndex(sess)
         self._remote_funcs = {}
+        # None means not probed yet
+        self.use_shm = None
 
     def system_lib(self):
         """Get system-wide library module.
@@ -102,20 +117,155 @@ class RPCSession(object):
 
         target : str, optional
             The path in remote
+
+        Note
+        ----
+        Large files go through shared memory if the server is local, see shm_dir.
+        The server keeps them there and links them into its work path.
         """
         if isinstance(data, bytearray):
             if not target:
                 raise ValueError("target must present when file is a bytearray")
+        elif not target:
+            target = os.path.basename(data)
+
+        nbytes = len(data) if isinstance(data, bytearray) else os.path.getsize(data)
+        if nbytes >= self.shm_threshold and self.shm_dir():
+            path = self._shm_file()
+            if isinstance(data, bytearray):
+                with open(path, "wb") as fout:
+                    fout.write(data)
+            else:
+                shutil.copyfile(data, path)
+            try:
+                self._remote_func("tvm.rpc.server.shm_upload")(path, target)
+            finally:
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+
+        if isinstance(data, bytearray):
             blob = data
         else:
             blob = bytearray(open(data, "rb").read())
-            if not target:
-                target = os.path.basename(data)
-
         if "upload" not in self._remote_funcs:
             self._remote_funcs["upload"] = self.get_function("tvm.rpc.server.upload")
         self._remote_funcs["upload"](target, blob)
 
+    def _remote_func(self, name):
+        if name not in self._remote_funcs:
+            self._remote_funcs[name] = self.get_function(name)
+        return self._remote_funcs[name]
+
+    def _shm_file(self):
+        fd, path = tempfile.mkstemp(prefix=server.SHM_PREFIX, dir=SHM_DIR)
+        os.close(fd)
+        return path
+
+    def shm_dir(self):
+        """The shared memory directory if the server can see it, None otherwise.
+
+        The server is probed once with a file written to the shared memory,
+        which also tells a server in another container or on another host
+        from a local one.
+        """
+        if self.use_shm is None:
+            self.use_shm = False
+            if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+                path = self._shm_file()
+                token = os.path.basename(path)
+                try:
+                    with open(path, "w") as fout:
+                        fout.write(token)
+                    self.use_shm = bool(self._remote_func("tvm.rpc.server.shm_probe")(path, token))
+                except (TVMError, AttributeError, RuntimeError):
+                    # old servers do not have the function
+                    pass
+                finally:
+                    os.remove(path)
+        return SHM_DIR if self.use_shm else None
+
+    def copyfrom(self, arr, source):
+        """Copy a numpy array into an array of this session.
+
+        Parameters
+        ----------
+        arr : NDArray
+            An array on a context of this session.
+
+        source : numpy.ndarray
+            The data.
+
+        Returns
+        -------
+        arr : NDArray
+            Reference to arr.
+        """
+        source = np.asarray(source)
+        if source.nbytes < self.shm_threshold or not self.shm_dir():
+            return arr.copyfrom(source)
+        shape, dtype = server.shm_array_layout(arr)
+        if source.shape != shape:
+            raise ValueError(
+                "array shape do not match the shape of NDArray {0} vs {1}".format(
+                    source.shape, shape
+                )
+            )
+        path = self._shm_file()
+        try:
+            data = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+            data[...] = source
+            data.flush()
+            del data
+            self._remote_func("tvm.rpc.server.shm_copyfrom")(path, arr)
+        finally:
+            os.remove(path)
+        return arr
+
+    def array(self, source, ctx):
+        """Create an array of this session from a numpy array, see copyfrom.
+
+        Parameters
+        ----------
+        source : numpy.ndarray
+            The data.
+
+        ctx : TVMContext
+            A context of this session.
+
+        Returns
+        -------
+        arr : NDArray
+        """
+        source = np.asarray(source)
+        return self.copyfrom(nd.empty(source.shape, source.dtype, ctx), source)
+
+    def asnumpy(self, arr):
+        """Copy an array of this session to a numpy array.
+
+        Parameters
+        ----------
+        arr : NDArray
+            An array on a context of this session.
+
+        Returns
+        -------
+        np_arr : numpy.ndarray
+        """
+        shape, dtype = server.shm_array_layout(arr)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if nbytes < self.shm_threshold or not self.shm_dir():
+            return arr.asnumpy()
+        path = self._shm_file()
+        try:
+            data = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+            data.flush()
+            self._remote_func("tvm.rpc.server.shm_copyto")(path, arr)
+        finally:
+            os.remove(path)
+        # the mapping outlives the file, no copy needed
+        return np.asarray(data)
+
     def download(self, path):
         """Download file from remote temp folder.
 
@@ -360,6 +510,43 @@ class TrackerSession(object):
                     pending,
                 )
         res += separate_line
+
+        # devices and queue wait time are only reported by newer trackers
+        if "device_info" in data:
+            res += "\n"
+            res += "Device Status\n"
+            res += "------------------------------------------------------------\n"
+            res += "server-address\tkey\tleases\tutil(%)\trtt(ms)\tsession(s)\n"
+            res += "------------------------------------------------------------\n"
+            for item in data["device_info"]:
+                addr = item["addr"]
+                duration = item["session_duration"]
+                rtt = item.get("rtt", None)
+                res += "%s:%s\t%s\t%d\t%.1f\t%s\t%s\n" % (
+                    addr[0],
+                    str(addr[1]),
+                    item["key"],
+                    item["leases"],
+                    item["utilization"] * 100,
+                    "-" if rtt is None else "%.3f" % (rtt * 1000),
+                    "-" if duration is None else "%.3f" % duration,
+                )
+            res += "------------------------------------------------------------\n"
+            res += "\n"
+            res += "Queue Wait Time (s)\n"
+            title = ("%%-%ds" % max_key_len + "   served  mean     max\n") % "key"
+            separate_line = "-" * len(title) + "\n"
+            res += separate_line + title + separate_line
+            for k in keys:
+                wait = queue_info[k].get("wait_time", None)
+                if wait and wait["count"]:
+                    res += ("%%-%ds" % max_key_len + "   %-6d  %-7.3f  %-7.3f\n") % (
+                        k,
+                        wait["count"],
+                        wait["mean"],
+                        wait["max"],
+                    )
+            res += separate_line
         return res
 
     def request(self, key, priority=1, session_timeout=0, max_retry=5):
@@ -367,8 +554,9 @@ class TrackerSession(object):
 
         Parameters
         ----------
-        key : str
+        key : str or list of str
             The type key of the device.
+            If is a list, the device can be of any of the keys.
 
         priority : int, optional
             The priority of the request.
@@ -401,6 +589,59 @@ class TrackerSession(object):
             "Cannot request %s after %d retry, last_error:%s" % (key, max_retry, str(last_err))
         )
 
+    def request_batch(self, key, num, priority=1, session_timeout=0, max_retry=5):
+        """Request several connections from the tracker at once.
+
+        The tracker leases all of them at once, when enough devices are free.
+
+        Parameters
+        ----------
+        key : str or list of str
+            The type key of the device.
+            If is a list, the devices can be of any of the keys.
+
+        num : int
+            The number of connections.
+
+        priority : int, optional
+            The priority of the request.
+
+        session_timeout : float, optional
+            The duration of the sessions.
+
+        max_retry : int, optional
+            Maximum number of times to retry before give up.
+
+        Returns
+        -------
+        sessions : list of RPCSession
+        """
+        last_err = None
+        for _ in range(max_retry):
+            sessions = []
+            try:
+                if self._sock is None:
+                    self._connect()
+                base.sendjson(self._sock, [base.TrackerCode.REQUEST, key, "", priority, num])
+                value = base.recvjson(self._sock)
+                if value[0] != base.TrackerCode.SUCCESS:
+                    raise RuntimeError("Invalid return value %s" % str(value))
+                for url, port, matchkey in value[1]:
+                    sessions.append(connect(url, port, matchkey, session_timeout))
+                return sessions
+            except socket.error as err:
+                self.close()
+                last_err = err
+            except TVMError as err:
+                last_err = err
+            # close the sessions opened so far, so that their servers
+            # report the devices back to the tracker before the retry
+            del sessions[:]
+        raise RuntimeError(
+            "Cannot request %d %s after %d retry, last_error:%s"
+            % (num, key, max_retry, str(last_err))
+        )
+
     def request_and_run(self, key, func, priority=1, session_timeout=0, max_retry=2):
         """Request a resource from tracker and run the func.
 
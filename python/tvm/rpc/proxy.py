@@ -46,7 +46,7 @@ except ImportError as error_msg:
 from . import _ffi_api
 from . import base
 from .base import TrackerCode
-from .server import _server_env
+from .server import _server_env, _remove_shm_session_dir
 from .._ffi.base import py_str
 
 
@@ -631,6 +631,7 @@ def websocket_proxy_server(url, key=""):
             except websocket.WebSocketClosedError as err:
                 break
         logging.info("WebSocketProxyServer closed...")
+        _remove_shm_session_dir(temp)
         temp.remove()
         ioloop.IOLoop.current().stop()
 
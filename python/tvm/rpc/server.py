@@ -27,6 +27,7 @@ Server is TCP based with the following protocol:
 # pylint: disable=invalid-name
 import os
 import ctypes
+import shutil
 import socket
 import select
 import struct
@@ -37,9 +38,10 @@ import time
 import sys
 import signal
 import platform
+import numpy as np
 import tvm._ffi
 
-from tvm._ffi.base import py_str
+from tvm._ffi.base import py_str, _LIB, check_call
 from tvm._ffi.libinfo import find_lib_path
 from tvm.runtime.module import load_module as _load_module
 from tvm.contrib import util
@@ -49,6 +51,36 @@ from .base import TrackerCode
 
 logger = logging.getLogger("RPCServer")
 
+# shared memory transport, see RPCSession.shm_dir
+SHM_DIR = "/dev/shm"
+SHM_PREFIX = "tvm-rpc-"
+
+
+def check_shm_path(path):
+    """Resolve a shared memory file named by a client.
+
+    Only regular files directly in SHM_DIR whose name starts with SHM_PREFIX
+    are accepted, symbolic links are resolved before the check.
+    """
+    real = os.path.realpath(path)
+    if (
+        os.path.dirname(real) != os.path.realpath(SHM_DIR)
+        or not os.path.basename(real).startswith(SHM_PREFIX)
+        or not os.path.isfile(real)
+    ):
+        raise RuntimeError("%s is not a shared memory file of the rpc session" % path)
+    return real
+
+
+def _shm_session_dir(temp):
+    """Shared memory directory holding the files uploaded in a session"""
+    return os.path.join(SHM_DIR, SHM_PREFIX + "srv-" + os.path.basename(temp.temp_dir))
+
+
+def _remove_shm_session_dir(temp):
+    if temp.temp_dir:
+        shutil.rmtree(_shm_session_dir(temp), ignore_errors=True)
+
 
 def _server_env(load_library, work_path=None):
     """Server environment function return temp dir"""
@@ -101,6 +133,58 @@ def _server_env(load_library, work_path=None):
         logger.info("Send linked module %s to client", path)
         return bytearray(open(path, "rb").read())
 
+    # Shared memory transport, used by clients on the same host,
+    # see RPCSession.shm_dir. Files are created by the client and only
+    # accepted if check_shm_path does.
+    @tvm._ffi.register_func("tvm.rpc.server.shm_probe", override=True)
+    def shm_probe(path, token):
+        try:
+            with open(check_shm_path(path)) as fin:
+                return fin.read() == token
+        except (IOError, RuntimeError):
+            return False
+
+    @tvm._ffi.register_func("tvm.rpc.server.shm_upload", override=True)
+    def shm_upload(shm_path, file_name):
+        """Take a file uploaded through shared memory without copying it.
+
+        The file is renamed into the shared memory directory of the session,
+        which is on the same file system, and linked from the work path.
+        """
+        src = check_shm_path(shm_path)
+        session_dir = _shm_session_dir(temp)
+        if not os.path.isdir(session_dir):
+            os.mkdir(session_dir, 0o700)
+        if os.path.islink(session_dir) or os.stat(session_dir).st_uid != os.getuid():
+            raise RuntimeError("%s is not owned by the rpc server" % session_dir)
+        dst = os.path.join(session_dir, os.path.basename(src))
+        os.rename(src, dst)
+        path = temp.relpath(file_name)
+        if os.path.lexists(path):
+            os.remove(path)
+        os.symlink(dst, path)
+        logger.info("shm_upload %s", path)
+
+    @tvm._ffi.register_func("tvm.rpc.server.shm_copyfrom", override=True)
+    def shm_copyfrom(shm_path, arr):
+        """Copy shared memory into an array"""
+        shape, dtype = shm_array_layout(arr)
+        data = np.memmap(check_shm_path(shm_path), dtype=dtype, mode="r", shape=shape)
+        arr.copyfrom(data)
+        del data
+
+    @tvm._ffi.register_func("tvm.rpc.server.shm_copyto", override=True)
+    def shm_copyto(shm_path, arr):
+        """Copy an array into shared memory"""
+        shape, dtype = shm_array_layout(arr)
+        data = np.memmap(check_shm_path(shm_path), dtype=dtype, mode="r+", shape=shape)
+        nbytes = ctypes.c_size_t(data.size * data.dtype.itemsize)
+        check_call(
+            _LIB.TVMArrayCopyToBytes(arr.handle, data.ctypes.data_as(ctypes.c_void_p), nbytes)
+        )
+        data.flush()
+        del data
+
     libs = []
     load_library = load_library.split(":") if load_library else []
     for file_name in load_library:
@@ -111,12 +195,24 @@ def _server_env(load_library, work_path=None):
     return temp
 
 
+def shm_array_layout(arr):
+    """shape and numpy dtype of an NDArray with vector lanes unpacked"""
+    t = tvm.runtime.DataType(arr.dtype)
+    shape, dtype = tuple(arr.shape), arr.dtype
+    if t.lanes > 1:
+        shape = shape + (t.lanes,)
+        t.lanes = 1
+        dtype = str(t)
+    return shape, dtype
+
+
 def _serve_loop(sock, addr, load_library, work_path=None):
     """Server loop"""
     sockfd = sock.fileno()
     temp = _server_env(load_library, work_path)
     _ffi_api.ServerLoop(sockfd)
     if not work_path:
+        _remove_shm_session_dir(temp)
         temp.remove()
     logger.info("Finish serving %s", addr)
 
@@ -130,8 +226,24 @@ def _parse_server_opt(opts):
     return ret
 
 
+def _ping_tracker(tracker_conn, rtt=None):
+    """Ping the tracker, reporting the round-trip time of the previous ping.
+
+    Returns
+    -------
+    rtt : float
+        The round-trip time of this ping in seconds.
+    """
+    tstart = time.time()
+    base.sendjson(tracker_conn, [TrackerCode.PING, rtt])
+    assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
+    return time.time() - tstart
+
+
 def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
     """Listening loop of the server master."""
+    # round-trip time to the tracker, reported with the next ping
+    tracker_rtt = None
 
     def _accept_conn(listen_sock, tracker_conn, ping_period=2):
         """Accept connection from the other places.
@@ -147,6 +259,7 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
         ping_period : float, optional
             ping tracker every k seconds if no connection is accepted.
         """
+        nonlocal tracker_rtt
         old_keyset = set()
         # Report resource to tracker
         if tracker_conn:
@@ -163,6 +276,7 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
             if tracker_conn:
                 trigger = select.select([listen_sock], [], [], ping_period)
                 if not listen_sock in trigger[0]:
+                    tracker_rtt = _ping_tracker(tracker_conn, tracker_rtt)
                     base.sendjson(tracker_conn, [TrackerCode.GET_PENDING_MATCHKEYS])
                     pending_keys = base.recvjson(tracker_conn)
                     old_keyset.add(matchkey)
@@ -217,6 +331,9 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
                 cinfo = {"key": "server:" + rpc_key}
                 base.sendjson(tracker_conn, [TrackerCode.UPDATE_INFO, cinfo])
                 assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
+                # measure the round-trip time once and report it right away
+                tracker_rtt = _ping_tracker(tracker_conn)
+                tracker_rtt = _ping_tracker(tracker_conn, tracker_rtt)
 
             # step 2: wait for in-coming connections
             conn, addr, opts = _accept_conn(sock, tracker_conn)
@@ -252,6 +369,7 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
                 child.terminate()
             # terminate the worker
             server_proc.terminate()
+        _remove_shm_session_dir(work_path)
         work_path.remove()
 
 
@@ -29,8 +29,9 @@ Tracker is a TCP based rest api with the following protocol:
 List of available APIs:
 
 - PING: check if tracker is alive
-  - input: [TrackerCode.PING]
+  - input: [TrackerCode.PING] or [TrackerCode.PING, rtt]
   - return: TrackerCode.SUCCESS
+  - note: a server reports the round-trip time in seconds of its previous PING as rtt.
 - PUT: report resource to tracker
   - input: [TrackerCode.PUT, [port, match-key]]
   - return: TrackerCode.SUCCESS
@@ -38,9 +39,15 @@ List of available APIs:
 - REQUEST: request a new resource from tracker
   - input: [TrackerCode.REQUEST, [key, user, priority]]
   - return: [TrackerCode.SUCCESS, [url, port, match-key]]
+  - note: key can also be a list of keys, the resource is taken from any of them.
+- REQUEST: request a batch of resources from tracker
+  - input: [TrackerCode.REQUEST, [key, user, priority, num]]
+  - return: [TrackerCode.SUCCESS, [[url, port, match-key], ...]]
+  - note: the num resources are leased at once, when they are all free.
 """
 # pylint: disable=invalid-name
 
+import bisect
 import heapq
 import time
 import logging
@@ -65,6 +72,185 @@ from .base import RPC_TRACKER_MAGIC, TrackerCode
 logger = logging.getLogger("RPCTracker")
 
 
+class DeviceStats(object):
+    """Utilization, round-trip time and session duration of a device.
+
+    A device is one server connection. It is leased when a request takes its
+    resource, and returned when the server puts a new resource after the session.
+    The round-trip time is measured by the server with a PING on its tracker
+    connection, when it registers and every time it polls the tracker.
+    The session duration is how long the client held the device, it depends on
+    the job and says nothing about how fast the device is, so it is only reported.
+
+    Parameters
+    ----------
+    alpha : float
+        Smoothing factor of the round-trip time and the session duration.
+    """
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.first_seen = time.time()
+        self.busy_time = 0.0
+        self.leases = 0
+        self.lease_start = None
+        # smoothed round-trip time in seconds, None if the server never reported it
+        self.rtt = None
+        # smoothed session duration in seconds, None if no session ended yet
+        self.session_duration = None
+
+    def _smooth(self, old, new):
+        if old is None:
+            return new
+        return (1 - self.alpha) * old + self.alpha * new
+
+    def on_rtt(self, rtt):
+        self.rtt = self._smooth(self.rtt, rtt)
+
+    def on_lease(self):
+        self.leases += 1
+        self.lease_start = time.time()
+
+    def on_return(self):
+        if self.lease_start is None:
+            return
+        duration = time.time() - self.lease_start
+        self.lease_start = None
+        self.busy_time += duration
+        self.session_duration = self._smooth(self.session_duration, duration)
+
+    def utilization(self):
+        now = time.time()
+        busy = self.busy_time
+        if self.lease_start is not None:
+            busy += now - self.lease_start
+        return busy / max(now - self.first_seen, 1e-6)
+
+    def score(self):
+        """Smaller is better: the least utilized device, then the fastest to reach,
+        then the one leased the fewest times. A device without rtt comes last."""
+        rtt = self.rtt if self.rtt is not None else float("inf")
+        return (self.utilization(), rtt, self.leases)
+
+    def summary(self):
+        return {
+            "leases": self.leases,
+            "busy": self.lease_start is not None,
+            "utilization": self.utilization(),
+            "rtt": self.rtt,
+            "session_duration": self.session_duration,
+        }
+
+
+class WaitHistogram(object):
+    """Histogram of the time requests wait in the queue, in seconds."""
+
+    BOUNDS = [0.01, 0.1, 1.0, 10.0, 60.0, 600.0]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, wait):
+        self.counts[bisect.bisect_left(self.BOUNDS, wait)] += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+
+    def summary(self):
+        count = sum(self.counts)
+        return {
+            "bounds": self.BOUNDS,
+            "counts": list(self.counts),
+            "count": count,
+            "mean": self.total / count if count else 0.0,
+            "max": self.max,
+        }
+
+
+class Lease(object):
+    """A request of num resources from any of the keys.
+
+    The same lease can be queued in the schedulers of several keys. It takes
+    all of its resources at once, when the pools have num free resources
+    together, so two waiting batches never hold part of what the other needs.
+
+    Parameters
+    ----------
+    num : int
+        Number of resources.
+
+    callback : function: list of value->bool
+        Receives all the resources once they are leased,
+        returns True if they are consumed.
+
+    release : function: (key, value)->None
+        Gives back a resource if the callback fails.
+
+    pools : list of PriorityScheduler, optional
+        The schedulers the resources can come from.
+    """
+
+    def __init__(self, num, callback, release=None, pools=None):
+        self.num = num
+        self.callback = callback
+        self.release = release
+        self.pools = pools or []
+        self.values = []
+        self.done = False
+        self.start = time.time()
+
+    def alive(self):
+        return not self.done
+
+    def acquire(self, scheduler):
+        """Take all the resources if the pools have enough of them.
+
+        Parameters
+        ----------
+        scheduler : PriorityScheduler
+            The scheduler serving the lease, used if the lease has no pools.
+
+        Returns
+        -------
+        served : bool
+        """
+        pools = self.pools or [scheduler]
+        if sum([p.num_free() for p in pools]) < self.num - len(self.values):
+            return False
+        while self.alive():
+            scores = [(p.best_score(), i) for i, p in enumerate(pools)]
+            scores = [x for x in scores if x[0] is not None]
+            if not scores:
+                break
+            pools[min(scores)[1]].serve(self)
+        return True
+
+    def offer(self, key, value):
+        """Offer a resource, returns True if it is taken."""
+        if self.done:
+            return False
+        self.values.append((key, value))
+        if len(self.values) < self.num:
+            return True
+        self.done = True
+        if self.callback([v for _, v in self.values]):
+            for _, v in self.values:
+                if hasattr(v[0], "device_stats"):
+                    v[0].device_stats.on_lease()
+        else:
+            self.cancel()
+        return True
+
+    def cancel(self):
+        """Give back the resources taken so far."""
+        self.done = True
+        values, self.values = self.values, []
+        for key, value in values:
+            if self.release:
+                self.release(key, value)
+
+
 class Scheduler(object):
     """Abstratc interface of scheduler."""
 
@@ -91,7 +277,7 @@ class Scheduler(object):
         priority : int
             The job priority
 
-        callback : function: value->bool
+        callback : function: value->bool, or Lease
             Callback function to receive an resource when ready
             returns True if the resource is consumed.
         """
@@ -118,22 +304,60 @@ class PriorityScheduler(Scheduler):
         self._key = key
         self._values = []
         self._requests = []
+        self._wait_hist = WaitHistogram()
+
+    def _pop_value(self):
+        return self._values.pop(0)
+
+    def num_free(self):
+        """Number of free resources."""
+        return len(self._values)
+
+    def best_score(self):
+        """Score of the resource to be given next, None if there is no resource."""
+        return (0,) if self._values else None
+
+    def serve(self, lease):
+        """Offer the next resource to a lease, returns True if it is taken."""
+        value = self._pop_value()
+        # the match key is taken before the lease calls back,
+        # so that a cancelled lease can give it back
+        value[0].pending_matchkeys.discard(value[-1])
+        if lease.offer(self._key, value):
+            if lease.done:
+                self._wait_hist.add(time.time() - lease.start)
+            return True
+        value[0].pending_matchkeys.add(value[-1])
+        self._values.append(value)
+        return False
 
     def _schedule(self):
+        # a batch that can not be served yet stays queued and does not
+        # block the requests behind it
+        waiting = []
         while self._requests and self._values:
-            value = self._values.pop(0)
             item = heapq.heappop(self._requests)
-            callback = item[-1]
-            if callback(value[1:]):
-                value[0].pending_matchkeys.remove(value[-1])
-            else:
-                self._values.append(value)
+            lease = item[-1]
+            if not lease.alive():
+                continue
+            if not lease.acquire(self):
+                waiting.append(item)
+        for item in waiting:
+            heapq.heappush(self._requests, item)
 
     def put(self, value):
         self._values.append(value)
         self._schedule()
 
+    def _release(self, _, value):
+        """Give back a resource taken by a cancelled lease."""
+        value[0].pending_matchkeys.add(value[-1])
+        self._values.append(value)
+
     def request(self, user, priority, callback):
+        if not isinstance(callback, Lease):
+            func = callback
+            callback = Lease(1, lambda values: func(values[0][1:]), self._release)
         heapq.heappush(self._requests, (-priority, time.time(), callback))
         self._schedule()
 
@@ -144,7 +368,31 @@ class PriorityScheduler(Scheduler):
 
     def summary(self):
         """Get summary information of the scheduler."""
-        return {"free": len(self._values), "pending": len(self._requests)}
+        return {
+            "free": len(self._values),
+            "pending": len([x for x in self._requests if x[-1].alive()]),
+            "wait_time": self._wait_hist.summary(),
+        }
+
+
+class LoadAwareScheduler(PriorityScheduler):
+    """Priority based scheduler that gives the free device with the lowest
+    utilization, then the lowest round-trip time, then the fewest leases,
+    to the next request."""
+
+    @staticmethod
+    def _score(value):
+        stats = getattr(value[0], "device_stats", None)
+        return stats.score() if stats is not None else (0.0, float("inf"), 0)
+
+    def _pop_value(self):
+        best = min(range(len(self._values)), key=lambda i: self._score(self._values[i]))
+        return self._values.pop(best)
+
+    def best_score(self):
+        if not self._values:
+            return None
+        return min([self._score(v) for v in self._values])
 
 
 class TCPEventHandler(tornado_util.TCPHandler):
@@ -167,6 +415,10 @@ class TCPEventHandler(tornado_util.TCPHandler):
         self.pending_matchkeys = set()
         self._tracker._connections.add(self)
         self.put_values = []
+        # leases requested through this connection
+        self.leases = []
+        # stats of the device if this is a server connection
+        self.device_stats = DeviceStats()
 
     def name(self):
         """name of connection"""
@@ -236,6 +488,8 @@ class TCPEventHandler(tornado_util.TCPHandler):
                 value = (self, args[3], port, matchkey)
             else:
                 value = (self, self._addr[0], port, matchkey)
+            # the server puts a new resource after each session
+            self.device_stats.on_return()
             self._tracker.put(key, value)
             self.put_values.append(value)
             self.ret_value(TrackerCode.SUCCESS)
@@ -243,19 +497,26 @@ class TCPEventHandler(tornado_util.TCPHandler):
             key = args[1]
             user = args[2]
             priority = args[3]
+            num = args[4] if len(args) >= 5 else None
 
-            def _cb(value):
+            def _cb(values):
                 # if the connection is already closed
                 if not self._sock:
                     return False
+                values = [list(v[1:]) for v in values]
                 try:
-                    self.ret_value([TrackerCode.SUCCESS, value])
+                    self.ret_value([TrackerCode.SUCCESS, values if num else values[0]])
                 except (socket.error, IOError):
                     return False
                 return True
 
-            self._tracker.request(key, user, priority, _cb)
+            lease = self._tracker.request(key, user, priority, _cb, num or 1)
+            self.leases = [x for x in self.leases if x.alive()]
+            if lease.alive():
+                self.leases.append(lease)
         elif code == TrackerCode.PING:
+            if len(args) >= 2 and args[1] is not None:
+                self.device_stats.on_rtt(float(args[1]))
             self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.GET_PENDING_MATCHKEYS:
             self.ret_value(list(self.pending_matchkeys))
@@ -277,6 +538,10 @@ class TCPEventHandler(tornado_util.TCPHandler):
             self.close()
 
     def on_close(self):
+        # drop the requests of the client that are still queued
+        for lease in self.leases:
+            if lease.alive():
+                lease.cancel()
         self._tracker.close(self)
 
     def on_error(self, err):
@@ -294,6 +559,9 @@ class TrackerServerHandler(object):
         self._ioloop = ioloop.IOLoop.current()
         self._stop_key = stop_key
         self._connections = set()
+        # resources given back by cancelled leases, put after the current scheduling
+        self._released = []
+        self._putting_back = False
 
         def _event_handler(_, events):
             self._on_event(events)
@@ -311,19 +579,64 @@ class TrackerServerHandler(object):
 
     def create_scheduler(self, key):
         """Create a new scheduler."""
-        return PriorityScheduler(key)
+        return LoadAwareScheduler(key)
 
     def put(self, key, value):
         """Report a new resource to the tracker."""
         if key not in self._scheduler_map:
             self._scheduler_map[key] = self.create_scheduler(key)
         self._scheduler_map[key].put(value)
+        self._put_back_released()
 
-    def request(self, key, user, priority, callback):
-        """Request a new resource."""
-        if key not in self._scheduler_map:
-            self._scheduler_map[key] = self.create_scheduler(key)
-        self._scheduler_map[key].request(user, priority, callback)
+    def _release(self, key, value):
+        """Give back a resource taken by a cancelled lease.
+
+        The lease is cancelled while a scheduler is serving it, the resource
+        is queued here and put back once that scheduling is done.
+        """
+        if value[0] not in self._connections or value not in value[0].put_values:
+            return
+        value[0].pending_matchkeys.add(value[-1])
+        self._released.append((key, value))
+
+    def _put_back_released(self):
+        if self._putting_back:
+            return
+        self._putting_back = True
+        try:
+            while self._released:
+                key, value = self._released.pop(0)
+                self._scheduler_map[key].put(value)
+        finally:
+            self._putting_back = False
+
+    def request(self, key, user, priority, callback, num=1):
+        """Request new resources.
+
+        Parameters
+        ----------
+        key : str or list of str
+            The resources can come from any of the keys.
+
+        num : int
+            Number of resources, callback receives all of them at once.
+
+        Returns
+        -------
+        lease : Lease
+        """
+        keys = key if isinstance(key, list) else [key]
+        for k in keys:
+            if k not in self._scheduler_map:
+                self._scheduler_map[k] = self.create_scheduler(k)
+        schedulers = [self._scheduler_map[k] for k in keys]
+        lease = Lease(num, callback, self._release, pools=schedulers)
+        # take the best free resources of all the keys first
+        if not lease.acquire(schedulers[0]):
+            for sch in schedulers:
+                sch.request(user, priority, lease)
+        self._put_back_released()
+        return lease
 
     def close(self, conn):
         self._connections.remove(conn)
@@ -331,6 +644,7 @@ class TrackerServerHandler(object):
             key = conn._info["key"].split(":")[1]  # 'server:rasp3b' -> 'rasp3b'
             for value in conn.put_values:
                 self._scheduler_map[key].remove(value)
+            self._put_back_released()
 
     def stop(self):
         """Safely stop tracker."""
@@ -345,12 +659,16 @@ class TrackerServerHandler(object):
         for k, v in self._scheduler_map.items():
             qinfo[k] = v.summary()
         cinfo = []
+        dinfo = []
         # ignore client connections without key
         for conn in self._connections:
             res = conn.summary()
             if res.get("key", "").startswith("server"):
                 cinfo.append(res)
-        return {"queue_info": qinfo, "server_info": cinfo}
+                device = {"key": res["key"], "addr": res["addr"]}
+                device.update(conn.device_stats.summary())
+                dinfo.append(device)
+        return {"queue_info": qinfo, "server_info": cinfo, "device_info": dinfo}
 
     def run(self):
         """Run the tracker server"""
@@ -4,5 +4,8 @@ from .tensor import GraphTensor, GraphOp, compute, GraphNode
 from .con_graph import PyTIRGraph, PyOpState, make_tir_graph
 from .auto_schedule import *
 from .runtime import SingleGraphSession
+from .partition import CostDrivenPartitionPolicy, use_partition_policy, \
+                       register_partition_policy, partition_policy_scope, \
+                       count_unique_subgraphs
 # cache
 from .utils import util_cache
\ No newline at end of file
@@ -2,4 +2,5 @@ from .auto_schedule import set_interpret, AutoScheduleMultiGraphDispatch
 from .measure import set_evaluate_performance, start_evaluate, stop_evaluate, \
                      evaluate_function_for, auto_tensorize_for, start_tensorize, \
                      stop_tensorize
-from .cost_model import set_query_cost_model
\ No newline at end of file
+from .cost_model import set_query_cost_model
+from .report import make_subgraph_report, dump_subgraph_report
@@ -23,6 +23,7 @@ from .schedule_tiling_and_binding import schedule_cuda_tiling_and_binding
 from .schedule_buffer_input import schedule_cuda_buffer_input, create_buffer
 from .schedule_unroll import schedule_cuda_unroll
 from .utils import tile_axis, tile_axes, reorder_spatial_and_reduce_axes
+from .report import make_subgraph_report, dump_subgraph_report, print_subgraph_report
 from ..utils import to_tuple, to_int, can_to_int, to_int_or_None, ASSERT, ERROR
 
 from tvm import auto_tensorize as at, tg
@@ -112,7 +113,16 @@ def build_func(sch, args, target, target_host, name, binds):
 
 
 class TGAutoScheduleContext(object):
-    def __init__(self, name, top_log_dir, subgraph, measure_option, verbose=False):
+    def __init__(
+        self,
+        name,
+        top_log_dir,
+        subgraph,
+        measure_option,
+        verbose=False,
+        fast_resume=True,
+        sample_budget=10,
+    ):
         self.measure_option = measure_option
         self.target = tvm.target.Target(measure_option.target)
         self.name = name
@@ -125,52 +135,114 @@ class TGAutoScheduleContext(object):
         self.result = None
         self.counter = 0
         self.total_trials = 0
+        self.sample_budget = sample_budget
 
         if os.path.exists(self.log_name) and os.path.isfile(self.log_name):
-            with open(self.log_name, "r") as fin:
-                print("Loading from %s..." % self.log_name, flush=True)
-                for line in fin:
-                    obj = json.loads(line)
-                    entity = obj["entity"]
-                    perf = obj["perf"]
-                    entity = tg.string_to_multi_schedule_entity(entity)
-                    result = tg.get_schedule_result_from_entity(
-                        name, subgraph, self.target, entity)
-                    if perf > self.best_perf:
-                        self.best_perf = perf
-                        self.best_result = result
-                    # feedback
-                    tg.get_schedule_result(
-                        self.name,
-                        self.subgraph,
-                        self.target,
-                        self.measure_option.dev_id,
-                        self.measure_option.timeout,
-                        perf,
-                        True,
-                        result,
-                    )
-
-    def __del__(self):
-        self.logger.close()
+            print("Loading from %s..." % self.log_name, flush=True)
+            if fast_resume:
+                self.resume(self.log_name)
+            else:
+                self.replay(self.log_name)
+
+    def resume(self, log_name):
+        """Feed all the logged schedules to the searcher at once,
+        only the best one is turned into a schedule"""
+        entities = []
+        perfs = []
+        best_entity = None
+        with open(log_name, "r") as fin:
+            for line in fin:
+                if not line.strip():
+                    continue
+                obj = json.loads(line)
+                entities.append(obj["entity"])
+                perfs.append(obj["perf"])
+                if obj["perf"] > self.best_perf:
+                    self.best_perf = obj["perf"]
+                    best_entity = obj["entity"]
+        if entities:
+            tg.feedback_schedule_entities(
+                self.name,
+                self.subgraph,
+                self.target,
+                self.measure_option.dev_id,
+                self.measure_option.timeout,
+                entities,
+                perfs,
+            )
+        if best_entity is not None:
+            self.best_result = tg.get_schedule_result_from_entity(
+                self.name,
+                self.subgraph,
+                self.target,
+                tg.string_to_multi_schedule_entity(best_entity),
+            )
 
-    def get_new_schedule(self):
-        ret = None
-        while ret is None:
-            try:
-                ret = tg.get_schedule_result(
+    def replay(self, log_name):
+        """Rebuild every logged schedule and feed it back one by one"""
+        with open(log_name, "r") as fin:
+            for line in fin:
+                if not line.strip():
+                    continue
+                obj = json.loads(line)
+                entity = obj["entity"]
+                perf = obj["perf"]
+                entity = tg.string_to_multi_schedule_entity(entity)
+                result = tg.get_schedule_result_from_entity(
+                    self.name, self.subgraph, self.target, entity)
+                if perf > self.best_perf:
+                    self.best_perf = perf
+                    self.best_result = result
+                # feedback
+                tg.get_schedule_result(
                     self.name,
                     self.subgraph,
                     self.target,
                     self.measure_option.dev_id,
                     self.measure_option.timeout,
+                    perf,
+                    True,
+                    result,
                 )
-            except Exception as e:
-                if self.verbose:
-                    print(e)
-                pass
+
+    def __del__(self):
+        self.logger.close()
+
+    def get_new_schedules(self, number):
+        """Sample number valid schedules in one call, at most
+        sample_budget * number samples are tried"""
+        ret = tg.get_schedule_results(
+            self.name,
+            self.subgraph,
+            self.target,
+            self.measure_option.dev_id,
+            self.measure_option.timeout,
+            number,
+            self.sample_budget * number,
+        )
+        if self.verbose:
+            sampled, invalid = self.sample_stats()
+            print(
+                "Sampled %d schedules, %d invalid (%.1f%%)"
+                % (sampled, invalid, 100.0 * invalid / max(sampled, 1)),
+                flush=True,
+            )
         return ret
 
+    def get_new_schedule(self):
+        ret = self.get_new_schedules(1)
+        if not ret:
+            raise RuntimeError(
+                "No valid schedule for %s in %d samples" % (self.name, self.sample_budget)
+            )
+        return ret[0]
+
+    def sample_stats(self):
+        """(sampled, invalid) schedule counts of this task"""
+        return tg.get_schedule_sample_stats(
+            self.name, self.target, self.measure_option.dev_id, self.measure_option.timeout
+        )
+
     def count(self):
         self.counter = (self.counter + 1) % 16
         if self.counter == 0:
@@ -184,25 +256,33 @@ class TGAutoScheduleContext(object):
         print("Autoscheduling %s by %d trials..." %
               (self.log_name, trials), flush=True)
         self.total_trials += trials
-        search_group_size = 10
-        iterations = (trials + search_group_size - 1) // search_group_size
+        # local targets build a group in parallel and then run it on the device
+        # alone, opencl goes through the rpc path of evaluate_schedules
+        split_measure = self.target.kind.name != "opencl"
+        n_parallel = getattr(self.measure_option, "n_parallel", None) or multiprocessing.cpu_count()
+        search_group_size = max(10, n_parallel) if split_measure else 10
         beg = time.time()
-        for i in range(iterations):
-            schs = []
-            args_lst = []
-            results = []
-            for j in range(search_group_size):
-                # this one is get new schedule
-                result = self.get_new_schedule()
-                # measure current result
-                results.append(result)
-                sch = result.schedule
-                args = result.tensors
-                schs.append(sch)
-                args_lst.append(args)
-
-            timecosts = at.evaluate_schedules(
-                schs, args_lst, self.measure_option)
+        remaining = trials
+        while remaining > 0:
+            group_size = min(search_group_size, remaining)
+            remaining -= group_size
+            # the whole group is sampled in one call
+            results = self.get_new_schedules(group_size)
+            if not results:
+                print(
+                    "\nNo valid schedule in %d samples, stop." % (self.sample_budget * group_size),
+                    flush=True,
+                )
+                break
+            schs = [result.schedule for result in results]
+            args_lst = [result.tensors for result in results]
+
+            if split_measure:
+                timecosts = at.build_and_run_schedules(
+                    schs, args_lst, self.measure_option, n_parallel=n_parallel)
+            else:
+                timecosts = at.evaluate_schedules(
+                    schs, args_lst, self.measure_option)
 
             for result, timecost in zip(results, timecosts):
                 # timecost = 1.0
@@ -1264,6 +1344,8 @@ class AutoScheduleMultiGraphContext(object):
         policy="equal",
     ):
         self.tir_multi_graph = tir_multi_graph
+        self.measure_option = measure_option
+        self.scheduler_option = scheduler_option
         self.performance_trace = {}
         self.schedules = {}
         self.contexts = {}
@@ -1381,6 +1463,19 @@ class AutoScheduleMultiGraphContext(object):
                 return False
         return True
 
+    def report(self, evaluate_result=None, filename=None, verbose=True):
+        """
+        Per-subgraph latency attribution, ranked by contribution to
+        the end-to-end time, see make_subgraph_report.
+        filename ends with .json or .csv
+        """
+        rows = make_subgraph_report(self, evaluate_result=evaluate_result)
+        if filename is not None:
+            dump_subgraph_report(rows, filename)
+        if verbose:
+            print_subgraph_report(rows)
+        return rows
+
 
 class AutoScheduleMultiGraphDispatch(object):
     working_set = {}
@@ -1423,3 +1518,9 @@ class AutoScheduleMultiGraphDispatch(object):
         assert tid in cls.working_set
         ctx = cls.working_set[tid]
         return ctx.ready()
+
+    @classmethod
+    def report(cls, tid, evaluate_result=None, filename=None, verbose=True):
+        assert tid in cls.working_set
+        ctx = cls.working_set[tid]
+        return ctx.report(evaluate_result=evaluate_result, filename=filename, verbose=verbose)
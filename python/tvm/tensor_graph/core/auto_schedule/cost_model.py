@@ -17,6 +17,7 @@ from concurrent.futures import TimeoutError
 from pebble import ProcessPool, ProcessExpired
 from .measure import evaluate_performance
 from ..utils import to_tuple, ERROR
+from ..replay_buffer import ReplayBuffer
 
 from .train_cost_model.mlp_model import FCModel, FCModelCriterion
 from .train_cost_model.dataset import get_data_pytorch, to_cuda
@@ -28,18 +29,25 @@ GLOBAL_FC_MODEL_PATH = "fc_model"
 
 
 class DataSet(object):
-  def __init__(self):
-    self.entries = []
-    self.feedbacks = 0
-    self.max_entry_capcity = 10000
-  
-  def add(self, new_entry):
-    self.entries.append(new_entry)
-    self.feedbacks += 1
-    if len(self.entries) > 2 * self.max_entry_capcity:
-      np.random.shuffle(self.entries)
-      self.entries = self.entries[:self.max_entry_capcity]
+  """
+  Feedback entries kept in a preallocated object buffer.
+  Once full, reservoir sampling keeps a uniform sample of all feedbacks.
+  """
+  def __init__(self, max_entry_capcity=10000):
+    self.max_entry_capcity = max_entry_capcity
+    self.buffer = ReplayBuffer(max_entry_capcity, dtype="object")
+
+  @property
+  def feedbacks(self):
+    return self.buffer.seen
+
+  @property
+  def entries(self):
+    # zero-copy view of the valid entries
+    return self.buffer.view()
 
+  def add(self, new_entry):
+    self.buffer.add(new_entry)
 
 
 dataset = DataSet()
@@ -7,6 +7,9 @@ class HardwareConfig(object):
   def __init__(self):
     self.max_threads = DEFAULT_MAX
     self.max_shared_memory_in_byes = DEFAULT_MAX
+    # roofline numbers, only used for cost estimation and reports
+    self.peak_gflops = 1000.0
+    self.peak_bandwidth_gbs = 100.0
 
 
 HD_CONF_DICT = {}
@@ -19,6 +22,9 @@ def init():
   default_cuda_config = HardwareConfig()
   default_cuda_config.max_threads = 1024
   default_cuda_config.max_shared_memory_in_byes = 48000
+  # V100 fp32 numbers
+  default_cuda_config.peak_gflops = 15700.0
+  default_cuda_config.peak_bandwidth_gbs = 900.0
   register_hardware_config("default_cuda", default_cuda_config)
 
   default_llvm_config = HardwareConfig()
@@ -0,0 +1,143 @@
+import csv
+import json
+import tvm
+from tvm import tg, auto_tensorize as at
+from .hardware_config import get_hardware_config
+
+
+REPORT_FIELDS = [
+    "rank",
+    "tag",
+    "task_id",
+    "scheduler",
+    "count",
+    "trials",
+    "latency_ms",
+    "total_ms",
+    "contribution",
+    "gflop",
+    "gflops",
+    "peak_gflops",
+    "peak_ratio",
+]
+
+
+def scheduler_name(multi_graph_ctx, tag):
+    if tag in multi_graph_ctx.use_at_set:
+        return "AMOS"
+    # subgraphs AMOS can not map fall back to TG
+    if getattr(multi_graph_ctx, "scheduler_option", None) == "ansor":
+        return "Ansor"
+    return "TG"
+
+
+def subgraph_gflop(subgraph):
+    ret = 0.0
+    for op in subgraph.operation_list:
+        if isinstance(op, tvm.te.tensor.ComputeOp):
+            ret += tg.get_gflop(op)
+    return ret
+
+
+def unique_subgraph_gflop(tir_multi_graph):
+    """gflop of one instance of each unique subgraph, keyed by tag"""
+    graphs = tg.get_graphs_from_tir_multi_graph(tir_multi_graph)
+    ret = {}
+    for key, subgraph in graphs.items():
+        if subgraph.tag not in ret:
+            ret[subgraph.tag] = subgraph_gflop(subgraph)
+    return ret
+
+
+def best_latency(multi_graph_ctx, tid):
+    """
+    The best cost the context recorded after the last tuning round,
+    read without querying the scheduler again.
+    """
+    trace = multi_graph_ctx.performance_trace.get(tid, [])
+    if trace:
+        return trace[-1]
+    return multi_graph_ctx.C.get(tid, at.MAX_FLOAT)
+
+
+def make_subgraph_report(multi_graph_ctx, evaluate_result=None, hd_config=None):
+    """
+    Rank the unique subgraphs of a network by their contribution
+    to the end-to-end time.
+
+    Args:
+    ---
+    multi_graph_ctx: AutoScheduleMultiGraphContext
+
+    evaluate_result: GraphEvaluateResult or None
+        measured per-subgraph latency from at.CachedGraphEvaluator,
+        if None, the best cost recorded by the last tuning round is used
+    hd_config: HardwareConfig or None
+        provides peak_gflops, the default config of the target otherwise
+
+    Returns:
+    ---
+    list of dict, the keys are REPORT_FIELDS
+    """
+    target = str(multi_graph_ctx.measure_option.target)
+    if hd_config is None:
+        hd_config = get_hardware_config(
+            "default_cuda" if "cuda" in target else "default_llvm", target)
+    gflop_of_tag = unique_subgraph_gflop(multi_graph_ctx.tir_multi_graph)
+
+    rows = []
+    for tag, tid in multi_graph_ctx.graph_tag_to_tid.items():
+        ctx = multi_graph_ctx.contexts[tid]
+        if evaluate_result is not None and tag in evaluate_result.tags:
+            latency = evaluate_result.tags[tag][1]
+        else:
+            latency = best_latency(multi_graph_ctx, tid)
+        count = multi_graph_ctx.subgraph_count[tag]
+        gflop = gflop_of_tag[tag]
+        valid = 0 < latency < at.MAX_FLOAT
+        gflops = gflop / (latency / 1e3) if valid else 0.0
+        rows.append({
+            "tag": tag,
+            "task_id": tid,
+            "scheduler": scheduler_name(multi_graph_ctx, tag),
+            "count": count,
+            "trials": ctx.total_trials,
+            "latency_ms": latency,
+            "total_ms": latency * count if valid else at.MAX_FLOAT,
+            "gflop": gflop,
+            "gflops": gflops,
+            "peak_gflops": hd_config.peak_gflops,
+            "peak_ratio": gflops / hd_config.peak_gflops,
+        })
+
+    total = sum([x["total_ms"] for x in rows if x["total_ms"] < at.MAX_FLOAT])
+    rows = sorted(rows, key=lambda x: x["total_ms"], reverse=True)
+    for i, row in enumerate(rows):
+        row["rank"] = i + 1
+        row["contribution"] = (
+            row["total_ms"] / total if total > 0 and row["total_ms"] < at.MAX_FLOAT else 0.0)
+    return rows
+
+
+def dump_subgraph_report(rows, filename):
+    """
+    Write the report as JSON or CSV according to the file suffix.
+    """
+    if filename.endswith(".csv"):
+        with open(filename, "w", newline="") as fout:
+            writer = csv.DictWriter(fout, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+    else:
+        with open(filename, "w") as fout:
+            json.dump(rows, fout, indent=2)
+
+
+def print_subgraph_report(rows, top=10):
+    print("%-5s%-10s%-7s%-12s%-12s%-10s%-10s" % (
+        "rank", "scheduler", "count", "latency(ms)", "contrib(%)", "GFLOPS", "peak(%)"), flush=True)
+    for row in rows[:top]:
+        print("%-5d%-10s%-7d%-12.4f%-12.2f%-10.1f%-10.2f" % (
+            row["rank"], row["scheduler"], row["count"], row["latency_ms"],
+            row["contribution"] * 100, row["gflops"], row["peak_ratio"] * 100), flush=True)
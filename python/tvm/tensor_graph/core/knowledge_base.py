@@ -7,6 +7,7 @@ import numpy as np
 import torch.nn.functional as F
 
 from .perf_model import AllreduceModel, DecompositionModel, ReductiveModel
+from .replay_buffer import ReplayBuffer
 
 
 logger = logging.getLogger("tensor_graph")
@@ -17,14 +18,15 @@ meta_path = os.path.join(root_path, "meta_data.json")
 
 
 class SubKnowledgeBase(object):
-  def __init__(self, model_list, trained=0, train_num=1000, train_cycle=100):
+  def __init__(self, model_list, trained=0, train_num=1000, train_cycle=100, base_capacity=10000):
     self.trained = trained
     self.train_num = train_num
     self.train_cycle = train_cycle
     self.model_list = model_list
     self.num_models = len(model_list)
     self.add_count_list = [0 for i in range(self.num_models)]
-    self.base_list = [[] for i in range(self.num_models)]
+    # row width is known after the first entry
+    self.base_list = [ReplayBuffer(base_capacity) for i in range(self.num_models)]
     self.loss_list = [0.0 for i in range(self.num_models)]
 
   def select_id(self, *args):
@@ -35,7 +37,7 @@ class SubKnowledgeBase(object):
     The performance is GFLOPS
     """
     bid = self.select_id(*args)
-    self.base_list[bid].append([*(args), *(choice), perf])
+    self.base_list[bid].add([*(args), *(choice), perf])
 
     self.add_count_list[bid] += 1
     if self.add_count_list[bid] % self.train_cycle == 0:
@@ -68,8 +70,9 @@ class SubKnowledgeBase(object):
     self.loss_list[mid] = 0.0
 
     self.model_list[mid].train()
-    np.random.shuffle(self.base_list[mid])
-    train_set = np.array(self.base_list[mid]).astype("float32")[:self.train_num]
+    # shuffle in place and train on a view, the buffer is already float32
+    self.base_list[mid].shuffle()
+    train_set = self.base_list[mid].view()[:self.train_num]
     num_samples = len(train_set)
     train_data = train_set[:, :-1]
     train_label = train_set[:, -1]
@@ -79,8 +82,8 @@ class SubKnowledgeBase(object):
     num_batch = math.ceil(num_samples / float(batch_size))
     for i in range(num_batch):
       batch = train_data[i*batch_size:(i+1)*batch_size]
-      label = torch.tensor(train_label[i*batch_size:(i+1)*batch_size])
-      tensor = torch.tensor(batch)
+      label = torch.from_numpy(train_label[i*batch_size:(i+1)*batch_size])
+      tensor = torch.from_numpy(batch)
       logits = self.model_list[mid](tensor)
       # loss = F.mse_loss(logits.squeeze(), label, reduction="sum")
       loss = torch.abs(logits.squeeze() - label).mean()
@@ -103,14 +106,14 @@ class SubKnowledgeBase(object):
         torch.save(self.model_list[mid].state_dict(), model_path)
       
       if os.path.exists(base_path):
-        self.base_list[mid] = np.load(base_path).tolist()
+        self.base_list[mid].from_path(base_path)
       else:
-        np.save(base_path, np.array(self.base_list[mid]).astype("float32"))
+        self.base_list[mid].to_path(base_path)
 
   def to_path(self, model_path_list, base_path_list):
     for mid, (model_path, base_path) in enumerate(zip(model_path_list, base_path_list)):
       torch.save(self.model_list[mid].state_dict(), model_path)
-      np.save(base_path, np.array(self.base_list[mid]).astype("float32"))
+      self.base_list[mid].to_path(base_path)
 
 
 class AllreduceBase(SubKnowledgeBase):
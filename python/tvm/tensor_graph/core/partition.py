@@ -0,0 +1,188 @@
+import tvm
+import tvm._ffi
+from functools import reduce
+from contextlib import contextmanager
+
+from tvm import tg
+from .con_graph import partition_policy, set_partition_policy
+from .utils import to_int
+from .auto_schedule.hardware_config import get_hardware_config
+
+
+def _product(lst):
+    return reduce(lambda x, y: x * y, lst, 1)
+
+
+def _iter_extent(op):
+    spatial = _product([to_int(iv.dom.extent) for iv in op.axis])
+    reduction = _product([to_int(iv.dom.extent) for iv in op.reduce_axis])
+    return spatial * reduction
+
+
+def _bytes_of(tensor):
+    bits = tvm.runtime.DataType(tensor.dtype).bits * tvm.runtime.DataType(tensor.dtype).lanes
+    return _product([to_int(x) for x in tensor.shape]) * max(1, bits // 8)
+
+
+class CostDrivenPartitionPolicy(object):
+    """
+    Partition policy that fuses two adjacent ops only if the estimated
+    latency of the fused kernel is lower than running them apart.
+
+    The static estimate compares the memory traffic saved by not
+    materializing the intermediate tensor against the flops recomputed
+    when the producer is inlined into a consumer that reads each element
+    more than once. If latency_fn is given, its predictions (or
+    measurements) override the static estimate.
+
+    The structural rules of the default partition_policy are kept: root
+    ops and multi-consumer ops are never fused, two reductions never share
+    one subgraph, and a reduction is kept apart from its injective
+    consumers unless fuse_epilogue is set.
+
+    Args:
+    ---
+    target: str
+        used to pick the hardware config
+    hd_config: HardwareConfig or None
+        provides peak_gflops and peak_bandwidth_gbs
+    max_subgraph_ops: int
+        hard limit of ops in one subgraph
+    fuse_epilogue: bool
+        allow fusing injective consumers into a reduction,
+        the default partition_policy never does
+    min_gain: float
+        the least estimated gain in seconds to fuse
+    latency_fn: callable or None
+        latency_fn(list of Operation) -> seconds or None
+    """
+    def __init__(self, target="cuda", hd_config=None, max_subgraph_ops=100,
+                 fuse_epilogue=False, min_gain=0.0, latency_fn=None):
+        target = str(target)
+        self.hd_config = (
+            get_hardware_config("default_cuda" if "cuda" in target else "default_llvm", target)
+            if hd_config is None else hd_config)
+        self.max_subgraph_ops = max_subgraph_ops
+        self.fuse_epilogue = fuse_epilogue
+        self.min_gain = min_gain
+        self.latency_fn = latency_fn
+        self.latency_cache = {}
+        self.gflop_cache = {}
+        # (fused, separated) decisions, for reports
+        self.stats = [0, 0]
+
+    def __call__(self, graph, pre, post, number):
+        separate = self.decide(graph, pre, post, number)
+        self.stats[int(separate)] += 1
+        return separate
+
+    def decide(self, graph, pre, post, number):
+        pre_stat = graph.operation_stat_dict[pre]
+        post_stat = graph.operation_stat_dict[post]
+        if pre_stat.must_compute_root:
+            return True
+        if pre_stat.num_consumers > 1:
+            return True
+        if number >= self.max_subgraph_ops:
+            return True
+        if pre_stat.reductive and post_stat.reductive:
+            return True
+        if pre_stat.reductive and not self.fuse_epilogue:
+            return True
+        gain = None
+        if self.latency_fn is not None:
+            gain = self.measured_gain(graph, pre, post)
+        if gain is None:
+            gain = self.estimated_gain(pre, post, inline_pre=not pre_stat.reductive)
+        return gain <= self.min_gain
+
+    def get_gflop(self, op):
+        if op not in self.gflop_cache:
+            self.gflop_cache[op] = tg.get_gflop(op)
+        return self.gflop_cache[op]
+
+    def estimated_gain(self, pre, post, inline_pre=True):
+        bandwidth = self.hd_config.peak_bandwidth_gbs * 1e9
+        peak = self.hd_config.peak_gflops * 1e9
+        # the intermediate is neither stored nor loaded again
+        traffic = _bytes_of(pre.output(0))
+        saved = 2 * traffic / bandwidth
+        if not inline_pre:
+            return saved
+        # inlined producer is recomputed for every read of the consumer
+        elements = max(1, _product([to_int(x) for x in pre.output(0).shape]))
+        reads_per_element = _iter_extent(post) / float(elements)
+        recompute = self.get_gflop(pre) * 1e9 * max(0.0, reads_per_element - 1) / peak
+        return saved - recompute
+
+    def _latency(self, graph, ops):
+        key = tuple([graph.operation_key_dict[op].key for op in ops])
+        if key not in self.latency_cache:
+            self.latency_cache[key] = self.latency_fn(ops)
+        return self.latency_cache[key]
+
+    def measured_gain(self, graph, pre, post):
+        apart = [self._latency(graph, [pre]), self._latency(graph, [post])]
+        fused = self._latency(graph, [pre, post])
+        if fused is None or None in apart:
+            return None
+        return sum(apart) - fused
+
+
+PARTITION_POLICIES = {
+    "default": lambda **kwargs: partition_policy,
+    "cost": CostDrivenPartitionPolicy,
+}
+
+
+def register_partition_policy(name, factory):
+    """
+    factory(**kwargs) returns a callable (graph, pre, post, number) -> bool,
+    True means pre and post go to different subgraphs.
+    """
+    PARTITION_POLICIES[name] = factory
+
+
+def use_partition_policy(policy="default", **kwargs):
+    """
+    Install the partition policy used by tg.make_tir_multi_graph.
+
+    Args:
+    ---
+    policy: str or callable
+        a registered name or the policy itself
+
+    Returns:
+    ---
+    the installed policy
+    """
+    if isinstance(policy, str):
+        if policy not in PARTITION_POLICIES:
+            raise ValueError("Unknown partition policy %s" % policy)
+        policy = PARTITION_POLICIES[policy](**kwargs)
+    set_partition_policy(policy)
+    return policy
+
+
+@contextmanager
+def partition_policy_scope(policy, **kwargs):
+    """
+    Install a partition policy for the scope and restore the one
+    that was active before on exit.
+    """
+    previous = tvm._ffi.get_global_func("tg.graph.partition_policy", allow_missing=True)
+    installed = use_partition_policy(policy, **kwargs)
+    try:
+        yield installed
+    finally:
+        set_partition_policy(partition_policy if previous is None else previous)
+
+
+def count_unique_subgraphs(multi_graph):
+    """
+    Return (number of subgraphs, number of unique subgraph tags),
+    the latter is the number of tuning tasks.
+    """
+    graphs = tg.get_graphs_from_tir_multi_graph(multi_graph)
+    tags = set([subgraph.tag for subgraph in graphs.values()])
+    return len(graphs), len(tags)
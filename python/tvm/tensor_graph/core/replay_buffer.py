@@ -0,0 +1,167 @@
+import os
+import json
+import numpy as np
+
+
+class ReplayBuffer(object):
+  """
+  Preallocated NumPy buffer of fixed capacity.
+
+  Rows are written in place until the buffer is full. After that,
+  policy "reservoir" keeps a uniform sample of every row ever added
+  (Algorithm R), and policy "ring" overwrites the oldest row.
+  Views returned by `view` and `batches` share memory with the buffer.
+
+  Args:
+  ---
+  capacity: int
+    the maximum number of rows kept
+  width: int or None
+    the row length; None for a 1-D buffer, inferred on first `add` for
+    numeric buffers if not given
+  dtype: str
+    numpy dtype of the storage, use "object" for arbitrary python entries
+  policy: str
+    "reservoir" or "ring"
+  rng: np.random.RandomState or None
+    random source for reservoir replacement and shuffling
+  """
+  def __init__(self, capacity, width=None, dtype="float32", policy="reservoir", rng=None):
+    assert capacity > 0, "Capacity should be positive."
+    assert policy in ["reservoir", "ring"], "Unknown replay policy %s" % policy
+    self.capacity = capacity
+    self.width = width
+    self.dtype = np.dtype(dtype)
+    self.policy = policy
+    self.rng = np.random if rng is None else rng
+    # number of valid rows
+    self.size = 0
+    # number of rows ever added
+    self.seen = 0
+    # next slot to overwrite in ring mode
+    self.cursor = 0
+    self.data = None
+    self.mmap_path = None
+    if self.width is not None or self.dtype == np.dtype("object"):
+      self._allocate()
+
+  def _allocate(self):
+    if self.dtype == np.dtype("object"):
+      # np.empty on object fills with None, rows are python objects
+      self.data = np.empty([self.capacity], dtype=self.dtype)
+    else:
+      self.data = np.zeros([self.capacity, self.width], dtype=self.dtype)
+
+  def __len__(self):
+    return self.size
+
+  def _next_slot(self):
+    if self.size < self.capacity:
+      slot = self.size
+      self.size += 1
+      return slot
+    if self.policy == "ring":
+      slot = self.cursor
+      self.cursor = (self.cursor + 1) % self.capacity
+      return slot
+    # reservoir: keep the new row with probability capacity / seen
+    slot = self.rng.randint(0, self.seen)
+    return slot if slot < self.capacity else -1
+
+  def add(self, row):
+    """
+    Add one row, return the slot it landed in or -1 if dropped.
+    """
+    if self.data is None:
+      self.width = len(row)
+      self._allocate()
+    self.seen += 1
+    slot = self._next_slot()
+    if slot >= 0:
+      self.data[slot] = row
+    return slot
+
+  def view(self):
+    """
+    Zero-copy view of the valid rows.
+    """
+    if self.data is None:
+      return np.zeros([0, 0 if self.width is None else self.width], dtype=self.dtype)
+    return self.data[:self.size]
+
+  def shuffle(self):
+    """
+    Shuffle the valid rows in place.
+    Row order carries no meaning for either policy once the buffer is sampled.
+    """
+    if self.size > 1:
+      self.rng.shuffle(self.view())
+
+  def batches(self, batch_size, limit=None):
+    """
+    Yield zero-copy views of at most `limit` rows in chunks of `batch_size`.
+    """
+    valid = self.view()
+    if limit is not None:
+      valid = valid[:limit]
+    for beg in range(0, len(valid), batch_size):
+      yield valid[beg:beg+batch_size]
+
+  def to_path(self, path):
+    """
+    Store the buffer as a .npy file with a json sidecar for the counters.
+    A buffer opened from the same path is flushed instead of rewritten.
+    """
+    assert self.dtype != np.dtype("object"), "Object buffers can't be memory-mapped."
+    if self.mmap_path is not None and os.path.abspath(path) == self.mmap_path:
+      self.data.flush()
+    elif self.data is None:
+      np.save(path, np.zeros([0], dtype=self.dtype))
+    else:
+      out = np.lib.format.open_memmap(
+        path, mode="w+", dtype=self.dtype, shape=self.data.shape)
+      out[:self.size] = self.data[:self.size]
+      out.flush()
+      del out
+    with open(meta_path_of(path), "w") as fout:
+      fout.write(json.dumps(
+        {"size": self.size, "seen": self.seen, "cursor": self.cursor,
+         "policy": self.policy}))
+
+  def from_path(self, path):
+    """
+    Memory-map a buffer stored by `to_path` as the backing storage.
+    Plain .npy files without a sidecar are copied in once.
+    """
+    meta_path = meta_path_of(path)
+    if not os.path.exists(meta_path):
+      rows = np.load(path, mmap_mode="r")
+      if rows.ndim < 2 or len(rows) == 0:
+        return
+      self.width = rows.shape[1]
+      self._allocate()
+      self.size = self.seen = min(len(rows), self.capacity)
+      self.data[:self.size] = rows[:self.size]
+      return
+    with open(meta_path, "r") as fin:
+      meta = json.loads(fin.read())
+    rows = np.load(path, mmap_mode="r+")
+    if rows.ndim < 2:
+      return
+    if rows.shape[0] != self.capacity or rows.dtype != self.dtype:
+      # capacity changed between runs, fall back to one copy
+      self.width = rows.shape[1]
+      self._allocate()
+      self.size = min(meta["size"], self.capacity)
+      self.data[:self.size] = rows[:self.size]
+    else:
+      self.data = rows
+      self.width = rows.shape[1]
+      self.size = meta["size"]
+      self.mmap_path = os.path.abspath(path)
+    self.seen = meta["seen"]
+    self.cursor = meta["cursor"] % self.capacity
+
+
+def meta_path_of(path):
+  return path + ".meta.json"
@@ -1 +1,2 @@
-from .subgraph import set_mark_group_role, set_should_checkpoint
\ No newline at end of file
+from .subgraph import set_mark_group_role, set_should_checkpoint
+from .checkpoint import RecomputePlanner, plan_recomputation
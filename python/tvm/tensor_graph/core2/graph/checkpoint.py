@@ -0,0 +1,211 @@
+import tvm
+from collections import OrderedDict
+from functools import reduce
+
+from ..utils import to_tuple
+from .subgraph import OpType, should_checkpoint, set_should_checkpoint
+
+
+def _bytes_of(tensor):
+    dtype = tvm.runtime.DataType(tensor.dtype)
+    elements = reduce(lambda x, y: x * y, to_tuple(tensor.shape), 1)
+    return elements * max(1, dtype.bits * dtype.lanes // 8)
+
+
+def _op_key(op):
+    name = op.name
+    # copies made by CheckPointGraph carry this suffix
+    if name.endswith(".checkpoint"):
+        name = name[:-len(".checkpoint")]
+    return (name, to_tuple(op.output(0).shape), str(op.output(0).dtype))
+
+
+class CheckpointCandidate(object):
+    """ The forward ops sharing one output signature
+
+    core2 layers reuse op names, so the same key is met once per layer.
+    The instances are interchangeable for the plan, which decides how
+    many of them are recomputed.
+
+    Parameters:
+    -----------
+    key : tuple
+        (name, shape, dtype) of the op output
+
+    op_type : int
+        OpType
+
+    role : int
+        GroupRole
+
+    nbytes : int
+        bytes of one output kept between forward and backward
+
+    gflop : float
+        cost to recompute one output once
+
+    count : int
+        number of ops with this key in the graph
+    """
+    def __init__(self, key, op_type, role, nbytes, gflop, count=1):
+        self.key = key
+        self.op_type = op_type
+        self.role = role
+        self.nbytes = nbytes
+        self.gflop = gflop
+        self.count = count
+
+    def __repr__(self):
+        return "CheckpointCandidate(%s x %d, %d bytes, %f gflop)" % (
+            str(self.key), self.count, self.nbytes, self.gflop)
+
+
+class RecomputePlanner(object):
+    """ Memory-budgeted recomputation planner
+
+    Used as the tg.graph2.should_checkpoint hook. In recording mode every
+    eligible op is recomputed so that CheckPointGraph visits the whole
+    recomputable region and the planner sees all the candidates. After
+    plan(), only the chosen ops are recomputed and the others are kept
+    in memory.
+
+    The plan keeps the ops whose bytes per recomputed gflop are the
+    smallest until the memory budget is used up, the rest are recomputed.
+    Ops are counted per instance, the hook may see one op more than once.
+
+    Parameters:
+    -----------
+    recompute_types : list of int, optional
+        OpType allowed to be recomputed, heavy reductions are excluded
+        by default because they are the ops worth keeping
+
+    peak_gflops : float, optional
+        used to turn recompute gflop into time
+    """
+    def __init__(self, recompute_types=None, peak_gflops=1000.0):
+        if recompute_types is None:
+            recompute_types = [OpType.tConst, OpType.tElementwise,
+                               OpType.tUnknown, OpType.tLightReduce]
+        self.recompute_types = set(recompute_types)
+        self.peak_gflops = peak_gflops
+        self.candidates = OrderedDict()
+        # None means recording mode, otherwise key -> instances to recompute
+        self.recompute_count = None
+        # op -> recompute or not, for the graph being built
+        self.decisions = {}
+        # key -> instances met in the graph being built
+        self.instances = {}
+
+    def __call__(self, op, op_role):
+        if "checkpoint" in op.name:
+            return False
+        if op in self.decisions:
+            return self.decisions[op]
+        op_type = int(tvm.tg.get_op_type(op))
+        if op_type not in self.recompute_types:
+            return False
+        key = _op_key(op)
+        index = self.instances.get(key, 0)
+        self.instances[key] = index + 1
+        if self.recompute_count is None:
+            if key not in self.candidates:
+                self.candidates[key] = CheckpointCandidate(
+                    key, op_type, op_role.value, _bytes_of(op.output(0)),
+                    tvm.tg.get_gflop(op), count=0)
+            self.candidates[key].count += 1
+            ret = True
+        else:
+            ret = index < self.recompute_count.get(key, 0)
+        self.decisions[op] = ret
+        return ret
+
+    def record(self):
+        self.candidates = OrderedDict()
+        self.recompute_count = None
+        self.reset_instances()
+
+    def reset_instances(self):
+        self.decisions = {}
+        self.instances = {}
+
+    def total_bytes(self):
+        return sum([x.nbytes * x.count for x in self.candidates.values()])
+
+    def plan(self, memory_budget):
+        """
+        Parameters:
+        -----------
+        memory_budget : int
+            bytes allowed for the kept candidate outputs
+
+        Returns:
+        --------
+        (kept bytes, recomputed gflop), kept bytes never exceed memory_budget
+        """
+        order = sorted(self.candidates.values(),
+                       key=lambda x: x.nbytes / (x.gflop + 1e-10))
+        kept = 0
+        recompute_count = {}
+        recompute_gflop = 0.0
+        for cand in order:
+            fit = (memory_budget - kept) // cand.nbytes if cand.nbytes > 0 else cand.count
+            num_kept = int(max(0, min(cand.count, fit)))
+            kept += num_kept * cand.nbytes
+            recompute_count[cand.key] = cand.count - num_kept
+            recompute_gflop += (cand.count - num_kept) * cand.gflop
+        self.recompute_count = recompute_count
+        self.reset_instances()
+        return kept, recompute_gflop
+
+    def tradeoff_curve(self, num_points=11):
+        """
+        Sweep the budget from nothing kept to everything kept.
+
+        Returns:
+        --------
+        list of dict with budget, kept_bytes, recompute_gflop, recompute_ms
+        """
+        total = self.total_bytes()
+        recompute_count = self.recompute_count
+        curve = []
+        for i in range(num_points):
+            budget = total * i // max(1, num_points - 1)
+            kept, gflop = self.plan(budget)
+            curve.append({
+                "budget": budget,
+                "kept_bytes": kept,
+                "saved_bytes": total - kept,
+                "recompute_gflop": gflop,
+                "recompute_ms": gflop / self.peak_gflops * 1e3,
+            })
+        self.recompute_count = recompute_count
+        return curve
+
+
+def plan_recomputation(make_graph, memory_budget, planner=None):
+    """ Build a graph whose kept activations fit in memory_budget
+
+    Parameters:
+    -----------
+    make_graph : callable
+        returns tg.Graph, e.g. lambda: make_backward(model, loss, opt, inputs, labels)
+
+    memory_budget : int
+        bytes
+
+    planner : RecomputePlanner, optional
+
+    Returns:
+    --------
+    (tg.Graph, RecomputePlanner)
+    """
+    planner = RecomputePlanner() if planner is None else planner
+    set_should_checkpoint(planner)
+    try:
+        planner.record()
+        make_graph()
+        planner.plan(memory_budget)
+        graph = make_graph()
+    finally:
+        set_should_checkpoint(should_checkpoint)
+    return graph, planner
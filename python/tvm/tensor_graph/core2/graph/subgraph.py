@@ -60,8 +60,8 @@ def should_checkpoint(op, op_role):
 
 
 def set_mark_group_role(func):
-  tvm._ffi.register_func(func, "tg.graph2.mark_group_role", True)
+  tvm._ffi.register_func("tg.graph2.mark_group_role", func, True)
 
 
 def set_should_checkpoint(func):
-  tvm._ffi.register_func(func, "tg.graph2.should_checkpoint", True)
\ No newline at end of file
+  tvm._ffi.register_func("tg.graph2.should_checkpoint", func, True)
\ No newline at end of file
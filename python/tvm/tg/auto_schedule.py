@@ -209,6 +209,77 @@ def get_schedule_result(
     )
 
 
+def get_schedule_results(
+  name,
+  subgraph,
+  target,
+  dev_id,
+  timeout,
+  number,
+  max_trials=None
+):
+  """Sample a batch of valid schedules
+
+  Parameters
+  ----------
+  number: int
+      The number of valid schedules wanted.
+
+  max_trials: int, optional
+      The most samples to try, 10 * number by default.
+
+  Returns
+  -------
+  list of ScheduleResult
+      At most number results, fewer if the trial budget runs out.
+  """
+  if max_trials is None:
+    max_trials = 10 * number
+  return list(_ffi_api.get_schedule_results(
+    name, subgraph, target, dev_id, timeout, number, max_trials))
+
+
+def get_schedule_sample_stats(name, target, dev_id, timeout):
+  """Get the sampling statistics of the searcher of name
+
+  Returns
+  -------
+  (int, int)
+      The number of sampled and invalid schedules.
+  """
+  sampled, invalid = _ffi_api.get_schedule_sample_stats(name, target, dev_id, timeout)
+  return sampled.value, invalid.value
+
+
+def feedback_schedule_entities(
+  name,
+  subgraph,
+  target,
+  dev_id,
+  timeout,
+  entities,
+  perfs
+):
+  """Feed logged schedules to the searcher without building them
+
+  Parameters
+  ----------
+  entities: list of str
+      The string representations of MultiScheduleEntity.
+
+  perfs: list of float
+      The performance of each entity.
+
+  Returns
+  -------
+  int
+      The number of entities fed.
+  """
+  perfs = [tvm.tir.FloatImm("float64", float(x)) for x in perfs]
+  return _ffi_api.feedback_schedule_entities(
+    name, subgraph, target, dev_id, timeout, list(entities), perfs)
+
+
 def get_schedule_result_from_entity(
   name,
   subgraph,
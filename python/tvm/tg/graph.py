@@ -196,4 +196,65 @@ def flatten_tir_graph(ops, output_first=False):
 
 
 def get_graphs_from_tir_multi_graph(multi_graph):
-  return _ffi_api.get_graphs_from_tir_multi_graph(multi_graph)
\ No newline at end of file
+  return _ffi_api.get_graphs_from_tir_multi_graph(multi_graph)
+
+
+def get_graph_attrs_from_tir_multi_graph(multi_graph):
+  """Get the dependency attributes of subgraphs.
+
+    Parameters
+    ----------
+    multi_graph: TIRMultiGraph
+
+    Returns
+    -------
+    map from IntKey to GraphAttr (num_predecessor, successors)
+  """
+  return _ffi_api.get_graph_attrs_from_tir_multi_graph(multi_graph)
+
+
+def call_order_from_attrs(num_predecessor, successors):
+  """Level-by-level topological order, each level sorted by id.
+
+    Parameters
+    ----------
+    num_predecessor: dict of int to int
+
+    successors: dict of int to list of int
+
+    Returns
+    -------
+    list of int
+  """
+  num_predecessor = dict(num_predecessor)
+  free = sorted([x for x, y in num_predecessor.items() if y == 0])
+  order = []
+  while free:
+    order.extend(free)
+    update = set()
+    for k in free:
+      for v in successors.get(k, []):
+        num_predecessor[v] -= 1
+        if num_predecessor[v] == 0:
+          update.add(v)
+    free = sorted(update)
+  assert len(order) == len(num_predecessor), "The subgraphs have a cycle."
+  return order
+
+
+def get_graph_call_order(multi_graph):
+  """Get the topological call order of subgraphs, the same order
+     used by the runtime.
+
+    Parameters
+    ----------
+    multi_graph: TIRMultiGraph
+
+    Returns
+    -------
+    list of int
+  """
+  attrs = get_graph_attrs_from_tir_multi_graph(multi_graph)
+  num_predecessor = {x.value: int(y.num_predecessor) for x, y in attrs.items()}
+  successors = {x.value: [v.value for v in y.successors] for x, y in attrs.items()}
+  return call_order_from_attrs(num_predecessor, successors)
@@ -124,8 +124,9 @@ class RelayBuildModule : public runtime::ModuleNode {
           [sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->GetModule(); });
     } else if (name == "build") {
       return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
-        CHECK_EQ(args.num_args, 3);
-        this->Build(args[0], args[1], args[2]);
+        CHECK(args.num_args == 3 || args.num_args == 4);
+        bool optimized = args.num_args == 4 && static_cast<bool>(args[3]);
+        this->Build(args[0], args[1], args[2], optimized);
       });
     } else if (name == "list_params") {
       return PackedFunc(
@@ -220,11 +221,13 @@ class RelayBuildModule : public runtime::ModuleNode {
    * \param mod Relay IRModule
    * \param target Target device
    * \param target_host Host target device
+   * \param optimized Whether mod is already the output of Optimize
    */
-  void Build(IRModule mod, const TargetsMap& targets, const tvm::Target& target_host) {
+  void Build(IRModule mod, const TargetsMap& targets, const tvm::Target& target_host,
+             bool optimized = false) {
     targets_ = targets;
     target_host_ = target_host;
-    BuildRelay(mod, params_);
+    BuildRelay(mod, params_, optimized);
     // Clear compile engine so that tuning schedules can be changed between runs. See issue #6096.
     CompileEngine::Global()->Clear();
   }
@@ -426,11 +429,15 @@ class RelayBuildModule : public runtime::ModuleNode {
    *
    * \param relay_module The Relay IR module.
    * \param params The parameters.
+   * \param optimized Whether relay_module is already optimized, the params are bound then.
    */
   void BuildRelay(IRModule relay_module,
-                  const std::unordered_map<std::string, tvm::runtime::NDArray>& params) {
+                  const std::unordered_map<std::string, tvm::runtime::NDArray>& params,
+                  bool optimized = false) {
     // Relay IRModule -> IRModule optimizations.
-    relay_module = Optimize(relay_module, targets_, params);
+    if (!optimized) {
+      relay_module = Optimize(relay_module, targets_, params);
+    }
     // Get the updated function.
     auto func = Downcast<Function>(relay_module->Lookup("main"));
 
@@ -181,6 +181,26 @@ void GraphRuntime::CopyOutputTo(int index, DLTensor* data_out) {
   data_entry_[eid].CopyTo(data_out);
 }
 
+void GraphRuntime::RunBatch(const std::vector<int>& input_indices,
+                            const std::vector<DLTensor*>& inputs,
+                            const std::vector<DLTensor*>& outputs) {
+  size_t num_inputs = input_indices.size();
+  size_t num_outputs = outputs_.size();
+  CHECK(num_inputs != 0 || num_outputs != 0);
+  size_t num_requests = num_inputs != 0 ? inputs.size() / num_inputs : outputs.size() / num_outputs;
+  CHECK_EQ(inputs.size(), num_requests * num_inputs);
+  CHECK_EQ(outputs.size(), num_requests * num_outputs);
+  for (size_t i = 0; i < num_requests; ++i) {
+    for (size_t j = 0; j < num_inputs; ++j) {
+      this->SetInput(input_indices[j], inputs[i * num_inputs + j]);
+    }
+    this->Run();
+    for (size_t j = 0; j < num_outputs; ++j) {
+      this->CopyOutputTo(j, outputs[i * num_outputs + j]);
+    }
+  }
+}
+
 /*!
  * \brief Load parameters from parameter blob.
  * \param param_blob A binary blob of parameter.
@@ -444,6 +464,38 @@ PackedFunc GraphRuntime::GetFunction(const std::string& name,
         [sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->NumInputs(); });
   } else if (name == "run") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { this->Run(); });
+  } else if (name == "run_batch") {
+    // run_batch(num_inputs, input_index..., request0_input..., request1_input...,
+    //           request0_output..., request1_output...)
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      int num_inputs = args[0];
+      CHECK_GE(args.num_args, num_inputs + 1);
+      std::vector<int> input_indices;
+      for (int i = 0; i < num_inputs; ++i) {
+        if (String::CanConvertFrom(args[i + 1])) {
+          int in_idx = this->GetInputIndex(args[i + 1].operator String());
+          CHECK_GE(in_idx, 0) << "Cannot find input " << args[i + 1].operator String();
+          input_indices.push_back(in_idx);
+        } else {
+          input_indices.push_back(args[i + 1]);
+        }
+      }
+      int num_arrays = args.num_args - num_inputs - 1;
+      int per_request = num_inputs + this->NumOutputs();
+      CHECK(per_request != 0 && num_arrays % per_request == 0)
+          << "run_batch expects " << num_inputs << " inputs and " << this->NumOutputs()
+          << " outputs per request";
+      int num_requests = num_arrays / per_request;
+      std::vector<DLTensor*> inputs, outputs;
+      int offset = num_inputs + 1;
+      for (int i = 0; i < num_requests * num_inputs; ++i) {
+        inputs.push_back(args[offset++]);
+      }
+      for (int i = 0; i < num_requests * this->NumOutputs(); ++i) {
+        outputs.push_back(args[offset++]);
+      }
+      this->RunBatch(input_indices, inputs, outputs);
+    });
   } else if (name == "load_params") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       this->LoadParams(args[0].operator std::string());
@@ -150,6 +150,17 @@ class TVM_DLL GraphRuntime : public ModuleNode {
    * \param data_out the output data.
    */
   void CopyOutputTo(int index, DLTensor* data_out);
+  /*!
+   * \brief Run a batch of requests in one call.
+   *
+   *  For every request, the inputs are copied in, the graph is executed
+   *  and the outputs are copied out.
+   * \param input_indices The input indices bound by every request.
+   * \param inputs The inputs, input_indices.size() per request.
+   * \param outputs The output containers, NumOutputs() per request.
+   */
+  void RunBatch(const std::vector<int>& input_indices, const std::vector<DLTensor*>& inputs,
+                const std::vector<DLTensor*>& outputs);
   /*!
    * \brief Load parameters from binary stream
    * \param strm The input stream.
@@ -248,6 +248,33 @@ ScheduleResult AutoScheduler::schedule_func(IntKey key, TIRGraph subgraph, Targe
 }
 
 
+Array<ScheduleResult> AutoScheduler::schedule_batch(
+  IntKey key, TIRGraph subgraph, Target target, int number, int max_trials) {
+  /*
+   * Sample until number valid schedules are got,
+   * at most max_trials samples are tried.
+   * A sample is invalid if it fails to be interpreted or judged.
+   */
+  Array<ScheduleResult> ret;
+  int trials = 0;
+  while ((int)ret.size() < number && trials < max_trials) {
+    trials += 1;
+    num_sampled += 1;
+    try {
+      ScheduleResult result = schedule_func(key, subgraph, target);
+      if (result.defined() && result->schedule.defined()) {
+        ret.push_back(result);
+        continue;
+      }
+    } catch (const std::exception& e) {
+      print(4, log_out) << "Invalid sample: " << e.what() << "\n";
+    }
+    num_invalid += 1;
+  }
+  return ret;
+}
+
+
 ScheduleResult AutoScheduler::schedule_with_entity(
   TIRGraph subgraph, Target target, MultiScheduleEntity entity) {
   // if (contexts.find(key) == contexts.end()) {
@@ -362,15 +389,7 @@ void AutoScheduler::clear_schedule_cache_for(IntKey key) {
 }
 
 
-ScheduleResult get_schedule_result(
-  String name,
-  TIRGraph subgraph,
-  Target target,
-  int dev_id,
-  int timeout,
-  double perf=0.0,  // gflops
-  bool do_feedback=false,
-  ScheduleResult result=ScheduleResult()) {
+AutoScheduler* get_scheduler(String name, Target target, int dev_id, int timeout) {
   std::string name_key = std::string(name);
   static std::unordered_map<std::string, AutoScheduler*> scheduler_map;
   DLContext ctx;
@@ -397,19 +416,77 @@ ScheduleResult get_schedule_result(
       /* bool use_tensor_core = false */
     );
   }
+  return scheduler_map[name_key];
+}
+
+
+ScheduleResult get_schedule_result(
+  String name,
+  TIRGraph subgraph,
+  Target target,
+  int dev_id,
+  int timeout,
+  double perf=0.0,  // gflops
+  bool do_feedback=false,
+  ScheduleResult result=ScheduleResult()) {
+  AutoScheduler* scheduler = get_scheduler(name, target, dev_id, timeout);
   IntKey dummy_key = 0;
   if (do_feedback && result.defined()) {
-    scheduler_map[name_key]->feedback_for(
+    scheduler->feedback_for(
       dummy_key, subgraph, target, result, perf
     );
     return result;
   }
-  ScheduleResult ret_result = scheduler_map[name_key]->schedule_func(
+  ScheduleResult ret_result = scheduler->schedule_func(
     dummy_key, subgraph, target);
   return ret_result;
 }
 
 
+Array<ScheduleResult> get_schedule_results(
+  String name,
+  TIRGraph subgraph,
+  Target target,
+  int dev_id,
+  int timeout,
+  int number,
+  int max_trials) {
+  AutoScheduler* scheduler = get_scheduler(name, target, dev_id, timeout);
+  IntKey dummy_key = 0;
+  return scheduler->schedule_batch(dummy_key, subgraph, target, number, max_trials);
+}
+
+
+/*
+ * Feed logged (entity, perf) pairs to the searcher of name.
+ * Only the entities are needed by the feedback statistics,
+ * so no schedule is constructed.
+ * Return the number of entities fed.
+ */
+int feedback_schedule_entities(
+  String name,
+  TIRGraph subgraph,
+  Target target,
+  int dev_id,
+  int timeout,
+  Array<String> entities,
+  Array<FloatImm> perfs) {
+  ASSERT(entities.size() == perfs.size())
+    << "Got " << entities.size() << " entities but " << perfs.size() << " perfs.";
+  AutoScheduler* scheduler = get_scheduler(name, target, dev_id, timeout);
+  IntKey dummy_key = 0;
+  int count = 0;
+  for (size_t i = 0; i < entities.size(); ++i) {
+    MultiScheduleEntity entity = multi_schedule_entity_from_string(entities[i]);
+    scheduler->feedback_for(
+      dummy_key, subgraph, target,
+      ScheduleResult(te::Schedule(), Array<te::Tensor>(), entity), perfs[i]->value);
+    count += 1;
+  }
+  return count;
+}
+
+
 TVM_REGISTER_NODE_TYPE(ScheduleResultNode);
 TVM_REGISTER_NODE_TYPE(ScheduleTensorsNode);
 
@@ -455,6 +532,49 @@ TVM_REGISTER_GLOBAL("tg.get_schedule_result_without_feedback")
 });
 
 
+TVM_REGISTER_GLOBAL("tg.get_schedule_results")
+.set_body_typed([](
+  String name,
+  TIRGraph subgraph,
+  Target target,
+  int dev_id,
+  int timeout,
+  int number,
+  int max_trials
+){
+  return get_schedule_results(
+    name, subgraph, target, dev_id, timeout, number, max_trials);
+});
+
+
+TVM_REGISTER_GLOBAL("tg.get_schedule_sample_stats")
+.set_body_typed([](
+  String name,
+  Target target,
+  int dev_id,
+  int timeout
+){
+  int64_t sampled, invalid;
+  std::tie(sampled, invalid) = get_scheduler(name, target, dev_id, timeout)->sample_stats();
+  return Array<Integer>({Integer(sampled), Integer(invalid)});
+});
+
+
+TVM_REGISTER_GLOBAL("tg.feedback_schedule_entities")
+.set_body_typed([](
+  String name,
+  TIRGraph subgraph,
+  Target target,
+  int dev_id,
+  int timeout,
+  Array<String> entities,
+  Array<FloatImm> perfs
+){
+  return feedback_schedule_entities(
+    name, subgraph, target, dev_id, timeout, entities, perfs);
+});
+
+
 TVM_REGISTER_GLOBAL("tg.get_schedule_result_from_entity")
 .set_body_typed([](
   String name,
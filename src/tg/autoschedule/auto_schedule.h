@@ -195,6 +195,9 @@ class AutoScheduler {
   std::unordered_map<IntKey, AutoScheduleContext> contexts;
   std::ostream& log_out;
   std::ofstream profile_log;
+  // sampling statistics of schedule_batch
+  int64_t num_sampled = 0;
+  int64_t num_invalid = 0;
   // Measurer *measurer = nullptr;
  public:
   AutoScheduler(DLContext context, int topk, int new_trial, std::string policy, int parallel,
@@ -224,6 +227,9 @@ class AutoScheduler {
     // if (measurer != nullptr) {delete measurer; measurer = new Measurer(profile_parallel, profile_timeout);}
   }
   ScheduleResult schedule_func(IntKey key, TIRGraph subgraph, Target target);
+  Array<ScheduleResult> schedule_batch(
+    IntKey key, TIRGraph subgraph, Target target, int number, int max_trials);
+  std::pair<int64_t, int64_t> sample_stats() const { return {num_sampled, num_invalid}; }
   ScheduleResult schedule_with_entity(TIRGraph subgraph, Target target, MultiScheduleEntity entity);
   ScheduleResult schedule_with_external(TIRGraph subgraph, Target target, String external_schedule);
   std::shared_future<ScheduleResult> schedule_for(IntKey key, TIRGraph subgraph, Target target, int priority=0);
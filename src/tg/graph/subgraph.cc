@@ -516,6 +516,13 @@ TVM_REGISTER_GLOBAL("tg.get_graphs_from_tir_multi_graph")
   return ret;
 });
 
+
+TVM_REGISTER_GLOBAL("tg.get_graph_attrs_from_tir_multi_graph")
+.set_body_typed([](TIRMultiGraph multi_graph) {
+  Map<IntKey, GraphAttr> ret(multi_graph->graph_attrs.begin(), multi_graph->graph_attrs.end());
+  return ret;
+});
+
 }  // namespace tg
 
 }  // namespace tvm
\ No newline at end of file
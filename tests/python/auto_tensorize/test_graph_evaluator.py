@@ -0,0 +1,91 @@
+import tvm
+from types import SimpleNamespace
+from tvm import auto_tensorize as at
+from tvm.tg.graph import call_order_from_attrs
+
+
+def add_one(n, split=None):
+    A = tvm.te.placeholder([n], dtype="float32", name="A")
+    B = tvm.te.compute([n], lambda i: A[i] + 1.0, name="B")
+    sch = tvm.te.create_schedule(B.op)
+    if split is not None:
+        sch[B].split(B.op.axis[0], factor=split)
+    return SimpleNamespace(schedule=sch, tensors=[A, B])
+
+
+def broken(n):
+    A = tvm.te.placeholder([n], dtype="float32", name="A")
+    B = tvm.te.compute([n], lambda i: A[i] + 1.0, name="B")
+    # A is not an argument, the build can not bind it
+    return SimpleNamespace(schedule=tvm.te.create_schedule(B.op), tensors=[B])
+
+
+def test1():
+    """call order is level by level, ids sorted in each level"""
+    #   3   0
+    #   |  / \
+    #   1 2   4
+    #    \|
+    #     5
+    num_predecessor = {0: 0, 3: 0, 1: 1, 2: 1, 4: 1, 5: 2}
+    successors = {0: [2, 4], 3: [1], 1: [5], 2: [5]}
+    assert call_order_from_attrs(num_predecessor, successors) == [0, 3, 1, 2, 4, 5]
+    # the input dict is left alone
+    assert num_predecessor[5] == 2
+    detected = False
+    try:
+        call_order_from_attrs({0: 1, 1: 1}, {0: [1], 1: [0]})
+    except AssertionError:
+        detected = True
+    assert detected
+
+
+def test2():
+    """modules are shared by tag and only rebuilt when the schedule changes"""
+    evaluator = at.CachedGraphEvaluator("llvm", number=2)
+    order = [0, 1, 2]
+    tags = {0: "a", 1: "b", 2: "a"}
+    sch_tensors = {0: add_one(64), 1: add_one(128), 2: add_one(64)}
+    result = evaluator.evaluate_calls(order, tags, sch_tensors)
+    assert result.rebuilt == 2
+    assert result.tags["a"][0] == 2 and result.tags["b"][0] == 1
+    assert set(result.subgraphs.keys()) == set(order)
+    assert result.total < at.MAX_FLOAT and not result.errors
+
+    # the same schedules, and new schedule objects that lower to the same IR
+    assert evaluator.evaluate_calls(order, tags, sch_tensors).rebuilt == 0
+    sch_tensors[0] = add_one(64)
+    assert evaluator.evaluate_calls(order, tags, sch_tensors).rebuilt == 0
+
+    sch_tensors[1] = add_one(128, split=4)
+    result = evaluator.evaluate_calls(order, tags, sch_tensors)
+    assert result.rebuilt == 1
+    assert evaluator.total_builds == 3
+    assert len(evaluator.subgraphs) == 2
+
+
+def test3():
+    """a failing subgraph is recorded with MAX_FLOAT instead of raising"""
+    evaluator = at.CachedGraphEvaluator("llvm", number=2)
+    order = [0, 1]
+    tags = {0: "a", 1: "b"}
+    sch_tensors = {0: add_one(64), 1: broken(64)}
+    result = evaluator.evaluate_calls(order, tags, sch_tensors)
+    assert result.total == at.MAX_FLOAT
+    assert result.subgraphs[1] == at.MAX_FLOAT
+    assert result.subgraphs[0] < at.MAX_FLOAT
+    assert list(result.errors.keys()) == ["b"]
+    # the broken schedule is not built again
+    builds = evaluator.total_builds
+    assert evaluator.evaluate_calls(order, tags, sch_tensors).rebuilt == 0
+    assert evaluator.total_builds == builds
+    # fixing it makes the graph runnable
+    sch_tensors[1] = add_one(64, split=8)
+    result = evaluator.evaluate_calls(order, tags, sch_tensors)
+    assert result.rebuilt == 1 and result.total < at.MAX_FLOAT
+
+
+if __name__ == "__main__":
+    test1()
+    test2()
+    test3()
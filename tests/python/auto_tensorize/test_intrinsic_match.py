@@ -418,6 +418,128 @@ def test6(
     # print(tvm.lower(sch, args, simple_mode=True))
 
 
+@register_test
+def test7():
+    print("##################################")
+    print("Test 7")
+    from tvm.auto_tensorize.target import parse_cpu_target
+
+    mcpu, features = parse_cpu_target("llvm -mcpu=cascadelake")
+    assert mcpu == "cascadelake" and "vnni" in features
+    _, features = parse_cpu_target("llvm -mcpu=skylake-avx512 -mattr=+avx512vnni")
+    assert "vnni" in features
+    _, features = parse_cpu_target("llvm -mcpu=haswell")
+    assert "avx2" in features and "avx512" not in features
+    assert parse_cpu_target("cuda") is None
+
+    M, N, K = 64, 128, 256
+    A = tvm.te.placeholder([M, K], dtype="uint8", name="A")
+    B = tvm.te.placeholder([N, K], dtype="int8", name="B")
+    k = tvm.te.reduce_axis([0, K], name="k")
+    C = tvm.te.compute(
+        [M, N],
+        lambda i, j: tvm.te.sum(A[i, k].astype("int32") * B[j, k].astype("int32"), axis=k),
+        name="C")
+    target_dag = at.compute_dag_from_tensors([C])
+    for target, expected in [
+        ("llvm -mcpu=cascadelake", "avx512-vnni-dot"),
+        ("llvm -mcpu=haswell", "avx2-dot"),
+    ]:
+        names = [m.hw_abs_dag.get_name() for m in at.get_match_results(target_dag, target)]
+        print(target, names)
+        assert expected in names
+        assert "avx512-vnni-dot" not in names or "vnni" in parse_cpu_target(target)[1]
+
+
+def host_cpu_features():
+    """the features of parse_cpu_target that the host cpu has"""
+    flags = {"avx2": "avx2", "fma": "fma", "avx512f": "avx512", "avx512_vnni": "vnni"}
+    if not os.path.exists("/proc/cpuinfo"):
+        return frozenset()
+    with open("/proc/cpuinfo") as fin:
+        for line in fin:
+            if line.startswith("flags"):
+                return frozenset([flags[x] for x in line.split(":")[1].split() if x in flags])
+    return frozenset()
+
+
+@register_test
+def test8():
+    print("##################################")
+    print("Test 8")
+    import numpy as np
+    from tvm.auto_tensorize.hw_abstraction.llvm.x86_dot import (
+        AVX512VNNIDot,
+        AVX2Dot,
+        AVX2FMAFp32,
+        AVX512FMAFp32,
+    )
+    from tvm.auto_tensorize.target import parse_cpu_target
+
+    host = host_cpu_features()
+    M, N, K = 16, 32, 64
+    for kernel, target in [
+        (AVX512VNNIDot("avx512-vnni-dot"), "llvm -mcpu=cascadelake"),
+        (AVX2Dot("avx2-dot"), "llvm -mcpu=haswell"),
+        (AVX2FMAFp32("avx2-fma-fp32"), "llvm -mcpu=haswell"),
+        (AVX512FMAFp32("avx512-fma-fp32"), "llvm -mcpu=skylake-avx512"),
+    ]:
+        name = kernel.__class__.__name__
+        if not parse_cpu_target(target)[1] <= host:
+            print("Skip %s, the host cpu lacks %s." % (name, target))
+            continue
+        in_dtype, kernel_dtype = kernel.input_dtypes
+        lanes, reduce_len = kernel.lanes, kernel.reduce_len
+        # B is packed so that every tile of the kernel is contiguous, like
+        # the operands AMOS materializes for the intrinsic
+        if kernel.kernel_layout == "ik":
+            packed_shape = [N // lanes, K // reduce_len, lanes, reduce_len]
+            perm = (0, 2, 1, 3)
+        else:
+            packed_shape = [N // lanes, K // reduce_len, reduce_len, lanes]
+            perm = (0, 2, 3, 1)
+        A = te.placeholder([M, K], dtype=in_dtype, name="A")
+        B = te.placeholder(packed_shape, dtype=kernel_dtype, name="B")
+        ko = te.reduce_axis([0, K // reduce_len], name="ko")
+        ki = te.reduce_axis([0, reduce_len], name="ki")
+
+        def get_b(jo, ji, ko, ki):
+            if kernel.kernel_layout == "ik":
+                return B[jo, ko, ji, ki]
+            return B[jo, ko, ki, ji]
+
+        out_dtype = kernel.output_dtype
+        C = te.compute(
+            [M, N // lanes, lanes],
+            lambda i, jo, ji: te.sum(
+                A[i, ko * reduce_len + ki].astype(out_dtype)
+                * get_b(jo, ji, ko, ki).astype(out_dtype),
+                axis=[ko, ki]),
+            name="C")
+        sch = te.create_schedule(C.op)
+        i, jo, ji = sch[C].op.axis
+        sch[C].reorder(i, jo, ko, ji, ki)
+        sch[C].tensorize(ji, kernel.get_intrinsic())
+        func = tvm.build(sch, [A, B, C], target)
+
+        if in_dtype == "uint8":
+            # avx2-dot sums u8 x s8 pairs in int16 with saturation,
+            # keep the pairs in range so that every kernel is exact
+            a_np = np.random.randint(0, 128, size=[M, K]).astype(in_dtype)
+            b_np = np.random.randint(-64, 64, size=[N, K]).astype(kernel_dtype)
+        else:
+            a_np = np.random.uniform(-1, 1, size=[M, K]).astype(in_dtype)
+            b_np = np.random.uniform(-1, 1, size=[N, K]).astype(kernel_dtype)
+        packed = b_np.reshape(N // lanes, lanes, K // reduce_len, reduce_len).transpose(perm)
+        expected = np.dot(a_np.astype(out_dtype), b_np.T.astype(out_dtype))
+        ctx = tvm.cpu()
+        c_tvm = tvm.nd.array(np.zeros([M, N // lanes, lanes], dtype=out_dtype), ctx)
+        func(tvm.nd.array(a_np, ctx), tvm.nd.array(np.ascontiguousarray(packed), ctx), c_tvm)
+        np.testing.assert_allclose(
+            c_tvm.asnumpy().reshape(M, N), expected, rtol=1e-5, atol=1e-5)
+        print("%s matches numpy on %s" % (name, target))
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
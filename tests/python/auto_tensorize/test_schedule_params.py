@@ -152,7 +152,285 @@ def test4():
         print(params.to_json())
         schedule_gen.feedback(params, np.random.random())
         print(schedule_gen.score_table)
- 
+
+
+@register_test
+def test5():
+    print("##################################")
+    print("Test 5")
+    # factors of a sibling mapping with a different extent
+    split_generator = at.SplitFactorGenerator(512, 4)
+    ret, d = split_generator.closest([2, 4, 16, 8])
+    print("closest:", ret)
+    assert d == -1
+    assert ret == [1, 4, 16, 8]
+    ret, d = split_generator.closest([1, 4, 16, 8])
+    assert ret == [1, 4, 16, 8]
+    generator = at.UnrollStepGenerator([16, 64, 512, 1500])
+    assert generator.closest(1024)[0] == 1500
+    assert generator.closest(100)[0] == 64
+
+
+@register_test
+def test6():
+    print("##################################")
+    print("Test 6")
+
+    def walk():
+        split_generator = at.SplitFactorGenerator(1024, 4)
+        ret, d = split_generator.get()
+        trace = [ret]
+        for i in range(20):
+            ret, d = split_generator.get(hint=ret)
+            trace.append(ret)
+        return trace
+
+    with at.rng_scope(2021):
+        first = walk()
+    with at.rng_scope(2021):
+        second = walk()
+    print(first)
+    assert first == second
+
+
+@register_test
+def test7():
+    print("##################################")
+    print("Test 7")
+    import tempfile
+    from tvm import auto_scheduler
+
+    cache_dir = tempfile.mkdtemp()
+    cache = at.BuildCache(cache_dir)
+    assert cache.get_costs("key") is None
+    res = auto_scheduler.measure.MeasureResult([1e-3, 2e-3], 0, None, 0, 0)
+    cache.add_costs("key", res)
+    failed = auto_scheduler.measure.MeasureResult([1e10], 4, None, 0, 0)
+    cache.add_costs("failed", failed)
+    # a restarted search sees the measured costs
+    cache = at.BuildCache(cache_dir)
+    assert cache.get_costs("failed") is None
+    costs = [x.value for x in cache.make_result("key").costs]
+    print(costs)
+    assert np.allclose(costs, [1e-3, 2e-3])
+    print(cache.summary())
+    # costs are not shared across devices or measure options
+    key = at.BuildCache.cost_key("key", at.MeasureOptions(number=10))
+    assert key == at.BuildCache.cost_key("key", at.MeasureOptions(number=10))
+    for other in [
+        at.MeasureOptions(number=20),
+        at.MeasureOptions(number=10, min_repeat_ms=500),
+        at.MeasureOptions(number=10, dev_id=1),
+        at.MeasureOptions(number=10, use_rpc=True, key="android"),
+    ]:
+        assert at.BuildCache.cost_key("key", other) != key
+
+
+class ToyRecord(object):
+    def __init__(self, spatial_factors):
+        self.spatial_factors = spatial_factors
+
+    def to_json(self):
+        return {"spatial_factors": [x[0] for x in self.spatial_factors]}
+
+    def __str__(self):
+        return str([x[0] for x in self.spatial_factors])
+
+
+class ToyScheduleGenerator(at.AcceleratorScheduleGenerator):
+    """one split per spatial axis, records with an inner factor
+    above max_inner are invalid"""
+    def __init__(self, extents, max_inner=None, **kwargs):
+        super(ToyScheduleGenerator, self).__init__(
+            0.0, ToyRecord, log_file="", verbose_init=False)
+        self.spatial_splits = [at.SplitFactorGenerator(x, 2) for x in extents]
+        self.max_inner = max_inner
+        self.sc_info = at.ScheduleComputeInfo(None, None, None, 0, 0, None, **kwargs)
+
+    def get_schedule_compute_info(self):
+        return self.sc_info
+
+    def translate_record(self, record):
+        return ToyRecord(self.translate_splits(self.spatial_splits, record.spatial_factors))
+
+    def get_record(self, entry=None, policy="random"):
+        return ToyRecord([gen.get() for gen in self.spatial_splits])
+
+    def valid(self, record):
+        if self.max_inner is None:
+            return True
+        return all(x[0][-1] <= self.max_inner for x in record.spatial_factors)
+
+
+@register_test
+def test8():
+    print("##################################")
+    print("Test 8")
+    # seed a mapping with one more outer axis from the best records of a sibling
+    sibling = ToyScheduleGenerator([64, 32], layout="nchw")
+    sibling.feedback(ToyRecord([([8, 8], -1), ([4, 8], -1)]), 3.0, False)
+    sibling.feedback(ToyRecord([([64, 1], -1), ([32, 1], -1)]), 1.0, False)
+    sibling.feedback(ToyRecord([([16, 4], -1), ([2, 16], -1)]), 2.0, False)
+
+    gen = ToyScheduleGenerator([128, 16, 32], layout="nchw")
+    assert gen.seed_from(sibling, sibling.get_schedule_compute_info(), k=2) == 2
+    best, second = gen.seeds
+    # aligned from the innermost axis, the outermost one has no counterpart
+    assert best.spatial_factors[2][0] == [4, 8]
+    assert best.spatial_factors[1][0] == [2, 8]
+    assert second.spatial_factors[2][0] == [2, 16]
+    assert second.spatial_factors[1][0] == [16, 1]
+    assert gen.spatial_splits[0].valid(
+        gen.spatial_splits[0].map_to_hidden(best.spatial_factors[0][0]))
+
+    # records of another tiling structure are not translated
+    other = ToyScheduleGenerator([128, 16, 32], layout="nhwc")
+    assert other.seed_from(sibling, sibling.get_schedule_compute_info()) == 0
+    assert not other.seeds
+
+
+@register_test
+def test9():
+    print("##################################")
+    print("Test 9")
+    # seeds are yielded before the search, duplicates and invalid ones are skipped
+    gen = ToyScheduleGenerator([64, 32], max_inner=8)
+    first = ToyRecord([([8, 8], -1), ([4, 8], -1)])
+    duplicate = ToyRecord([([8, 8], -1), ([4, 8], -1)])
+    invalid = ToyRecord([([4, 16], -1), ([4, 8], -1)])
+    second = ToyRecord([([16, 4], -1), ([8, 4], -1)])
+    gen.add_seeds([first, duplicate, invalid, second])
+    assert gen.get_next() is first
+    assert gen.get_next() is second
+    assert not gen.seeds
+    assert str(invalid) not in gen.visited
+    # then the search goes on without repeating the seeds
+    for i in range(5):
+        record = gen.get_next()
+        assert str(record) not in (str(first), str(second))
+        assert gen.valid(record)
+
+
+@register_test
+def test10():
+    print("##################################")
+    print("Test 10")
+    # the trace holds the candidates of the last search only
+    import os
+    import tempfile
+    from types import SimpleNamespace
+
+    def builder(schedule_app, params_lst, measure_opt, checker, n_parallel=1):
+        return params_lst
+
+    def runner(build_results, measure_opt, n_parallel=1):
+        return [SimpleNamespace(costs=[SimpleNamespace(value=1e-3)]) for _ in build_results]
+
+    trace_file = os.path.join(tempfile.mkdtemp(), "mapping.log.trace")
+    for run in range(2):
+        search = at.find_optimized_parameters_v2(
+            None, ToyScheduleGenerator([64, 32]), None, SimpleNamespace(use_rpc=False),
+            None, 4, search_group_size=2, builder=builder, runner=runner,
+            trace_file=trace_file)
+        next(search)
+        search.close()
+        with open(trace_file) as fin:
+            assert len(fin.readlines()) == 4
+
+
+@register_test
+def test11():
+    print("##################################")
+    print("Test 11")
+    # te schedules built in parallel and run one by one on llvm
+    def vector_add(n):
+        A = tvm.te.placeholder([n], name="A")
+        B = tvm.te.placeholder([n], name="B")
+        C = tvm.te.compute([n], lambda i: A[i] + B[i], name="C")
+        return tvm.te.create_schedule(C.op), [A, B, C]
+
+    small_sch, small_args = vector_add(64)
+    large_sch, large_args = vector_add(1 << 22)
+    broken_sch, broken_args = vector_add(64)
+    # B is not an argument, the build fails
+    broken_args = [broken_args[0], broken_args[2]]
+    measure_opt = at.MeasureOptions(target="llvm", number=10, min_repeat_ms=0, verbose=0)
+    costs = at.build_and_run_schedules(
+        [large_sch, broken_sch, small_sch],
+        [large_args, broken_args, small_args],
+        measure_opt,
+        n_parallel=2,
+    )
+    print(costs)
+    assert len(costs) == 3
+    assert costs[1] == at.MAX_FLOAT
+    # in ms, a 16MB add takes well above a microsecond and below a second
+    assert 1e-3 < costs[0] < 1e3
+    assert 0 < costs[2] < costs[0]
+
+
+class KeyedBuildCache(at.BuildCache):
+    """params are the cache keys, nothing is lowered"""
+    def lower(self, sch_app, params, target):
+        return params, []
+
+
+@register_test
+def test12():
+    print("##################################")
+    print("Test 12")
+    # cached_build_and_run skips the builds and the runs it has seen
+    import os
+    import tempfile
+    from tvm import auto_scheduler
+
+    costs = {"a": 1e-3, "b": 2e-3, "c": 3e-3}
+    built = []
+    runs = []
+
+    def builder(schedule_app, params_lst, measure_opt, checker, n_parallel=1):
+        built.append(list(params_lst))
+        results = []
+        for key in params_lst:
+            filename = os.path.join(tempfile.mkdtemp(), key + ".tar")
+            with open(filename, "w") as fout:
+                fout.write(key)
+            results.append(auto_scheduler.measure.BuildResult(filename, [], 0, None, 0))
+        return results
+
+    def runner(build_results, measure_opt, n_parallel=1):
+        runs.append(len(build_results))
+        keys = [os.path.basename(res.filename)[:-len(".tar")] for res in build_results]
+        return [auto_scheduler.measure.MeasureResult([costs[k]], 0, None, 0, 0) for k in keys]
+
+    def measure(cache, params_lst, measure_opt):
+        results = at.cached_build_and_run(
+            cache, builder, runner, None, params_lst, measure_opt, None)
+        return [x.costs[0].value for x in results]
+
+    cache_dir = tempfile.mkdtemp()
+    measure_opt = at.MeasureOptions(number=10)
+    # the duplicate in the batch is built and run once
+    cache = KeyedBuildCache(cache_dir)
+    assert np.allclose(measure(cache, ["a", "b", "a"], measure_opt), [1e-3, 2e-3, 1e-3])
+    assert built == [["a", "b"]] and runs == [2]
+    assert (cache.lookups, cache.build_hits, cache.run_hits) == (3, 1, 1)
+
+    # other measure options reuse the module of "a" but measure it again
+    cache = KeyedBuildCache(cache_dir)
+    assert np.allclose(measure(cache, ["a", "c"], at.MeasureOptions(number=20)), [1e-3, 3e-3])
+    assert built[-1] == ["c"] and runs[-1] == 2
+    assert (cache.lookups, cache.build_hits, cache.run_hits) == (2, 1, 0)
+
+    # cached costs skip both the builder and the runner
+    cache = KeyedBuildCache(cache_dir)
+    assert np.allclose(measure(cache, ["b", "a", "a"], measure_opt), [2e-3, 1e-3, 1e-3])
+    assert len(built) == 2 and len(runs) == 2
+    assert (cache.lookups, cache.build_hits, cache.run_hits) == (3, 3, 3)
+    print(cache.summary())
+    assert cache.summary() == (
+        "Build cache: 3 candidates, reused 3 builds (100.0%), 3 measurements (100.0%)")
+
 
 if __name__ == "__main__":
     import argparse
@@ -275,6 +275,39 @@ def test3():
     print("Pass!\n")
 
 
+@register_test
+def test4():
+    print("##########################")
+    print("Test 4")
+    from tvm.auto_tensorize.tensorization_phases.compute_transform import VMappingGenerator
+
+    def axis(name, extent):
+        return tvm.te.reduce_axis([0, extent], name=name)
+
+    ii, jj, kk = axis("ii", 16), axis("jj", 16), axis("kk", 16)
+    n, k, d, p, q = axis("n", 1), axis("k", 64), axis("d", 7), axis("p", 28), axis("q", 28)
+    rc, rd, rr, rs = axis("rc", 64), axis("rd", 3), axis("rr", 3), axis("rs", 3)
+    axis_map = {ii: [], jj: [], kk: []}
+    # conv3d: every spatial axis with every reduce axis
+    for x in [n, d, p, q]:
+        for y in [rc, rd, rr, rs]:
+            axis_map[ii].append(x)
+            axis_map[jj].append(k)
+            axis_map[kk].append(y)
+    # the lazy enumeration finds the same mappings as the exhaustive one
+    exhaustive = VMappingGenerator(axis_map, exhaustive_limit=16)
+    lazy = VMappingGenerator(axis_map, exhaustive_limit=0)
+    assert len(lazy.vmaps) == len(exhaustive.vmaps) == 15 * 15
+    assert set([lazy.merge(x) for x in lazy.vmaps]) == set(
+        [exhaustive.merge(x) for x in exhaustive.vmaps]
+    )
+    # ordered by padding efficiency
+    scores = [lazy.score(lazy.merge(x)) for x in lazy.vmaps]
+    assert scores == sorted(scores, reverse=True)
+    assert len(VMappingGenerator(axis_map, exhaustive_limit=0, max_mappings=10).vmaps) == 10
+    print("Pass!\n")
+
+
 if __name__ == "__main__":
     import argparse
 
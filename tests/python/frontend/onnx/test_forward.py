@@ -992,6 +992,61 @@ def test_matmul():
         tvm.testing.assert_allclose(out_np, tvm_out, rtol=1e-5, atol=1e-5)
 
 
+def test_lazy_params_external_data():
+    from onnx.external_data_helper import convert_model_to_external_data
+    from tvm.contrib import util
+
+    a_shape, b_shape = (4, 64), (64, 32)
+    a_array = np.random.uniform(size=a_shape).astype("float32")
+    b_array = np.random.uniform(size=b_shape).astype("float32")
+    c_array = np.random.uniform(size=(b_shape[1],)).astype("float32")
+    out_np = np.matmul(a_array, b_array) + c_array
+
+    graph = helper.make_graph(
+        [
+            helper.make_node("MatMul", ["a", "b"], ["ab"]),
+            helper.make_node("Add", ["ab", "c"], ["out"]),
+        ],
+        "lazy_params_test",
+        inputs=[helper.make_tensor_value_info("a", TensorProto.FLOAT, list(a_shape))],
+        outputs=[helper.make_tensor_value_info("out", TensorProto.FLOAT, list(out_np.shape))],
+        initializer=[
+            helper.make_tensor("b", TensorProto.FLOAT, b_shape, b_array.tobytes(), raw=True),
+            helper.make_tensor("c", TensorProto.FLOAT, c_array.shape, c_array.tobytes(), raw=True),
+        ],
+    )
+    model = helper.make_model(graph, producer_name="lazy_params_test")
+    temp = util.tempdir()
+    convert_model_to_external_data(
+        model, all_tensors_to_one_file=True, location="weights.bin", size_threshold=0
+    )
+    onnx.save_model(model, temp.relpath("model.onnx"))
+
+    mod, params = relay.frontend.from_onnx(
+        temp.relpath("model.onnx"), {"a": a_shape}, lazy_params=True
+    )
+    assert all(isinstance(v, relay.LazyParam) for v in params.values())
+    assert params["b"].shape == b_shape and params["b"].dtype == "float32"
+    # the weights are mapped from the external data file
+    assert isinstance(params["b"]._loader(), np.memmap)
+    tvm.testing.assert_allclose(params["b"].asnumpy(), b_array)
+
+    with tvm.transform.PassContext(opt_level=1):
+        lib = relay.build(mod, "llvm", params=params)
+    m = graph_runtime.GraphModule(lib["default"](tvm.cpu(0)))
+    m.run(a=a_array)
+    tvm.testing.assert_allclose(m.get_output(0).asnumpy(), out_np, rtol=1e-5, atol=1e-5)
+
+    # lazy embedded data and freezing
+    model = helper.make_model(graph, producer_name="lazy_params_test")
+    mod, params = relay.frontend.from_onnx(
+        model, {"a": a_shape}, lazy_params=True, freeze_params=True
+    )
+    assert not params
+    ex = relay.create_executor("graph", mod=mod, ctx=tvm.cpu(0), target="llvm")
+    tvm.testing.assert_allclose(ex.evaluate()(a_array).asnumpy(), out_np, rtol=1e-5, atol=1e-5)
+
+
 def verify_batch_matmul(a_shape, b_shape, target, ctx):
     a_array = np.random.uniform(size=a_shape).astype("float32")
     b_array = np.random.uniform(size=b_shape).astype("float32")
@@ -3730,3 +3785,4 @@ if __name__ == "__main__":
     test_xor()
     test_max_roi_pool()
     test_roi_align()
+    test_lazy_params_external_data()
@@ -3330,6 +3330,43 @@ def test_convert_torch_script_with_input_types():
     assert tvm.ir.structural_equal(expected_mod, mod["main"], map_free_vars=True)
 
 
+def test_lazy_params():
+    torch.set_grad_enabled(False)
+    model = torch.nn.Sequential(
+        torch.nn.Conv2d(3, 8, 3, padding=1),
+        torch.nn.ReLU(),
+        torch.nn.Flatten(),
+        torch.nn.Linear(8 * 8 * 8, 10),
+    ).eval()
+    input_data = torch.rand([1, 3, 8, 8])
+    trace = torch.jit.trace(model, input_data)
+    input_infos = [("input0", (list(input_data.shape), "float32"))]
+
+    def run(params, mod):
+        with tvm.transform.PassContext(opt_level=3):
+            lib = relay.build(mod, "llvm", params=params)
+        m = graph_runtime.GraphModule(lib["default"](tvm.cpu(0)))
+        m.set_input("input0", tvm.nd.array(input_data.numpy()))
+        m.run()
+        return m.get_output(0).asnumpy()
+
+    mod, params = relay.frontend.from_pytorch(trace, input_infos)
+    assert all(isinstance(v, tvm.nd.NDArray) for v in params.values())
+    eager_out = run(params, mod)
+
+    lazy_mod, lazy_params = relay.frontend.from_pytorch(trace, input_infos, lazy_params=True)
+    assert sorted(lazy_params.keys()) == sorted(params.keys())
+    for k, v in lazy_params.items():
+        assert isinstance(v, relay.LazyParam)
+        assert v.shape == params[k].shape and v.dtype == params[k].dtype
+        tvm.testing.assert_allclose(v.asnumpy(), params[k].asnumpy())
+    assert tvm.ir.structural_equal(mod["main"], lazy_mod["main"])
+    lazy_out = run(lazy_params, lazy_mod)
+
+    tvm.testing.assert_allclose(lazy_out, eager_out, rtol=1e-5, atol=1e-5)
+    tvm.testing.assert_allclose(eager_out, model(input_data).numpy(), rtol=1e-5, atol=1e-5)
+
+
 if __name__ == "__main__":
     # some structural tests
     test_forward_traced_function()
@@ -3493,3 +3530,6 @@ if __name__ == "__main__":
 
     # Test convert torch script(jit) with specific inputs' types
     test_convert_torch_script_with_input_types()
+
+    # Lazy params
+    test_lazy_params()
@@ -155,6 +155,7 @@ def run_tvm_graph(
     target="llvm",
     out_names=None,
     mode="graph_runtime",
+    lazy_params=False,
 ):
     """ Generic function to compile on relay and execute on tvm """
     # TFLite.Model.Model has changed to TFLite.Model from 1.14 to 2.1
@@ -179,8 +180,10 @@ def run_tvm_graph(
         dtype_dict[e] = input_data[i].dtype.name
 
     mod, params = relay.frontend.from_tflite(
-        tflite_model, shape_dict=shape_dict, dtype_dict=dtype_dict
+        tflite_model, shape_dict=shape_dict, dtype_dict=dtype_dict, lazy_params=lazy_params
     )
+    if lazy_params:
+        assert params and all(isinstance(v, relay.LazyParam) for v in params.values())
 
     if mode in ["debug", "vm"]:
         ex = relay.create_executor(mode, mod=mod, ctx=tvm.cpu(), target="llvm")
@@ -3229,6 +3232,33 @@ def test_forward_fully_connected():
         _test_fully_connected([5, 1, 1, 150], const_input, [150, 100], [100])
 
 
+#######################################################################
+# Lazy params
+# -----------
+
+
+def test_forward_lazy_params():
+    """ Weights imported as LazyParam give the same results """
+    data_array = np.random.uniform(size=[2, 150]).astype(np.float32)
+    filter_array = np.random.uniform(size=[150, 100]).astype(np.float32)
+    bias_array = np.random.uniform(size=[100]).astype(np.float32)
+
+    with tf.Graph().as_default():
+        in_data = array_ops.placeholder(shape=data_array.shape, dtype=np.float32, name="input")
+        in_filter = constant_op.constant(filter_array, dtype=np.float32)
+        in_bias = constant_op.constant(bias_array, dtype=np.float32)
+        out = nn_ops.bias_add(math_ops.mat_mul(in_data, in_filter), in_bias)
+        with tf.Session() as sess:
+            converter = tf.lite.TFLiteConverter.from_session(sess, [in_data], [out])
+            tflite_model_buf = converter.convert()
+
+    tflite_output = run_tflite_graph(tflite_model_buf, data_array)
+    eager_output = run_tvm_graph(tflite_model_buf, data_array, "input")
+    lazy_output = run_tvm_graph(tflite_model_buf, data_array, "input", lazy_params=True)
+    tvm.testing.assert_allclose(lazy_output[0], eager_output[0], rtol=1e-5, atol=1e-5)
+    tvm.testing.assert_allclose(tflite_output[0], lazy_output[0], rtol=1e-5, atol=1e-5)
+
+
 #######################################################################
 # REVERSE_V2
 # ----------
@@ -3926,6 +3956,7 @@ if __name__ == "__main__":
     test_forward_log_softmax()
     test_forward_prelu()
     test_forward_fully_connected()
+    test_forward_lazy_params()
     test_forward_l2_normalization()
     test_forward_local_response_normalization()
 
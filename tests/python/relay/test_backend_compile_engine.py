@@ -14,6 +14,9 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
+import os
+import shutil
 import numpy as np
 import tvm
 from tvm import te
@@ -259,6 +262,77 @@ def test_compile_nhwc_pack():
     relay.build(mod, target="llvm")
 
 
+def test_compile_cache():
+    from tvm.contrib import util, graph_runtime
+    from tvm.relay.backend import compile_engine
+
+    x = relay.var("x", shape=(2, 8))
+    w = relay.var("w", shape=(4, 8))
+    y = relay.nn.relu(relay.nn.dense(x, w))
+    z = relay.exp(relay.sigmoid(y)) + relay.const(1.0)
+    mod = tvm.IRModule.from_expr(relay.Function([x, w], z))
+    x_np = np.random.uniform(size=(2, 8)).astype("float32")
+    w_np = np.random.uniform(size=(4, 8)).astype("float32")
+    ref = np.exp(1 / (1 + np.exp(-np.maximum(x_np.dot(w_np.T), 0)))) + 1
+
+    def run(lib):
+        m = graph_runtime.GraphModule(lib["default"](tvm.cpu()))
+        m.run(x=x_np, w=w_np)
+        tvm.testing.assert_allclose(m.get_output(0).asnumpy(), ref, rtol=1e-5)
+
+    temp = util.tempdir()
+    with compile_engine.CompileCache(temp.temp_dir) as cache:
+        run(relay.build(mod, target="llvm"))
+        assert cache.hit_ct == 0 and cache.miss_ct > 0
+        assert cache.build_miss_ct == 1
+        (build_key,) = [x for x in os.listdir(temp.temp_dir) if x.endswith(".build")]
+        with open(os.path.join(temp.temp_dir, build_key, "entry.json")) as fin:
+            configs = json.load(fin)["configs"]
+        # the dense templates asked the dispatch context for their configs
+        assert any("dense" in str(workload) for _, workload, _ in configs)
+
+        # an unchanged model is not built again
+        lowered = cache.miss_ct
+        run(relay.build(mod, target="llvm"))
+        assert cache.build_hit_ct == 1
+        assert cache.hit_ct == 0 and cache.miss_ct == lowered
+
+        # other AutoTVM configs invalidate the built module
+        with autotvm.task.ApplyConfig(autotvm.task.space.ConfigEntity(0, "", {}, [])):
+            assert cache.load_build(build_key, mod) is None
+
+        # without the built module, the fused functions are lowered from the cache
+        shutil.rmtree(os.path.join(temp.temp_dir, build_key))
+        run(relay.build(mod, target="llvm"))
+        assert cache.hit_ct == lowered and cache.miss_ct == lowered
+    assert compile_engine.get_compile_cache() is None
+
+    # parallel lowering, with and without a compile cache
+    run(relay.build(mod, target="llvm", n_parallel=2))
+    with compile_engine.CompileCache(util.tempdir().temp_dir) as cache:
+        run(relay.build(mod, target="llvm", n_parallel=2))
+        assert cache.hit_ct > 0
+
+
+def test_lower_parallel():
+    from tvm.relay.backend import compile_engine
+
+    funcs = []
+    for n in [4, 8, 16]:
+        x = relay.var("x", shape=(n,))
+        f = relay.Function([x], relay.exp(x) + relay.const(1.0))
+        funcs.append(run_infer_type(f).with_attr("Primitive", tvm.tir.IntImm("int32", 1)))
+
+    engine = relay.backend.compile_engine.get()
+    engine.clear()
+    cached = engine.lower_parallel(funcs, "llvm", n_parallel=2)
+    assert len(cached) == len(funcs)
+    assert len(set(c.func_name for c in cached)) == len(funcs)
+    assert len(engine.items()) == len(funcs)
+    # the compile cache is only enabled during lower_parallel
+    assert compile_engine.get_compile_cache() is None
+
+
 if __name__ == "__main__":
     test_get_valid_implementations()
     test_select_implementation()
@@ -268,3 +342,5 @@ if __name__ == "__main__":
     test_compile_tuple_dup()
     test_compile_full()
     test_compile_nhwc_pack()
+    test_compile_cache()
+    test_lower_parallel()
@@ -0,0 +1,90 @@
+import os
+import json
+import tempfile
+from types import SimpleNamespace
+
+from tvm import auto_tensorize as at
+from tvm.tensor_graph.core.auto_schedule import report
+from tvm.tensor_graph.core.auto_schedule.report import make_subgraph_report, dump_subgraph_report
+
+
+class StubContext(object):
+  """a scheduler context the report must only read"""
+  def __init__(self, total_trials):
+    self.total_trials = total_trials
+
+  def get_best_schedule(self):
+    raise AssertionError("the report must not query the scheduler")
+
+
+def stub_multi_graph_ctx():
+  # tag: (tid, count, last cost, mapped by AMOS)
+  tasks = {"conv": (0, 4, 2.0, True), "relu": (1, 8, 0.1, False), "fc": (2, 1, at.MAX_FLOAT, True)}
+  return SimpleNamespace(
+    measure_option=SimpleNamespace(target="cuda"),
+    tir_multi_graph=None,
+    scheduler_option="auto_tensorize_v3",
+    graph_tag_to_tid={tag: v[0] for tag, v in tasks.items()},
+    contexts={v[0]: StubContext(10 * v[0]) for v in tasks.values()},
+    subgraph_count={tag: v[1] for tag, v in tasks.items()},
+    # an older cost stays in C, the trace holds the last round
+    performance_trace={v[0]: [v[2]] for v in tasks.values()},
+    C={v[0]: 100.0 for v in tasks.values()},
+    use_at_set=set([tag for tag, v in tasks.items() if v[3]]),
+  )
+
+
+def run_report(**kwargs):
+  gflop = {"conv": 2.0, "relu": 0.01, "fc": 0.5}
+  saved = report.unique_subgraph_gflop
+  report.unique_subgraph_gflop = lambda tir_multi_graph: gflop
+  try:
+    return make_subgraph_report(
+      stub_multi_graph_ctx(), hd_config=SimpleNamespace(peak_gflops=1000.0), **kwargs)
+  finally:
+    report.unique_subgraph_gflop = saved
+
+
+def test_rank_from_trace():
+  rows = run_report()
+  assert [x["tag"] for x in rows] == ["fc", "conv", "relu"]
+  by_tag = {x["tag"]: x for x in rows}
+  assert by_tag["conv"]["latency_ms"] == 2.0
+  assert by_tag["conv"]["total_ms"] == 8.0
+  assert abs(by_tag["conv"]["contribution"] - 8.0 / 8.8) < 1e-6
+  assert abs(by_tag["conv"]["gflops"] - 1000.0) < 1e-6
+  assert abs(by_tag["conv"]["peak_ratio"] - 1.0) < 1e-6
+  # an unschedulable subgraph ranks first but contributes nothing
+  assert by_tag["fc"]["contribution"] == 0.0 and by_tag["fc"]["gflops"] == 0.0
+  assert by_tag["conv"]["scheduler"] == "AMOS"
+  assert by_tag["relu"]["scheduler"] == "TG"
+  assert [x["rank"] for x in rows] == [1, 2, 3]
+  print("Success!")
+
+
+def test_evaluate_result_overrides():
+  result = at.GraphEvaluateResult(9.0, {}, {"relu": (8, 1.0)}, 0)
+  by_tag = {x["tag"]: x for x in run_report(evaluate_result=result)}
+  assert by_tag["relu"]["latency_ms"] == 1.0
+  assert by_tag["conv"]["latency_ms"] == 2.0
+  print("Success!")
+
+
+def test_dump():
+  rows = run_report()
+  with tempfile.TemporaryDirectory() as tmp:
+    dump_subgraph_report(rows, os.path.join(tmp, "report.json"))
+    with open(os.path.join(tmp, "report.json")) as fin:
+      assert json.load(fin) == rows
+    dump_subgraph_report(rows, os.path.join(tmp, "report.csv"))
+    with open(os.path.join(tmp, "report.csv")) as fin:
+      lines = fin.read().splitlines()
+    assert lines[0].split(",") == report.REPORT_FIELDS
+    assert len(lines) == 1 + len(rows)
+  print("Success!")
+
+
+if __name__ == "__main__":
+  test_rank_from_trace()
+  test_evaluate_result_overrides()
+  test_dump()
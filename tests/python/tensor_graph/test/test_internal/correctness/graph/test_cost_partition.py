@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import tvm
+import tvm._ffi
+from tvm.tensor_graph.core import (
+  CostDrivenPartitionPolicy, use_partition_policy, partition_policy_scope)
+from tvm.tensor_graph.core.con_graph import partition_policy
+
+
+def small_graph():
+  """pad -> conv1d -> relu, with a scale feeding the relu elementwise"""
+  data = tvm.te.placeholder([1, 16, 64], name="data")
+  weight = tvm.te.placeholder([32, 16, 3], name="weight")
+  pad = tvm.te.compute(
+    [1, 16, 66],
+    lambda b, c, w: tvm.tir.if_then_else(
+      tvm.tir.all(w >= 1, w < 65), data[b, c, w - 1], tvm.tir.const(0, data.dtype)),
+    name="pad")
+  rc = tvm.te.reduce_axis([0, 16], name="rc")
+  rw = tvm.te.reduce_axis([0, 3], name="rw")
+  conv = tvm.te.compute(
+    [1, 32, 64],
+    lambda b, k, w: tvm.te.sum(pad[b, rc, w + rw] * weight[k, rc, rw], axis=[rc, rw]),
+    name="conv")
+  scale = tvm.te.compute([1, 32, 64], lambda b, k, w: conv[b, k, w] * 2.0, name="scale")
+  relu = tvm.te.compute(
+    [1, 32, 64], lambda b, k, w: tvm.te.max(scale[b, k, w], 0.0), name="relu")
+  return pad.op, conv.op, scale.op, relu.op
+
+
+def fake_graph(ops):
+  """the operation_stat_dict the C++ partition passes to the policy"""
+  stats = {}
+  for op in ops:
+    reductive = len(op.reduce_axis) > 0
+    stats[op] = SimpleNamespace(
+      must_compute_root=False, num_consumers=1, reductive=reductive, injective=not reductive)
+  return SimpleNamespace(operation_stat_dict=stats)
+
+
+def hd_config(gflops, bandwidth):
+  return SimpleNamespace(peak_gflops=gflops, peak_bandwidth_gbs=bandwidth)
+
+
+def test1():
+  """the structural rules agree with the default partition_policy"""
+  pad, conv, scale, relu = small_graph()
+  graph = fake_graph([pad, conv, scale, relu])
+  policy = CostDrivenPartitionPolicy(target="cuda")
+  for pre, post in [(conv, scale), (pad, conv), (scale, relu)]:
+    if partition_policy(graph, pre, post, 1):
+      assert policy(graph, pre, post, 1)
+  # reduction and its epilogue stay apart unless asked for
+  assert policy(graph, conv, scale, 1)
+  assert not CostDrivenPartitionPolicy(target="cuda", fuse_epilogue=True)(
+    graph, conv, scale, 1)
+  graph.operation_stat_dict[scale].num_consumers = 2
+  assert policy(graph, scale, relu, 1)
+  assert policy(graph, pad, conv, policy.max_subgraph_ops)
+  assert policy.stats[1] > 0
+  print("Success!")
+
+
+def test2():
+  """the static estimate splits when recomputing the producer costs more than its traffic"""
+  pad, conv, scale, relu = small_graph()
+  graph = fake_graph([pad, conv, scale, relu])
+  # the conv reads each element of pad about 93 times
+  compute_bound = CostDrivenPartitionPolicy(hd_config=hd_config(1e-6, 1e6))
+  memory_bound = CostDrivenPartitionPolicy(hd_config=hd_config(1e6, 1e-6))
+  compute_bound.gflop_cache[pad] = memory_bound.gflop_cache[pad] = 1.0
+  assert compute_bound(graph, pad, conv, 1)
+  assert not memory_bound(graph, pad, conv, 1)
+  # one read per element, nothing is recomputed and fusing always helps
+  assert not compute_bound(graph, scale, relu, 1)
+  assert compute_bound.stats == [1, 1]
+  print("Success!")
+
+
+def test3():
+  """latency_fn overrides the static estimate"""
+  pad, conv, scale, relu = small_graph()
+  graph = fake_graph([pad, conv, scale, relu])
+  graph.operation_key_dict = {op: SimpleNamespace(key=op.name) for op in [scale, relu]}
+  latency = {("scale",): 1.0, ("relu",): 1.0, ("scale", "relu"): 3.0}
+  policy = CostDrivenPartitionPolicy(
+    hd_config=hd_config(1e6, 1e-6), latency_fn=lambda ops: latency[tuple(op.name for op in ops)])
+  assert policy(graph, scale, relu, 1)
+  assert len(policy.latency_cache) == 3
+  print("Success!")
+
+
+def test4():
+  """the scope restores the policy that was active before it"""
+  marker = lambda graph, pre, post, number: number + 1
+  use_partition_policy(marker)
+  try:
+    with partition_policy_scope("cost", target="llvm") as installed:
+      assert isinstance(installed, CostDrivenPartitionPolicy)
+    active = tvm._ffi.get_global_func("tg.graph.partition_policy")
+    assert active(None, None, None, 41) == 42
+  finally:
+    use_partition_policy("default")
+  print("Success!")
+
+
+if __name__ == "__main__":
+  test1()
+  test2()
+  test3()
+  test4()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import numpy as np
+
+from tvm.tensor_graph.core.replay_buffer import ReplayBuffer
+
+
+def test_reservoir():
+  buf = ReplayBuffer(100, rng=np.random.RandomState(0))
+  for i in range(1000):
+    buf.add([i, 2 * i, 1.0])
+  assert len(buf) == 100
+  assert buf.seen == 1000
+  # a uniform sample over [0, 1000) should not be stuck at the head
+  assert buf.view()[:, 0].max() > 500
+  view = buf.view()
+  view[0, 2] = 5.0
+  assert buf.data[0, 2] == 5.0
+  assert sum([len(x) for x in buf.batches(30, limit=70)]) == 70
+  print("Success!")
+
+
+def test_ring():
+  buf = ReplayBuffer(3, policy="ring")
+  for i in range(5):
+    buf.add([i])
+  assert sorted(buf.view()[:, 0].tolist()) == [2, 3, 4]
+  print("Success!")
+
+
+def test_object_entries():
+  buf = ReplayBuffer(5, dtype="object")
+  for i in range(20):
+    buf.add({"evaluation": i})
+  assert len(buf) == 5
+  assert all([isinstance(x, dict) for x in buf.view()])
+  print("Success!")
+
+
+def test_mmap_round_trip():
+  with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "base.npy")
+    buf = ReplayBuffer(10)
+    for i in range(4):
+      buf.add([i, i, i])
+    buf.to_path(path)
+
+    loaded = ReplayBuffer(10)
+    loaded.from_path(path)
+    assert isinstance(loaded.data, np.memmap)
+    assert np.allclose(loaded.view(), buf.view())
+    loaded.add([9, 9, 9])
+    loaded.to_path(path)
+    del loaded
+
+    again = ReplayBuffer(10)
+    again.from_path(path)
+    assert len(again) == 5
+    assert again.view()[-1, 0] == 9
+    del again
+  print("Success!")
+
+
+if __name__ == "__main__":
+  test_reservoir()
+  test_ring()
+  test_object_entries()
+  test_mmap_round_trip()
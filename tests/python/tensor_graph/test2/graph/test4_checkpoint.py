@@ -0,0 +1,120 @@
+import tvm
+import json
+from collections import OrderedDict
+
+from tvm.tensor_graph.core2.graph.concrete import FloatTensor
+from tvm.tensor_graph.core2.nn import module as nn
+from tvm.tensor_graph.core2.graph.graph import make_backward
+from tvm.tensor_graph.core2.graph.checkpoint import (
+    RecomputePlanner, CheckpointCandidate, plan_recomputation)
+from tvm.tensor_graph.core2.nn import optim
+import models as M
+
+
+TEST_CASES = OrderedDict()
+
+
+def register_test(func):
+    name = func.__name__
+    prefix = "test"
+    assert name[:len(prefix)] == prefix
+    try:
+        number = int(name[len(prefix):])
+        def _inner(*args, **kwargs):
+            print(func.__doc__)
+            func(*args, **kwargs)
+        assert number not in TEST_CASES, "Repeated test case number %d" % number
+        TEST_CASES[number] = _inner
+    except ValueError as e:
+        print(e)
+        print("Can't convert to number", name[len(prefix):])
+
+
+def tradeoff(model, image_shape, num_classes):
+    inputs = FloatTensor(image_shape, name="data")
+    weights = list(model.weights)
+    mse_loss = nn.MSELoss()
+    labels = FloatTensor([image_shape[0], num_classes], name="label")
+    opt = optim.NaiveSGD(weights, lr=0.1)
+
+    def make_graph():
+        return make_backward(model, mse_loss, opt, inputs, labels)
+
+    planner = RecomputePlanner()
+    # recompute everything first, then keep half of the activations
+    graph, planner = plan_recomputation(make_graph, 0, planner=planner)
+    total = planner.total_bytes()
+    graph, planner = plan_recomputation(make_graph, total // 2, planner=planner)
+    assert len(planner.candidates) > 0
+    # layers share op names, each key stands for all of its instances
+    assert any([x.count > 1 for x in planner.candidates.values()])
+    assert total == sum([x.nbytes * x.count for x in planner.candidates.values()])
+    curve = planner.tradeoff_curve()
+    assert curve[0]["kept_bytes"] == 0
+    assert curve[-1]["kept_bytes"] == total
+    assert curve[-1]["recompute_gflop"] == 0.0
+    for point in curve:
+        assert point["kept_bytes"] <= point["budget"]
+    print(json.dumps(curve, indent=2))
+
+
+@register_test
+def test1():
+    """
+    ResNet-18 training, recompute trade-off curve
+    """
+    tradeoff(M.resnet18(num_classes=1000), [32, 3, 224, 224], 1000)
+
+
+@register_test
+def test2():
+    """
+    MobileNet-V1 training, recompute trade-off curve
+    """
+    tradeoff(M.mobilenet_v1(num_classes=1000), [32, 3, 224, 224], 1000)
+
+
+@register_test
+def test3():
+    """
+    Planner budget on hand made candidates
+    """
+    planner = RecomputePlanner()
+    for key, nbytes, gflop, count in [
+            ("relu", 100, 0.1, 4), ("bn", 300, 0.9, 3), ("pad", 50, 0.0, 2)]:
+        planner.candidates[key] = CheckpointCandidate(key, 0, 0, nbytes, gflop, count=count)
+    total = planner.total_bytes()
+    assert total == 100 * 4 + 300 * 3 + 50 * 2
+    for budget in range(0, total + 1, 70):
+        kept, gflop = planner.plan(budget)
+        assert kept <= budget
+        recomputed = sum([
+            planner.recompute_count[k] * c.gflop for k, c in planner.candidates.items()])
+        assert abs(gflop - recomputed) < 1e-9
+        for key, cand in planner.candidates.items():
+            assert 0 <= planner.recompute_count[key] <= cand.count
+    # "bn" costs the most gflop per byte and is kept first, the rest of
+    # the budget keeps one of the four "relu" and no free "pad"
+    kept, gflop = planner.plan(700)
+    assert planner.recompute_count == {"relu": 3, "bn": 1, "pad": 2}
+    assert kept == 700
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--case", help="test case", type=int, default=1)
+    parser.add_argument("--all", help="test all", action="store_true")
+
+    args = parser.parse_args()
+    if args.all:
+        for k, v in TEST_CASES.items():
+            print("############################################")
+            print("test", k)
+            v()
+            print("Pass!")
+    else:
+        assert args.case in TEST_CASES, "Can't find case %s." % (
+            str(args.case))
+        case = TEST_CASES[args.case]
+        case()
@@ -32,6 +32,8 @@ from tvm import relay
 from tvm.autotvm.task import ConfigEntity
 from tvm.autotvm.measure import MeasureResult, MeasureInput
 from tvm.autotvm.graph_tuner import DPTuner, PBQPTuner
+from tvm.autotvm.graph_tuner._base import INVALID_LAYOUT_TIME
+from tvm.contrib import util
 
 
 def _create_args(dshape, kshape, strides, padding, dilation, layout, out_layout, dtype, out_dtype):
@@ -188,6 +190,39 @@ def test_graph_tuner_layout_transform():
         )
 
 
+def test_graph_tuner_layout_transform_cache():
+    log_file = "%s/test_tuner.log" % (os.getcwd())
+    cache_file = util.tempdir().relpath("layout_transform.log")
+    target = "llvm"
+    dshape = (1, 3, 8, 8)
+    dtype = "float32"
+    layout = "NCHW"
+    conv2d = relay.op.get("nn.conv2d")
+    target_ops = [conv2d]
+
+    g, records, _, _, _ = _create_data(target, dshape, dtype, layout)
+    executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target, log_file=log_file)
+    executor.benchmark_layout_transform(min_exec_num=1, n_parallel=2, cache_file=cache_file)
+    measured = executor.layout_transform_perf_records
+    assert len(measured) > 0
+    assert len(list(autotvm.record.load_from_file(cache_file))) == len(measured)
+
+    # everything comes from the cache the second time
+    executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target, log_file=log_file)
+    executor.benchmark_layout_transform(min_exec_num=1, cache_file=cache_file)
+    for ltf_workload, (_, res) in executor.layout_transform_perf_records.items():
+        assert res.timestamp == measured[ltf_workload][1].timestamp
+    assert len(list(autotvm.record.load_from_file(cache_file))) == len(measured)
+
+    # tiny tensors are estimated
+    executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target, log_file=log_file)
+    executor.benchmark_layout_transform(estimate_below=1 << 20, estimate_bandwidth=1.0)
+    for ltf_workload, (_, res) in executor.layout_transform_perf_records.items():
+        assert res.timestamp == -1
+        elements = np.prod(ltf_workload[1][1])
+        assert res.costs[0] in [2 * elements * 4 / 1e9, INVALID_LAYOUT_TIME]
+
+
 def test_DPTuner_run():
     log_file = "%s/test_tuner.log" % (os.getcwd())
     target = "llvm"
@@ -735,6 +770,7 @@ def test_triangle_block():
 
 if __name__ == "__main__":
     test_graph_tuner_layout_transform()
+    test_graph_tuner_layout_transform_cache()
     test_DPTuner_run()
     test_PBQPTuner_run()
     test_many_sub_graphs()
@@ -17,13 +17,15 @@
 """test the correctness of dump and load of data log"""
 import time
 
+import numpy as np
+
 import tvm
 from tvm import te
 from tvm.contrib import util
 
 from tvm import autotvm
 from tvm.autotvm.measure import MeasureInput, MeasureResult, MeasureErrorNo
-from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key
+from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key, RecordIndex
 
 from test_autotvm_common import get_sample_task
 
@@ -87,7 +89,45 @@ def test_apply_history_best():
     assert str(x) == str(tsk.config_space.get(2))
 
 
+def test_indexed_history_best():
+    temp = util.tempdir()
+    file_path = temp.relpath("temp.log")
+    best_path = temp.relpath("temp.best.log")
+
+    tsk, target = get_sample_task()
+    costs = [0.1, 0.3, 0.01, 0.4, 0.01]
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(len(costs))]
+    results = [MeasureResult((c,), 0, 2.3, 0) for c in costs]
+    # failed records are ignored
+    inputs.append(MeasureInput(target, tsk, tsk.config_space.get(5)))
+    results.append(MeasureResult((0.001,), MeasureErrorNo.RUNTIME_DEVICE, 2.3, 0))
+
+    with open(file_path, "w") as fo:
+        cb = autotvm.callback.log_to_file(fo)
+        cb(None, inputs, results)
+
+    for n_parallel in [1, 2]:
+        assert len(list(autotvm.record.load_from_file(file_path, n_parallel=n_parallel))) == 6
+
+    hist_best = ApplyHistoryBest(file_path, use_index=True)
+    assert not hist_best.best_by_targetkey
+    x = hist_best.query(target, tsk.workload)
+    # the first of the equally best records is kept
+    assert str(x) == str(tsk.config_space.get(2))
+    assert len(hist_best.best_by_targetkey) == 1
+
+    index = RecordIndex.open(file_path)
+    assert isinstance(index.entries, np.memmap)
+    assert index.lookup("key", "cpu", ("missing",)) is None
+
+    autotvm.record.pick_best(file_path, best_path, n_parallel=2)
+    rows = list(autotvm.record.load_from_file(best_path))
+    assert len(rows) == 1
+    assert str(rows[0][0].config) == str(tsk.config_space.get(2))
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
     test_file_io()
+    test_indexed_history_best()
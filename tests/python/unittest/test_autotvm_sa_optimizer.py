@@ -0,0 +1,86 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""test the vectorized simulated annealing steps"""
+import numpy as np
+
+from tvm.autotvm.tuner.model_based_tuner import point2knob, points2knobs, knobs2points
+from tvm.autotvm.tuner.sa_model_optimizer import (
+    SimulatedAnnealingOptimizer,
+    random_walk_batch,
+    merge_topk,
+)
+
+from test_autotvm_common import get_sample_task
+
+
+def test_knob_conversion():
+    dims = [5, 1, 7, 3, 8]
+    points = np.random.randint(0, int(np.prod(dims)), 100)
+    knobs = points2knobs(points, dims)
+    for p, k in zip(points, knobs):
+        assert list(k) == point2knob(int(p), dims)
+    assert (knobs2points(knobs, dims) == points).all()
+
+
+def test_random_walk_batch():
+    dims = [5, 1, 7, 3, 8]
+    points = np.full(20000, 17)
+    new_points = random_walk_batch(points, dims)
+    changed = points2knobs(new_points, dims) != np.array(point2knob(17, dims))
+    # exactly one knob changes, never the knob with a single choice
+    assert (changed.sum(axis=1) == 1).all()
+    assert not changed[:, 1].any()
+    # knobs are chosen in proportion to (dim - 1) / dim
+    freq = changed.mean(axis=0)
+    weights = np.array([4 / 5, 0, 6 / 7, 2 / 3, 7 / 8])
+    assert np.allclose(freq, weights / weights.sum(), atol=0.02)
+
+    assert (random_walk_batch(points, [1, 1]) == points).all()
+
+
+def test_merge_topk():
+    top_scores = np.full(3, float("-inf"))
+    top_points = -1 - np.arange(3)
+    exclusive = np.array([4])
+    top_scores, top_points, modified = merge_topk(
+        top_scores, top_points, [1.0, 5.0, 3.0, 3.0, 9.0], [1, 2, 3, 3, 4], exclusive
+    )
+    assert modified
+    assert sorted(top_points.tolist()) == [1, 2, 3]
+    _, _, modified = merge_topk(top_scores, top_points, [0.5, 4.0], [7, 2], exclusive)
+    assert not modified
+
+
+def test_sa_optimizer():
+    task, _ = get_sample_task()
+
+    class Model(object):
+        def predict(self, xs):
+            return np.asarray(xs, dtype=np.float64)
+
+    opt = SimulatedAnnealingOptimizer(task, n_iter=50, parallel_size=16, log_interval=0)
+    ret = opt.find_maximums(Model(), 8, set([len(task.config_space) - 1]))
+    assert len(ret) == len(set(ret)) == 8
+    assert len(task.config_space) - 1 not in ret
+    assert ret == sorted(ret, reverse=True)
+
+
+if __name__ == "__main__":
+    test_knob_conversion()
+    test_random_walk_batch()
+    test_merge_topk()
+    test_sa_optimizer()
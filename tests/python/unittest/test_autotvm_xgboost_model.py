@@ -23,6 +23,8 @@ from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
 from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.autotvm.tuner.feature_store import FeatureStore
+from tvm.contrib import util
 
 from test_autotvm_common import get_sample_task, get_sample_records
 
@@ -51,6 +53,36 @@ def test_tuner():
     tuner.load_history(records)
 
 
+def test_feature_store():
+    task, target = get_sample_task()
+    records = get_sample_records(n=500)
+    path = util.tempdir().relpath("features")
+
+    model = XGBoostCostModel(task, "knob", "rank", feature_store=path)
+    assert model.fit_log(records, plan_size=32)
+    assert model.pool is not None
+    model._close_pool()
+
+    # another model of the same task reads all the features from the store
+    store = FeatureStore(path)
+    bucket = store.bucket(task.workload, target, "knob")
+    assert len(bucket) == 500
+    fea, flop = bucket.get(10)
+    assert np.allclose(fea, task.config_space.get(10).get_flatten_feature())
+    assert not np.isnan(flop)
+
+    model = XGBoostCostModel(task, "knob", "rank", feature_store=store)
+    assert model.fit_log(records, plan_size=32)
+    model.predict(np.arange(100))
+    assert model.pool is None
+
+    # failed extraction is also stored
+    bucket.put(1000, None)
+    store.flush()
+    assert FeatureStore(path).bucket(task.workload, target, "knob").get(1000)[0] is None
+
+
 if __name__ == "__main__":
     test_fit()
     test_tuner()
+    test_feature_store()
@@ -120,5 +120,45 @@ def test_graph_simple():
     check_sharing()
 
 
+@tvm.testing.requires_llvm
+def test_graph_run_batch():
+    from tvm import relay
+
+    x = relay.var("x", shape=(1, 10))
+    y = relay.var("y", shape=(1, 10))
+    func = relay.Function([x, y], relay.Tuple([relay.add(x, y), relay.multiply(x, y)]))
+    x_in = np.ones((1, 10)).astype("float32")
+    graph, lib, params = relay.build(func, target="llvm", params={"x": x_in})
+    params_bytes = relay.save_param_dict(params)
+
+    requests = [{"y": np.random.uniform(size=(1, 10)).astype("float32")} for _ in range(7)]
+
+    def check(results):
+        assert len(results) == len(requests)
+        for req, outs in zip(requests, results):
+            np.testing.assert_allclose(outs[0].asnumpy(), x_in + req["y"])
+            np.testing.assert_allclose(outs[1].asnumpy(), x_in * req["y"])
+
+    mod = graph_runtime.create(graph, lib, tvm.cpu(0))
+    mod.load_params(params_bytes)
+    check(mod.run_batch(requests))
+    assert mod.run_batch([]) == []
+
+    # pre-allocated outputs are filled in place
+    outputs = [[tvm.nd.empty((1, 10)), tvm.nd.empty((1, 10))] for _ in requests]
+    assert mod.run_batch(requests, outputs) is outputs
+    check(outputs)
+
+    # the python fallback gives the same results
+    mod._run_batch = False
+    check(mod.run_batch(requests))
+
+    pool = graph_runtime.GraphModulePool(graph, lib, tvm.cpu(0), params_bytes, num_workers=3)
+    assert pool.num_workers == 3
+    check(pool.run_batch(requests))
+    pool.close()
+
+
 if __name__ == "__main__":
     test_graph_simple()
+    test_graph_run_batch()
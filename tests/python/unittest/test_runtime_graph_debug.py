@@ -137,8 +137,45 @@ def test_graph_simple():
         out = mod.get_output(0, out)
         np.testing.assert_equal(out.asnumpy(), a + 1)
 
+    def check_profile():
+        mlib = tvm.build(s, [A, B], "llvm", name="myadd")
+        try:
+            mod = graph_runtime.create(graph, mlib, tvm.cpu(0), profile_only=True)
+        except ValueError:
+            return
+        # nothing is dumped in profile-only mode
+        assert mod._dump_path is None
+
+        a = np.random.uniform(size=(n,)).astype(A.dtype)
+        prof = mod.profile(number=5, repeat=3, x=a)
+        mod.profile(number=5, repeat=2)
+        assert prof.num_runs == 5
+
+        records = prof.records()
+        assert len(records) == 1
+        rec = records[0]
+        assert rec["name"] == "add" and rec["op"] == "myadd"
+        assert rec["count"] == 5
+        assert rec["min_us"] <= rec["mean_us"] <= rec["max_us"]
+        assert rec["flop"] == n
+        assert rec["bytes"] == 2 * n * 4
+        assert "add" in prof.table()
+
+        trace = prof.chrome_trace()
+        assert [e["name"] for e in trace["traceEvents"]] == ["add"]
+        assert trace["traceEvents"][0]["ph"] == "X"
+
+        # tensors are dumped on request only
+        directory = mod.dump_output_tensors()
+        assert os.path.exists(os.path.join(directory, "output_tensors.params"))
+        out = mod.get_output(0, tvm.nd.empty((n,)))
+        np.testing.assert_equal(out.asnumpy(), a + 1)
+        mod.exit()
+        assert not os.path.exists(directory)
+
     check_verify()
     check_remote()
+    check_profile()
 
 
 if __name__ == "__main__":
@@ -20,6 +20,7 @@ import tvm.testing
 import os
 import stat
 import logging
+import socket
 import time
 import multiprocessing
 
@@ -27,7 +28,13 @@ import pytest
 import numpy as np
 from tvm import rpc
 from tvm.contrib import util, cc
-from tvm.rpc.tracker import Tracker
+from tvm.rpc.tracker import (
+    Tracker,
+    TrackerServerHandler,
+    DeviceStats,
+    LoadAwareScheduler,
+    PriorityScheduler,
+)
 
 
 def test_bigendian_rpc():
@@ -507,6 +514,256 @@ def test_rpc_tracker_request():
     tracker.terminate()
 
 
+def test_rpc_shm_transfer():
+    if not tvm.runtime.enabled("rpc"):
+        return
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    if not os.path.isdir("/dev/shm"):
+        return
+    assert remote.shm_dir() is not None
+    ctx = remote.cpu(0)
+    x = np.random.uniform(size=(512, 1024)).astype("float32")
+    for use_shm in [True, False]:
+        remote.use_shm = use_shm
+        arr = remote.array(x, ctx)
+        np.testing.assert_equal(arr.asnumpy(), x)
+        np.testing.assert_equal(remote.asnumpy(arr), x)
+
+        blob = bytearray(np.random.randint(0, 10, size=(1 << 20)).astype("uint8"))
+        remote.upload(blob, "dat.bin")
+        assert remote.download("dat.bin") == blob
+    # the client files are gone, uploads live in the directory of the session
+    assert not [
+        x
+        for x in os.listdir("/dev/shm")
+        if x.startswith("tvm-rpc-") and os.path.isfile(os.path.join("/dev/shm", x))
+    ]
+
+    # the server only touches the shared memory files of rpc clients
+    temp = util.tempdir()
+    outside = temp.relpath("secret.bin")
+    with open(outside, "wb") as fout:
+        fout.write(bytearray(x.nbytes))
+    link = os.path.join("/dev/shm", "tvm-rpc-link-%d" % os.getpid())
+    os.symlink(outside, link)
+    try:
+        assert not remote.get_function("tvm.rpc.server.shm_probe")(outside, "")
+        for path in [outside, link, "/dev/shm/../" + outside]:
+            for name in ["shm_copyfrom", "shm_copyto"]:
+                with pytest.raises(tvm.error.TVMError):
+                    remote.get_function("tvm.rpc.server." + name)(path, arr)
+            with pytest.raises(tvm.error.TVMError):
+                remote.get_function("tvm.rpc.server.shm_upload")(path, "stolen.bin")
+        assert os.path.exists(outside)
+    finally:
+        os.remove(link)
+
+
+class _DeviceConn(object):
+    """Stand-in of a server connection for the in-process tracker tests"""
+
+    def __init__(self, utilization):
+        self.pending_matchkeys = set()
+        self.put_values = []
+        self.device_stats = DeviceStats()
+        self.device_stats.first_seen -= 100.0
+        self.device_stats.busy_time = utilization * 100.0
+
+    def summary(self):
+        return {"addr": ("localhost", 0)}
+
+    def put(self, tracker, key, port):
+        value = (self, "localhost", port, "%s:%d" % (key, port))
+        self.pending_matchkeys.add(value[-1])
+        self.put_values.append(value)
+        tracker.put(key, value)
+        return value
+
+
+def _in_process_tracker():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    return sock, TrackerServerHandler(sock, "stop")
+
+
+def _close_tracker(sock, tracker):
+    tracker._ioloop.remove_handler(sock.fileno())
+    sock.close()
+
+
+def test_rpc_tracker_load_aware():
+    sock, tracker = _in_process_tracker()
+    assert isinstance(tracker.create_scheduler("x"), LoadAwareScheduler)
+    busy, idle = _DeviceConn(0.9), _DeviceConn(0.1)
+    tracker._connections.update([busy, idle])
+    busy.put(tracker, "busy", 1)
+    idle.put(tracker, "idle", 2)
+
+    got = []
+
+    def callback(values):
+        got.append(values)
+        return True
+
+    # the least utilized free device of all the keys is leased first
+    tracker.request(["busy", "idle"], "", 1, callback)
+    assert got[-1][0][0] is idle
+    assert idle.device_stats.leases == 1
+    assert not idle.pending_matchkeys
+
+    # a batch request waits for all the devices
+    lease = tracker.request(["busy", "idle"], "", 1, callback, num=2)
+    assert len(got) == 1 and lease.alive()
+    idle.put(tracker, "idle", 3)
+    assert len(got) == 2 and len(got[-1]) == 2
+
+    # a failed reply gives the devices back
+    idle.put(tracker, "idle", 4)
+    busy.put(tracker, "busy", 5)
+    tracker.request(["busy", "idle"], "", 1, lambda values: False, num=2)
+    summary = tracker.summary()["queue_info"]
+    assert summary["idle"]["free"] == 1 and summary["busy"]["free"] == 1
+    assert summary["busy"]["wait_time"]["count"] + summary["idle"]["wait_time"]["count"] >= 1
+    _close_tracker(sock, tracker)
+
+
+def test_rpc_tracker_batch_no_partial_lease():
+    sock, tracker = _in_process_tracker()
+    devices = [_DeviceConn(0.0) for _ in range(4)]
+    tracker._connections.update(devices)
+    got = []
+
+    def callback(values):
+        got.append(values)
+        return True
+
+    devices[0].put(tracker, "x", 0)
+    first = tracker.request("x", "", 1, callback, num=2)
+    second = tracker.request(["x", "y"], "", 1, callback, num=2)
+    # neither batch holds the free device while waiting
+    assert first.alive() and second.alive()
+    assert not first.values and not second.values
+    assert tracker.summary()["queue_info"]["x"]["free"] == 1
+
+    # a single request is not blocked by the waiting batches
+    tracker.request("x", "", 0, callback)
+    assert len(got) == 1 and len(got[0]) == 1
+    devices[1].put(tracker, "x", 1)
+    assert len(got) == 1
+    # a device of "y" completes the batch that can use it
+    devices[2].put(tracker, "y", 2)
+    assert first.alive() and not second.alive()
+    assert not first.values
+    devices[0].put(tracker, "x", 3)
+    assert first.alive()
+    devices[3].put(tracker, "x", 4)
+    assert not first.alive()
+    assert [len(x) for x in got] == [1, 2, 2]
+    _close_tracker(sock, tracker)
+
+
+def test_rpc_tracker_rtt_tie_break():
+    sock, tracker = _in_process_tracker()
+    slow, fast = _DeviceConn(0.0), _DeviceConn(0.0)
+    tracker._connections.update([slow, fast])
+    slow.device_stats.on_rtt(0.1)
+    fast.device_stats.on_rtt(0.001)
+    # the rtt is smoothed
+    fast.device_stats.on_rtt(0.002)
+    assert 0.001 < fast.device_stats.rtt < 0.002
+    slow.put(tracker, "x", 0)
+    fast.put(tracker, "x", 1)
+    got = []
+
+    def callback(values):
+        got.append(values)
+        return True
+
+    # equally utilized devices, the fastest one is leased first
+    tracker.request("x", "", 1, callback)
+    assert got[-1][0][0] is fast
+    _close_tracker(sock, tracker)
+
+
+def test_rpc_scheduler_release():
+    scheduler = PriorityScheduler("x")
+    device = _DeviceConn(0.0)
+    value = (device, "localhost", 0, "x:0")
+    device.pending_matchkeys.add(value[-1])
+    # a failed callback gives the resource back
+    scheduler.request("", 1, lambda value: False)
+    scheduler.put(value)
+    assert scheduler.summary()["free"] == 1
+    assert value[-1] in device.pending_matchkeys
+
+    got = []
+    scheduler.request("", 1, lambda value: got.append(value) or True)
+    assert got == [value[1:]]
+    assert scheduler.summary()["free"] == 0
+
+
+def test_rpc_tracker_rtt():
+    tracker = Tracker("localhost", port=9000, port_end=10000)
+    servers = [
+        rpc.Server(
+            "localhost",
+            port=9000,
+            port_end=10000,
+            key="test_rtt",
+            tracker_addr=(tracker.host, tracker.port),
+        )
+        for _ in range(2)
+    ]
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+    summary = client.summary()
+    assert len(summary["device_info"]) == 2
+    for device in summary["device_info"]:
+        assert device["rtt"] is not None and device["rtt"] >= 0
+    assert "rtt(ms)" in client.text_summary()
+
+    for server in servers:
+        server.terminate()
+    tracker.terminate()
+
+
+def test_rpc_tracker_batch_request():
+    tracker = Tracker("localhost", port=9000, port_end=10000)
+    servers = [
+        rpc.Server(
+            "localhost",
+            port=9000,
+            port_end=10000,
+            key=key,
+            tracker_addr=(tracker.host, tracker.port),
+        )
+        for key in ["test_fast", "test_slow", "test_slow"]
+    ]
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+
+    remotes = client.request_batch(["test_fast", "test_slow"], 3)
+    assert len(remotes) == 3
+    summary = client.summary()
+    assert summary["queue_info"]["test_fast"]["free"] == 0
+    assert summary["queue_info"]["test_slow"]["free"] == 0
+    assert len(summary["device_info"]) == 3
+
+    del remotes
+    time.sleep(1)
+    summary = client.summary()
+    assert summary["queue_info"]["test_slow"]["free"] == 2
+    assert all([x["leases"] == 1 for x in summary["device_info"]])
+    assert all([x["session_duration"] is not None for x in summary["device_info"]])
+    wait = summary["queue_info"]["test_fast"]["wait_time"]
+    assert wait["count"] + summary["queue_info"]["test_slow"]["wait_time"]["count"] == 1
+    assert "Queue Wait Time" in client.text_summary()
+
+    for server in servers:
+        server.terminate()
+    tracker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_rpc_echo()
@@ -521,4 +778,11 @@ if __name__ == "__main__":
     test_local_func()
     test_rpc_tracker_register()
     test_rpc_tracker_request()
+    test_rpc_tracker_load_aware()
+    test_rpc_tracker_batch_no_partial_lease()
+    test_rpc_tracker_rtt_tie_break()
+    test_rpc_scheduler_release()
+    test_rpc_tracker_rtt()
+    test_rpc_shm_transfer()
+    test_rpc_tracker_batch_request()
     test_rpc_large_array()